@@ -0,0 +1,159 @@
+"""Benchmark du flux SSE du tableau de bord : diffusion vers des centaines d'abonnés.
+
+Lancement depuis `backend/` :
+
+    python -m benchmarks.bench_broadcast --subscribers 100,500,1000 --events 200
+
+Pour chaque nombre d'abonnés, `--subscribers` tâches asyncio lisent le hub
+(comme autant de flux SSE ouverts) pendant qu'un thread, comme les routes,
+publie `--events` événements à `--rate` événements/s. On mesure le coût d'un
+`publish` (encodage unique + ajout à chaque tampon), le retard de livraison
+(plus ancien message de chaque lot lu) et, avec `--slow`, qu'une part
+d'abonnés qui ne lisent plus est déconnectée sans ralentir les autres.
+`--rate 0` publie en rafale : au-delà de `--buffer` événements d'avance, même
+les abonnés actifs sont déconnectés, comme prévu.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.common import (
+    BASELINES_DIR,
+    check_baseline,
+    dump_json,
+    environment_metadata,
+    latency_summary,
+)
+
+DEFAULT_BASELINE = BASELINES_DIR / "bench_broadcast.json"
+
+
+async def consume(hub, subscriber, delivery: list[float], counts: list[int], events: int):
+    received = 0
+    while received < events and not subscriber.dropped:
+        messages = await hub.next_messages(subscriber, timeout=1)
+        if not messages:
+            continue
+        # Retard du plus ancien message du lot : le pire cas de la livraison
+        data = messages[0].split(b"\ndata: ", 1)[1]
+        delivery.append(time.perf_counter() - json.loads(data)["sent_at"])
+        received += len(messages)
+    counts.append(received)
+
+
+def publish_all(hub, events: int, rate: float, publish_samples: list[float]):
+    interval = 1 / rate if rate else 0
+    start = time.perf_counter()
+    for i in range(events):
+        # Cadence régulière : on ne mesure pas la rafale d'un seul coup
+        if interval:
+            delay = start + i * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        begin = time.perf_counter()
+        hub.publish("counters", {"sent_at": begin, "last_hour": {"login": i}})
+        publish_samples.append(time.perf_counter() - begin)
+
+
+async def run(subscribers: int, events: int, rate: float, slow: float, buffer: int):
+    from modules.api.stats.broadcast import BroadcastHub
+
+    hub = BroadcastHub(buffer_size=buffer, max_subscribers=subscribers)
+    readers = [hub.subscribe() for _ in range(subscribers)]
+    # Les abonnés « lents » ne lisent jamais : leur tampon finit par déborder
+    slow_count = int(subscribers * slow)
+    fast, stalled = readers[slow_count:], readers[:slow_count]
+
+    delivery, counts, publish_samples = [], [], []
+    consumers = [
+        asyncio.create_task(consume(hub, s, delivery, counts, events)) for s in fast
+    ]
+
+    start = time.perf_counter()
+    publisher = threading.Thread(
+        target=publish_all, args=(hub, events, rate, publish_samples)
+    )
+    publisher.start()
+    await asyncio.gather(*consumers)
+    await asyncio.to_thread(publisher.join)
+    elapsed = time.perf_counter() - start
+
+    stats = hub.stats()
+    publish = latency_summary(publish_samples, elapsed)
+    received = latency_summary(delivery, elapsed)
+    return {
+        "events_per_sec": publish["throughput_rps"],
+        "deliveries_per_sec": round(sum(counts) / elapsed, 2),
+        "publish_p50_ms": publish["p50_ms"],
+        "publish_p99_ms": publish["p99_ms"],
+        "delivery_p50_ms": received["p50_ms"],
+        "delivery_p99_ms": received["p99_ms"],
+        "deliveries": sum(counts),
+        "expected_deliveries": len(fast) * events,
+        "slow_subscribers": len(stalled),
+        "slow_consumers_dropped": stats["slow_consumers"],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", default="100,500,1000")
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=100, help="0 : sans limite")
+    parser.add_argument(
+        "--slow", type=float, default=0.1, help="Part d'abonnés qui ne lisent pas"
+    )
+    parser.add_argument("--buffer", type=int, default=64)
+    parser.add_argument("--output", type=Path, help="Fichier JSON de sortie")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    from utils.logger_config import configure_logger
+
+    configure_logger().disable("modules")
+
+    levels = [int(level) for level in args.subscribers.split(",")]
+    results = {}
+    for subscribers in levels:
+        name = f"{subscribers}_subscribers"
+        results[name] = asyncio.run(
+            run(subscribers, args.events, args.rate, args.slow, args.buffer)
+        )
+        print(
+            f"{name}: publish {results[name]['publish_p50_ms']} ms, "
+            f"livraison {results[name]['delivery_p99_ms']} ms (p99), "
+            f"{results[name]['slow_consumers_dropped']} lents déconnectés",
+            file=sys.stderr,
+        )
+
+    output = {
+        "benchmark": "bench_broadcast",
+        "meta": {
+            **environment_metadata(),
+            "events": args.events,
+            "rate": args.rate,
+            "slow": args.slow,
+            "buffer": args.buffer,
+        },
+        "results": results,
+    }
+    dump_json(output, args.output)
+    return check_baseline(
+        output,
+        args.baseline,
+        args.max_regression,
+        args.save_baseline,
+        higher_is_better=("deliveries_per_sec",),
+        lower_is_better=("publish_p99_ms", "delivery_p99_ms"),
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Microbenchmarks des primitives de sécurité et de tokens.
+
+Lancement depuis `backend/` :
+
+    python -m benchmarks.bench_security --costs 4,8,10,12 --output results.json
+
+Mesure le débit (ops/s) et le pic d'allocation mémoire par appel (tracemalloc)
+de `anonymize`, `hash_token`, `hash_password`, `verify_password`, `create_token`
+et du décodage de `get_current_user`, puis compare à la baseline stockée.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+
+import bcrypt
+
+from benchmarks.common import (
+    BASELINES_DIR,
+    check_baseline,
+    dump_json,
+    environment_metadata,
+)
+
+DEFAULT_BASELINE = BASELINES_DIR / "bench_security.json"
+DEFAULT_COSTS = "4,8,10,12"
+
+# Entrées réalistes : un email, un mot de passe et un refresh token de prod
+EMAIL = "firstname.lastname@example.com"
+PASSWORD = "correct-horse-battery-staple"
+
+
+def measure(func, min_time: float, repeat: int = 3) -> dict:
+    """Débit du meilleur essai et pic d'allocation moyen d'un appel à `func`."""
+    # Calibrage : assez d'itérations pour durer au moins `min_time`
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        iterations = max(iterations * 2, int(iterations * min_time / max(elapsed, 1e-9)))
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, time.perf_counter() - start)
+
+    # Allocations mesurées à part : tracemalloc fausserait le chronométrage
+    samples = min(iterations, 100)
+    peaks = 0
+    tracemalloc.start()
+    for _ in range(samples):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks += peak - baseline
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / best, 2),
+        "mean_us": round(best / iterations * 1_000_000, 3),
+        "peak_alloc_bytes": peaks // samples,
+    }
+
+
+def build_cases(costs: list[int]) -> dict:
+    # Import tardif : le module de routes lit SECRET_KEY à l'import
+    from fastapi.security import SecurityScopes
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from modules.database.session import Base
+    from modules.api.users.models import User, Role
+    from modules.api.auth.functions import create_token, get_current_user
+    from modules.api.auth.security import (
+        anonymize,
+        hash_password,
+        hash_token,
+        verify_password,
+    )
+
+    anonymized_email = anonymize(EMAIL)
+    access_claims = {"sub": anonymized_email, "role": "reader", "type": "access"}
+    access_token = create_token(access_claims, expires_delta=timedelta(minutes=15))
+    refresh_token = create_token(
+        {"sub": anonymized_email, "type": "refresh", "jti": "0" * 36},
+        expires_delta=timedelta(days=7),
+    )
+
+    # Base en mémoire avec un utilisateur, pour la recherche de get_current_user
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    role = Role(role="reader")
+    db.add(role)
+    db.flush()
+    db.add(
+        User(
+            email=anonymized_email,
+            name="bench",
+            password=hash_password(PASSWORD),
+            role_id=role.id,
+        )
+    )
+    db.commit()
+    scopes = SecurityScopes(scopes=[])
+
+    cases = {
+        "anonymize": (lambda: anonymize(EMAIL), len(EMAIL)),
+        "hash_token": (lambda: hash_token(refresh_token), len(refresh_token)),
+        "create_token.access": (
+            lambda: create_token(access_claims, timedelta(minutes=15)),
+            None,
+        ),
+        "get_current_user": (
+            lambda: get_current_user(scopes, token=access_token, db=db),
+            len(access_token),
+        ),
+    }
+    for cost in costs:
+        cases[f"hash_password.cost{cost}"] = (
+            lambda cost=cost: hash_password(PASSWORD, rounds=cost),
+            len(PASSWORD),
+        )
+        hashed = hash_password(PASSWORD, rounds=cost)
+        cases[f"verify_password.cost{cost}"] = (
+            lambda hashed=hashed: verify_password(PASSWORD, hashed),
+            len(PASSWORD),
+        )
+    return cases
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--costs", default=DEFAULT_COSTS, help="Coûts bcrypt testés")
+    parser.add_argument(
+        "--min-time", type=float, default=0.5, help="Durée minimale par mesure (s)"
+    )
+    parser.add_argument("--output", type=Path, help="Fichier JSON de sortie")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    # Le logger écrit à chaque token créé : on ne mesure pas les I/O de log
+    os.environ.setdefault("RUN_ENV", "test")
+    from utils.logger_config import configure_logger
+
+    configure_logger().disable("modules")
+
+    costs = [int(cost) for cost in args.costs.split(",")]
+    results = {}
+    for name, (func, input_bytes) in build_cases(costs).items():
+        results[name] = measure(func, args.min_time)
+        if input_bytes is not None:
+            results[name]["input_bytes"] = input_bytes
+        print(f"{name}: {results[name]['ops_per_sec']} ops/s", file=sys.stderr)
+
+    output = {
+        "benchmark": "bench_security",
+        "meta": {
+            **environment_metadata(),
+            "bcrypt": bcrypt.__version__,
+            "costs": costs,
+            "min_time_s": args.min_time,
+        },
+        "results": results,
+    }
+    dump_json(output, args.output)
+    return check_baseline(
+        output,
+        args.baseline,
+        args.max_regression,
+        args.save_baseline,
+        higher_is_better=("ops_per_sec",),
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
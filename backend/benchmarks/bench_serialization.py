@@ -0,0 +1,186 @@
+"""Benchmark de la liste des utilisateurs : construction et sérialisation JSON.
+
+Lancement depuis `backend/` :
+
+    python -m benchmarks.bench_serialization --users 10000 --repeat 20
+
+Chaque itération produit le corps JSON de `GET /auth/users/` depuis une base
+SQLite fichier temporaire de `--users` utilisateurs, de deux façons :
+`legacy` (objets ORM, UserResponse construits à la main puis revalidés et
+réencodés par `response_model` et le module json) et `fast` (tuples joints
+aux rôles, TypeAdapter `from_attributes`, sérialisation par pydantic-core).
+`encode` mesure seul l'encodeur des réponses dict (orjson ou repli json).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import (
+    BASELINES_DIR,
+    check_baseline,
+    dump_json,
+    environment_metadata,
+    latency_summary,
+)
+
+DEFAULT_BASELINE = BASELINES_DIR / "bench_serialization.json"
+
+
+def create_database(path: Path, users: int):
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import sessionmaker
+    from modules.database.session import Base
+    from modules.api.users.models import Role, User
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        role = Role(role="reader")
+        db.add(role)
+        db.flush()
+        db.execute(
+            insert(User),
+            [
+                {
+                    "email": f"{i:064x}",
+                    "name": f"user {i}",
+                    "password": "x",
+                    "role_id": role.id,
+                }
+                for i in range(users)
+            ],
+        )
+        db.commit()
+    return engine, SessionLocal
+
+
+def legacy_listing(db, field) -> bytes:
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from modules.api.users.models import User
+    from modules.api.users.schemas import UserResponse
+
+    users = db.query(User).order_by(User.id).all()
+    content = [
+        UserResponse(
+            id=u.id, name=u.name, email=u.email, is_active=u.is_active, role=u.role.role
+        )
+        for u in users
+    ]
+    return JSONResponse(
+        asyncio.run(serialize_response(field=field, response_content=content))
+    ).body
+
+
+def fast_listing(db) -> bytes:
+    from sqlalchemy import select
+    from modules.api.responses import ModelResponse
+    from modules.api.users.models import Role, User
+    from modules.api.users.schemas import user_list_adapter
+
+    rows = db.execute(
+        select(User.id, User.name, User.email, User.is_active, Role.role)
+        .join(User.role)
+        .order_by(User.id)
+    ).all()
+    users = user_list_adapter.validate_python(rows, from_attributes=True)
+    return ModelResponse(users, user_list_adapter).body
+
+
+def run(mode: str, SessionLocal, repeat: int) -> dict:
+    from fastapi.utils import create_model_field
+    from sqlalchemy import select
+    from modules.api.responses import dumps
+    from modules.api.users.models import User
+    from modules.api.users.schemas import UserResponse
+
+    field = create_model_field(
+        name="users", type_=list[UserResponse], mode="serialization"
+    )
+    if mode == "legacy":
+
+        def render(db):
+            return legacy_listing(db, field)
+
+    elif mode == "fast":
+        render = fast_listing
+    else:
+        # Encodeur seul, sur des dicts déjà construits (réponses hors modèles)
+        with SessionLocal() as db:
+            rows = db.execute(select(User.id, User.email, User.name)).all()
+        payload = [row._asdict() for row in rows]
+
+        def render(db):
+            return dumps(payload)
+
+    samples, size = [], 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        # Session neuve à chaque itération, comme une requête HTTP
+        with SessionLocal() as db:
+            begin = time.perf_counter()
+            size = len(render(db))
+            samples.append(time.perf_counter() - begin)
+    elapsed = time.perf_counter() - start
+
+    summary = latency_summary(samples, elapsed)
+    return {"listings_per_sec": summary.pop("throughput_rps"), "bytes": size, **summary}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", type=Path, help="Fichier JSON de sortie")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("RUN_ENV", "test")
+    from utils.logger_config import configure_logger
+    from modules.api import responses
+
+    configure_logger().disable("modules")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, SessionLocal = create_database(Path(tmp) / "users.db", args.users)
+        for mode in ("legacy", "fast", "encode"):
+            results[mode] = run(mode, SessionLocal, args.repeat)
+            print(
+                f"{mode}: {results[mode]['p50_ms']} ms (p50), "
+                f"{results[mode]['bytes']} octets",
+                file=sys.stderr,
+            )
+        engine.dispose()
+
+    output = {
+        "benchmark": "bench_serialization",
+        "meta": {
+            **environment_metadata(),
+            "users": args.users,
+            "repeat": args.repeat,
+            "orjson": responses.orjson is not None,
+        },
+        "results": results,
+    }
+    dump_json(output, args.output)
+    return check_baseline(
+        output,
+        args.baseline,
+        args.max_regression,
+        args.save_baseline,
+        higher_is_better=("listings_per_sec",),
+        lower_is_better=("p95_ms",),
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Benchmark du débit d'inscriptions selon le nombre de shards SQLite.
+
+Lancement depuis `backend/` :
+
+    python -m benchmarks.bench_shards --shards 1,2,4 --concurrency 16 --operations 2000
+
+Chaque opération insère un utilisateur comme `POST /auth/users/` (une
+transaction par inscription, sans bcrypt) via une session répartie sur N
+fichiers temporaires. Le résultat (inscriptions/s, latences) est comparé à la
+baseline.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from uuid import uuid4
+
+from benchmarks.common import (
+    BASELINES_DIR,
+    check_baseline,
+    dump_json,
+    environment_metadata,
+    latency_summary,
+)
+
+DEFAULT_BASELINE = BASELINES_DIR / "bench_shards.json"
+DEFAULT_SHARDS = "1,2,4"
+
+
+def run(shards: int, concurrency: int, operations: int) -> dict:
+    from sqlalchemy import select
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+    from sqlalchemy.orm import sessionmaker
+    from modules.api.auth.security import anonymize
+    from modules.api.users.create_db import init_user_shards, replicate_roles
+    from modules.api.users.models import Role, User
+    from modules.database.session import Base, create_session
+    from modules.database.shards import ShardRouter, create_sharded_sessionmaker
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = [
+            create_session(f"sqlite:///{Path(tmp) / f'shard{i}.db'}", concurrency)[0]
+            for i in range(shards)
+        ]
+        Base.metadata.create_all(bind=engines[0])
+        with sessionmaker(bind=engines[0])() as db:
+            db.add(Role(role="reader"))
+            db.commit()
+        init_user_shards(engines)
+        replicate_roles(engines)
+        SessionLocal = create_sharded_sessionmaker(engines)
+        router = ShardRouter(shards)
+        reader_role_id = select(Role.id).where(Role.role == "reader").scalar_subquery()
+
+        samples, errors = [], 0
+
+        def signup(_):
+            nonlocal errors
+            email = anonymize(f"{uuid4()}@example.com")
+            statement = (
+                sqlite_insert(User)
+                .values(email=email, name="bench", password="x", role_id=reader_role_id)
+                .on_conflict_do_nothing(index_elements=[User.email])
+            )
+            db = SessionLocal()
+            start = time.perf_counter()
+            try:
+                db.execute(
+                    statement, bind_arguments={"shard_id": router.for_email(email)}
+                )
+                db.commit()
+                samples.append(time.perf_counter() - start)
+            except Exception:
+                errors += 1
+            finally:
+                db.close()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(signup, range(operations)))
+        elapsed = time.perf_counter() - start
+
+        for engine in engines:
+            engine.dispose()
+
+    summary = latency_summary(samples, elapsed)
+    return {"signups_per_sec": summary.pop("throughput_rps"), "errors": errors, **summary}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shards", default=DEFAULT_SHARDS, help="Nombres de shards testés"
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--output", type=Path, help="Fichier JSON de sortie")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("RUN_ENV", "test")
+    from utils.logger_config import configure_logger
+
+    configure_logger().disable("modules")
+
+    levels = [int(level) for level in args.shards.split(",")]
+    results = {}
+    for shards in levels:
+        name = f"shards{shards}"
+        results[name] = run(shards, args.concurrency, args.operations)
+        print(
+            f"{name}: {results[name]['signups_per_sec']} inscriptions/s", file=sys.stderr
+        )
+
+    output = {
+        "benchmark": "bench_shards",
+        "meta": {
+            **environment_metadata(),
+            "shards": levels,
+            "concurrency": args.concurrency,
+            "operations": args.operations,
+        },
+        "results": results,
+    }
+    dump_json(output, args.output)
+    return check_baseline(
+        output,
+        args.baseline,
+        args.max_regression,
+        args.save_baseline,
+        higher_is_better=("signups_per_sec",),
+        lower_is_better=("p95_ms",),
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""Benchmark des écritures de refresh tokens : commit par requête vs commit groupé.
+
+Lancement depuis `backend/` :
+
+    python -m benchmarks.bench_writer --concurrency 1,16,64 --operations 2000
+
+Chaque opération reproduit l'écriture d'un login (`store_refresh_token`) sur une
+base SQLite fichier temporaire, avec `concurrency` logins simultanés : une
+fois avec un commit par login, une fois via l'écrivain à commit groupé. Le
+résultat (écritures/s, transactions, latences) est comparé à la baseline.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+from benchmarks.common import (
+    BASELINES_DIR,
+    check_baseline,
+    dump_json,
+    environment_metadata,
+    latency_summary,
+)
+
+DEFAULT_BASELINE = BASELINES_DIR / "bench_writer.json"
+DEFAULT_CONCURRENCY = "1,16,64"
+
+
+def create_database(path: Path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from modules.database.session import Base
+    from modules.api.users.models import Role, User
+
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        role = Role(role="reader")
+        db.add(role)
+        db.flush()
+        user = User(email="bench", name="bench", password="x", role_id=role.id)
+        db.add(user)
+        db.commit()
+        return engine, SessionLocal, user.id
+
+
+def run(mode: str, concurrency: int, operations: int, max_delay_ms: float) -> dict:
+    from modules.api.auth.functions import store_refresh_token
+    from modules.database import writer
+    from modules.database.writer import GroupCommitWriter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, SessionLocal, user_id = create_database(Path(tmp) / "users.db")
+        group_writer = GroupCommitWriter(
+            SessionLocal, max_batch=max(concurrency, 1), max_delay=max_delay_ms / 1000
+        )
+        writer.GROUP_COMMIT_ENABLED = mode == "group"
+        writer.users_writer = group_writer
+        if mode == "group":
+            group_writer.start()
+
+        expires_at = datetime.now(timezone.utc) + timedelta(days=7)
+        samples, errors = [], 0
+
+        def login_write(_):
+            nonlocal errors
+            db = SessionLocal()
+            start = time.perf_counter()
+            try:
+                store_refresh_token(db, user_id, uuid4().hex, expires_at)
+                samples.append(time.perf_counter() - start)
+            except Exception:
+                errors += 1
+            finally:
+                db.close()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(login_write, range(operations)))
+        elapsed = time.perf_counter() - start
+
+        group_writer.stop()
+        if mode == "group":
+            transactions = group_writer.stats()["batches"]
+        else:
+            transactions = len(samples)
+        engine.dispose()
+
+    summary = latency_summary(samples, elapsed)
+    return {
+        "writes_per_sec": summary.pop("throughput_rps"),
+        "transactions": transactions,
+        "errors": errors,
+        **summary,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--concurrency", default=DEFAULT_CONCURRENCY, help="Logins simultanés testés"
+    )
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument(
+        "--max-delay-ms", type=float, default=5, help="Attente maximale d'un lot (ms)"
+    )
+    parser.add_argument("--output", type=Path, help="Fichier JSON de sortie")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("RUN_ENV", "test")
+    from utils.logger_config import configure_logger
+
+    configure_logger().disable("modules")
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = {}
+    for concurrency in levels:
+        for mode in ("direct", "group"):
+            name = f"{mode}.c{concurrency}"
+            results[name] = run(mode, concurrency, args.operations, args.max_delay_ms)
+            print(
+                f"{name}: {results[name]['writes_per_sec']} écritures/s, "
+                f"{results[name]['transactions']} transactions",
+                file=sys.stderr,
+            )
+
+    output = {
+        "benchmark": "bench_writer",
+        "meta": {
+            **environment_metadata(),
+            "concurrency": levels,
+            "operations": args.operations,
+            "max_delay_ms": args.max_delay_ms,
+        },
+        "results": results,
+    }
+    dump_json(output, args.output)
+    return check_baseline(
+        output,
+        args.baseline,
+        args.max_regression,
+        args.save_baseline,
+        higher_is_better=("writes_per_sec",),
+        lower_is_better=("p95_ms",),
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import json
+import math
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Percentile par rang le plus proche sur une liste déjà triée."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def latency_summary(samples: list[float], elapsed: float) -> dict:
+    """Résume des latences (en secondes) en débit et percentiles (en ms)."""
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+    }
+
+
+def environment_metadata() -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def load_json(path: Path) -> dict | None:
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dump_json(data: dict, path: Path | None = None):
+    """Écrit le résultat dans un fichier, ou sur la sortie standard."""
+    text = json.dumps(data, indent=2, ensure_ascii=False)
+    if path is None:
+        print(text)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+
+
+def compare_with_baseline(
+    results: dict,
+    baseline: dict,
+    max_regression: float,
+    higher_is_better: tuple[str, ...] = (),
+    lower_is_better: tuple[str, ...] = (),
+) -> list[str]:
+    """Liste les métriques dégradées de plus de `max_regression` (ex: 0.2 = 20 %)."""
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+
+        for metric in higher_is_better:
+            before, after = reference.get(metric), current.get(metric)
+            if before and after is not None and after < before * (1 - max_regression):
+                regressions.append(f"{name}.{metric}: {after} < {before} (baseline)")
+
+        for metric in lower_is_better:
+            before, after = reference.get(metric), current.get(metric)
+            if before and after is not None and after > before * (1 + max_regression):
+                regressions.append(f"{name}.{metric}: {after} > {before} (baseline)")
+
+    return regressions
+
+
+def check_baseline(
+    output: dict,
+    baseline_path: Path,
+    max_regression: float,
+    save_baseline: bool,
+    higher_is_better: tuple[str, ...] = (),
+    lower_is_better: tuple[str, ...] = (),
+) -> int:
+    """Compare `output["results"]` à la baseline stockée ; retourne le code de sortie."""
+    if save_baseline:
+        dump_json(output, baseline_path)
+        print(f"Baseline enregistrée dans {baseline_path}", file=sys.stderr)
+        return 0
+
+    baseline = load_json(baseline_path)
+    if baseline is None:
+        # Une comparaison impossible ne doit pas passer pour un succès
+        print(
+            f"Aucune baseline trouvée ({baseline_path}) : "
+            "relancez avec --save-baseline pour l'enregistrer.",
+            file=sys.stderr,
+        )
+        return 2
+
+    regressions = compare_with_baseline(
+        output["results"],
+        baseline["results"],
+        max_regression,
+        higher_is_better=higher_is_better,
+        lower_is_better=lower_is_better,
+    )
+    if regressions:
+        print(
+            f"Régressions supérieures à {max_regression:.0%} :",
+            *regressions,
+            sep="\n  ",
+            file=sys.stderr,
+        )
+        return 1
+
+    print("Aucune régression par rapport à la baseline.", file=sys.stderr)
+    return 0
@@ -0,0 +1,326 @@
+"""Benchmark HTTP des parcours d'authentification.
+
+Lancement depuis `backend/` :
+
+    # Application de run.py en mémoire (httpx + ASGI), base SQLite temporaire
+    python -m benchmarks.http_load --users 50 --concurrency 8 --operations 500
+
+    # Serveur uvicorn local déjà démarré (admin lu dans ADMIN_EMAIL/ADMIN_PASSWORD)
+    python -m benchmarks.http_load --base-url http://127.0.0.1:8000
+
+Le résultat (débit et p50/p95/p99 par endpoint) est écrit en JSON puis comparé
+à la baseline stockée ; le code de sortie vaut 1 en cas de régression.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import (
+    BASELINES_DIR,
+    check_baseline,
+    dump_json,
+    environment_metadata,
+    latency_summary,
+)
+
+DEFAULT_MIX = "login=1,refresh=2,me=6,admin_list=1,signup=1"
+DEFAULT_BASELINE = BASELINES_DIR / "http_load.json"
+PASSWORD = "benchpass123"
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        if name not in Scenario.OPERATIONS:
+            raise ValueError(f"Opération inconnue dans le mix : {name}")
+        weights[name] = int(weight or 1)
+    return weights
+
+
+def seed_in_process(
+    users: int, bcrypt_rounds: int | None, concurrency: int, timeout: float
+):
+    """Crée une base SQLite temporaire peuplée et l'injecte dans l'app de run.py."""
+    # Empêche l'initialisation de la vraie base au démarrage de l'app
+    os.environ["RUN_ENV"] = "test"
+    if bcrypt_rounds:
+        os.environ["BCRYPT_ROUNDS"] = str(bcrypt_rounds)
+    # Tous les logins viennent du même client sur une poignée de comptes : le
+    # limiteur de tentatives répondrait 429 et fausserait les mesures
+    os.environ.setdefault("LOGIN_MAX_ATTEMPTS", "1000000")
+    os.environ.setdefault("LOGIN_IP_MAX_ATTEMPTS", "0")
+    # File d'admission bcrypt à la taille de la charge : on mesure l'attente des
+    # hachages, pas des 503 immédiats qui varient d'une machine à l'autre
+    os.environ.setdefault("BCRYPT_MAX_QUEUE", str(concurrency))
+    os.environ.setdefault("BCRYPT_QUEUE_TIMEOUT", str(timeout))
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from run import app
+    from modules.database.dependencies import get_users_db, get_users_read_db
+    from modules.database.session import Base
+    from modules.api.users.models import User, Role
+    from modules.api.auth.security import anonymize, hash_password
+
+    database_path = Path(tempfile.mkdtemp(prefix="secureapi_bench_")) / "users.db"
+    engine = create_engine(
+        f"sqlite:///{database_path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    BenchSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = BenchSessionLocal()
+    admin_role, reader_role = Role(role="admin"), Role(role="reader")
+    db.add_all([admin_role, reader_role])
+    db.flush()
+
+    # Un hash partagé suffit : le coût de vérification reste celui de la prod
+    hashed_password = hash_password(PASSWORD)
+    emails = [f"bench_{i}@example.com" for i in range(users)]
+    admin_email = "bench_admin@example.com"
+    for email, role in [(admin_email, admin_role)] + [(e, reader_role) for e in emails]:
+        db.add(
+            User(
+                email=anonymize(email),
+                name=email.split("@")[0],
+                password=hashed_password,
+                role_id=role.id,
+                is_active=True,
+            )
+        )
+    db.commit()
+    db.close()
+
+    def get_bench_db():
+        db = BenchSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_users_db] = get_bench_db
+
+    app.dependency_overrides[get_users_read_db] = get_bench_db
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    )
+    return client, emails, (admin_email, PASSWORD)
+
+
+async def seed_remote(client: httpx.AsyncClient, users: int):
+    """Inscrit des utilisateurs synthétiques via l'API d'un serveur déjà lancé."""
+    run_id = uuid.uuid4().hex[:8]
+    emails = [f"bench_{run_id}_{i}@example.com" for i in range(users)]
+    for email in emails:
+        response = await client.post(
+            "/auth/users/",
+            json={"email": email, "name": email.split("@")[0], "password": PASSWORD},
+        )
+        response.raise_for_status()
+    admin = (os.getenv("ADMIN_EMAIL"), os.getenv("ADMIN_PASSWORD"))
+    return emails, admin
+
+
+class Scenario:
+    """Exécute un mix d'opérations et collecte les latences par endpoint."""
+
+    OPERATIONS = ("login", "refresh", "me", "admin_list", "signup")
+
+    def __init__(self, client: httpx.AsyncClient, admin: tuple[str, str]):
+        self.client = client
+        self.admin = admin
+        self.admin_token = None
+        self.tokens: dict[str, dict] = {}
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def timed(self, name: str, request):
+        start = time.perf_counter()
+        response = await request
+        self.samples[name].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[name][str(response.status_code)] += 1
+        return response
+
+    async def setup(self):
+        response = await self.client.post(
+            "/auth/login", data={"username": self.admin[0], "password": self.admin[1]}
+        )
+        if response.status_code == 200:
+            self.admin_token = response.json()["access_token"]
+
+    async def login(self, email: str):
+        response = await self.timed(
+            "login",
+            self.client.post(
+                "/auth/login", data={"username": email, "password": PASSWORD}
+            ),
+        )
+        if response.status_code == 200:
+            self.tokens[email] = response.json()
+
+    async def refresh(self, email: str):
+        if email not in self.tokens:
+            await self.login(email)
+            return
+        response = await self.timed(
+            "refresh",
+            self.client.post(
+                "/auth/refresh",
+                headers={
+                    "Authorization": f"Bearer {self.tokens[email]['refresh_token']}"
+                },
+            ),
+        )
+        if response.status_code == 200:
+            self.tokens[email] = response.json()
+        else:
+            self.tokens.pop(email, None)
+
+    async def me(self, email: str):
+        if email not in self.tokens:
+            await self.login(email)
+            return
+        await self.timed(
+            "me",
+            self.client.get(
+                "/auth/users/me",
+                headers={"Authorization": f"Bearer {self.tokens[email]['access_token']}"},
+            ),
+        )
+
+    async def admin_list(self, email: str):
+        await self.timed(
+            "admin_list",
+            self.client.get(
+                "/auth/users/", headers={"Authorization": f"Bearer {self.admin_token}"}
+            ),
+        )
+
+    async def signup(self, email: str):
+        new_email = f"signup_{uuid.uuid4().hex}@example.com"
+        await self.timed(
+            "signup",
+            self.client.post(
+                "/auth/users/",
+                json={"email": new_email, "name": "signup", "password": PASSWORD},
+            ),
+        )
+
+    async def run(
+        self,
+        emails: list[str],
+        mix: dict[str, int],
+        concurrency: int,
+        operations: int,
+        seed: int,
+    ) -> float:
+        names, weights = list(mix), list(mix.values())
+        remaining = operations
+
+        async def worker(index: int):
+            nonlocal remaining
+            # Chaque worker a son propre générateur et ses propres utilisateurs,
+            # pour que deux workers ne fassent jamais tourner le même refresh token
+            rng = random.Random(seed + index)
+            own_emails = emails[index::concurrency] or emails
+            while remaining > 0:
+                remaining -= 1
+                operation = rng.choices(names, weights)[0]
+                await getattr(self, operation)(rng.choice(own_emails))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        return time.perf_counter() - start
+
+    def results(self, elapsed: float) -> dict:
+        results = {}
+        for name, samples in sorted(self.samples.items()):
+            results[name] = latency_summary(samples, elapsed)
+            results[name]["errors"] = dict(self.errors.get(name, {}))
+        return results
+
+
+async def main_async(args) -> dict:
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+        emails, admin = await seed_remote(client, args.users)
+        mode = "remote"
+    else:
+        client, emails, admin = seed_in_process(
+            args.users, args.bcrypt_rounds, args.concurrency, args.timeout
+        )
+        mode = "in-process"
+
+    async with client:
+        scenario = Scenario(client, admin)
+        await scenario.setup()
+        elapsed = await scenario.run(
+            emails, parse_mix(args.mix), args.concurrency, args.operations, args.seed
+        )
+
+    return {
+        "benchmark": "http_load",
+        "meta": {
+            **environment_metadata(),
+            "mode": mode,
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "operations": args.operations,
+            "mix": args.mix,
+            "seed": args.seed,
+            "bcrypt_rounds": args.bcrypt_rounds,
+            "elapsed_s": round(elapsed, 3),
+        },
+        "results": scenario.results(elapsed),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="Serveur cible (sinon app en mémoire)")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--operations", type=int, default=500)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--bcrypt-rounds", type=int, help="Coût bcrypt de l'app en mémoire"
+    )
+    parser.add_argument("--output", type=Path, help="Fichier JSON de sortie")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Dégradation tolérée avant échec (0.2 = 20 %%)",
+    )
+    args = parser.parse_args(argv)
+
+    output = asyncio.run(main_async(args))
+    dump_json(output, args.output)
+    return check_baseline(
+        output,
+        args.baseline,
+        args.max_regression,
+        args.save_baseline,
+        higher_is_better=("throughput_rps",),
+        lower_is_better=("p50_ms", "p95_ms", "p99_ms"),
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import hmac
+import secrets
+from typing import NamedTuple, Optional
+from sqlalchemy.orm import Session, joinedload
+from modules.api.auth.security import hash_token, keyed_hash
+from modules.api.users.models import ApiKey
+from utils.settings import settings
+from utils.ttl_cache import TTLCache
+
+API_KEY_CACHE_SIZE = settings.api_key_cache_size
+API_KEY_CACHE_TTL = settings.api_key_cache_ttl
+
+# Les clés d'API se distinguent des JWT par ce préfixe : sk_<préfixe>_<secret>
+API_KEY_PREFIX = "sk_"
+
+
+class ApiKeyIdentity(NamedTuple):
+    """Ce que prouve une clé d'API valide."""
+
+    key_id: int
+    user_id: int
+    email: str
+    role: str
+    scopes: tuple
+
+
+# Clés déjà vérifiées, par SHA256 de la clé complète (jamais la clé en clair)
+api_key_cache = TTLCache(API_KEY_CACHE_SIZE, API_KEY_CACHE_TTL)
+
+
+def generate_api_key() -> tuple[str, str, str]:
+    """Retourne (clé complète, préfixe, hash du secret) d'une nouvelle clé."""
+    prefix = secrets.token_hex(6)
+    secret = secrets.token_urlsafe(32)
+    return f"{API_KEY_PREFIX}{prefix}_{secret}", prefix, keyed_hash(secret)
+
+
+def is_api_key(token: str) -> bool:
+    return token.startswith(API_KEY_PREFIX)
+
+
+def authenticate_api_key(key: str, db: Session) -> Optional[ApiKeyIdentity]:
+    """Vérifie une clé d'API : cache, puis recherche par préfixe indexé."""
+    cache_key = hash_token(key)
+    identity = api_key_cache.get(cache_key)
+    if identity is not None:
+        return identity
+
+    prefix, _, secret = key.removeprefix(API_KEY_PREFIX).partition("_")
+    if not prefix or not secret:
+        return None
+
+    api_key = (
+        db.query(ApiKey)
+        .options(joinedload(ApiKey.user))
+        .filter(ApiKey.prefix == prefix)
+        .first()
+    )
+    # Comparaison en temps constant du hash du secret
+    if api_key is None or not hmac.compare_digest(
+        keyed_hash(secret), api_key.secret_hash
+    ):
+        return None
+    if api_key.revoked or not api_key.user.is_active:
+        return None
+
+    identity = ApiKeyIdentity(
+        key_id=api_key.id,
+        user_id=api_key.user_id,
+        email=api_key.user.email,
+        role=api_key.user.role.role,
+        scopes=tuple(api_key.scopes.split()),
+    )
+    api_key_cache.set(cache_key, identity)
+    return identity
+
+
+def forget_api_key(key_id: int):
+    api_key_cache.discard_if(lambda identity: identity.key_id == key_id)
+
+
+def forget_user_api_keys(user_id: int):
+    api_key_cache.discard_if(lambda identity: identity.user_id == user_id)
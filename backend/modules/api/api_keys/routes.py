@@ -0,0 +1,114 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from modules.api.api_keys.functions import generate_api_key
+from modules.api.api_keys.schemas import (
+    ApiKeyCreate,
+    ApiKeyCreated,
+    ApiKeyResponse,
+    api_key_list_adapter,
+)
+from modules.api.auth.functions import ROLE_SCOPES, get_current_user
+from modules.api.invalidation import api_key_revoked
+from modules.api.responses import FastJSONResponse, ModelResponse
+from modules.api.users.models import ApiKey, User
+from modules.database.dependencies import get_users_db, get_users_read_db
+from utils.logger_config import configure_logger
+
+# Configuration du logger
+logger = configure_logger()
+
+api_keys_router = APIRouter()
+
+
+def require_admin(current_user):
+    if "admin" not in current_user.scopes:
+        raise HTTPException(
+            status_code=403, detail="Accès refusé : réservé aux administrateurs."
+        )
+
+
+def to_response(api_key: ApiKey) -> dict:
+    return {
+        "id": api_key.id,
+        "name": api_key.name,
+        "prefix": api_key.prefix,
+        "user_id": api_key.user_id,
+        "scopes": api_key.scopes.split(),
+        "created_at": api_key.created_at,
+        "revoked": api_key.revoked,
+    }
+
+
+@api_keys_router.post("/", response_model=ApiKeyCreated)
+def create_api_key(
+    key_data: ApiKeyCreate,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_users_db),
+):
+    require_admin(current_user)
+
+    user = db.query(User).filter(User.id == key_data.user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="Utilisateur non trouvé.")
+
+    # Une clé ne peut pas accorder plus que le rôle de son utilisateur
+    allowed_scopes = ROLE_SCOPES.get(user.role.role, [])
+    forbidden = [scope for scope in key_data.scopes if scope not in allowed_scopes]
+    if forbidden:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Scopes non autorisés pour le rôle '{user.role.role}' : {forbidden}",
+        )
+
+    key, prefix, secret_hash = generate_api_key()
+    api_key = ApiKey(
+        name=key_data.name,
+        prefix=prefix,
+        secret_hash=secret_hash,
+        scopes=" ".join(dict.fromkeys(key_data.scopes)),
+        user_id=user.id,
+    )
+    db.add(api_key)
+    db.commit()
+    db.refresh(api_key)
+    logger.info(f"Clé d'API '{prefix}' créée pour l'utilisateur {user.id}")
+
+    return {**to_response(api_key), "key": key}
+
+
+@api_keys_router.get("/", response_model=list[ApiKeyResponse])
+def list_api_keys(
+    user_id: Optional[int] = None,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_users_read_db),
+):
+    require_admin(current_user)
+
+    query = db.query(ApiKey)
+    if user_id is not None:
+        query = query.filter(ApiKey.user_id == user_id)
+    api_keys = [to_response(api_key) for api_key in query.order_by(ApiKey.id)]
+    return ModelResponse(
+        api_key_list_adapter.validate_python(api_keys), api_key_list_adapter
+    )
+
+
+@api_keys_router.delete("/{key_id}")
+def revoke_api_key(
+    key_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_users_db),
+):
+    require_admin(current_user)
+
+    api_key = db.query(ApiKey).filter(ApiKey.id == key_id).first()
+    if not api_key:
+        raise HTTPException(status_code=404, detail="Clé d'API non trouvée.")
+
+    api_key.revoked = True
+    db.commit()
+    api_key_revoked(key_id)
+    logger.info(f"Clé d'API '{api_key.prefix}' révoquée")
+
+    return FastJSONResponse({"message": "Clé d'API révoquée"})
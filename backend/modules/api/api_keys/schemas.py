@@ -0,0 +1,27 @@
+from datetime import datetime
+from pydantic import BaseModel, TypeAdapter, conlist, constr
+from typing import List, Optional
+
+
+class ApiKeyCreate(BaseModel):
+    user_id: int
+    name: constr(min_length=1)  # type: ignore
+    scopes: conlist(str, min_length=1)  # type: ignore
+
+
+class ApiKeyResponse(BaseModel):
+    id: int
+    name: str
+    prefix: str
+    user_id: int
+    scopes: List[str]
+    created_at: Optional[datetime]
+    revoked: bool
+
+
+api_key_list_adapter = TypeAdapter(list[ApiKeyResponse])
+
+
+# La clé complète n'est renvoyée qu'une fois, à sa création
+class ApiKeyCreated(ApiKeyResponse):
+    key: str
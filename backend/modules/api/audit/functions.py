@@ -0,0 +1,186 @@
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from modules.api.audit.models import AuditEvent
+from modules.api.audit.schemas import AuditEventType
+from modules.database.session import AuditBase, AuditSessionLocal, audit_engine
+from utils.logger_config import configure_logger
+from utils.settings import settings
+
+# Configuration du logger
+logger = configure_logger()
+
+AUDIT_ENABLED = settings.audit_enabled
+AUDIT_QUEUE_SIZE = settings.audit_queue_size
+AUDIT_BATCH_SIZE = settings.audit_batch_size
+AUDIT_FLUSH_SECONDS = settings.audit_flush_seconds
+
+# Limite d'une page de l'endpoint de recherche
+MAX_AUDIT_PAGE = 1000
+
+
+class AuditLog:
+    """Journal d'audit écrit par lots depuis une file bornée en mémoire.
+
+    `record` ne touche jamais la base : l'événement est ajouté à la file sans
+    attendre, et la tâche périodique `flush` l'insère avec les autres en une
+    transaction. File pleine (base d'audit lente ou indisponible) :
+    l'événement est abandonné et compté dans `dropped` plutôt que de ralentir
+    la requête d'authentification.
+    """
+
+    def __init__(self, session_factory, maxsize: int = 10_000, batch_size: int = 500):
+        self.session_factory = session_factory
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # Lot dont l'insertion a échoué, retenté en tête du vidage suivant
+        self._retry: list[dict] = []
+        self._recorded = 0
+        self._dropped = 0
+        self._written = 0
+        self._batches = 0
+        self._failures = 0
+        self._high_water = 0
+        self._last_flush_ms = 0.0
+
+    def record(
+        self,
+        event_type: AuditEventType,
+        user_id: int | None = None,
+        actor_id: int | None = None,
+        email: str | None = None,
+        ip: str | None = None,
+        detail: str | None = None,
+    ) -> bool:
+        """Ajoute un événement à la file ; False s'il a été abandonné."""
+        audit_event = {
+            "created_at": datetime.utcnow(),
+            "event_type": AuditEventType(event_type).value,
+            "user_id": user_id,
+            "actor_id": actor_id,
+            "email": email,
+            "ip": ip,
+            "detail": detail,
+        }
+        try:
+            self._queue.put_nowait(audit_event)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            return False
+        with self._lock:
+            self._recorded += 1
+            self._high_water = max(self._high_water, self._queue.qsize())
+        return True
+
+    def _drain(self) -> list[dict]:
+        batch, self._retry = self._retry, []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self) -> int:
+        """Insère les événements en attente par lots ; retourne le nombre écrit."""
+        with self._flush_lock:
+            start = time.perf_counter()
+            written = 0
+            while True:
+                batch = self._drain()
+                if not batch:
+                    break
+                try:
+                    with self.session_factory() as db:
+                        db.execute(insert(AuditEvent), batch)
+                        db.commit()
+                except SQLAlchemyError as e:
+                    # Le lot reste en mémoire ; la file se remplit s'il échoue encore
+                    self._retry = batch
+                    with self._lock:
+                        self._failures += 1
+                    logger.error(f"Écriture du journal d'audit impossible : {e}")
+                    break
+                written += len(batch)
+                with self._lock:
+                    self._written += len(batch)
+                    self._batches += 1
+            self._last_flush_ms = round((time.perf_counter() - start) * 1000, 2)
+            return written
+
+    def clear(self):
+        with self._flush_lock:
+            self._retry = []
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize() + len(self._retry),
+                "maxsize": self.maxsize,
+                "recorded": self._recorded,
+                "dropped": self._dropped,
+                "written": self._written,
+                "batches": self._batches,
+                "failures": self._failures,
+                "high_water": self._high_water,
+                "last_flush_ms": self._last_flush_ms,
+            }
+
+
+audit_log = AuditLog(AuditSessionLocal, AUDIT_QUEUE_SIZE, AUDIT_BATCH_SIZE)
+
+
+def audit(event_type: AuditEventType, **fields):
+    """Consigne un événement d'authentification (sans effet si AUDIT_ENABLED=false)."""
+    if AUDIT_ENABLED:
+        audit_log.record(event_type, **fields)
+
+
+def init_audit_db(engine=None):
+    """Crée la table du journal (et ses index) dans audit.db si besoin."""
+    AuditBase.metadata.create_all(bind=audit_engine if engine is None else engine)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # Les dates sont stockées en UTC sans fuseau, comme dans users.db
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def query_audit_events(
+    db: Session,
+    user_id: int | None = None,
+    event_type: AuditEventType | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int = 100,
+) -> list[AuditEvent]:
+    """Événements les plus récents d'abord, filtrés par utilisateur, type et dates."""
+    query = db.query(AuditEvent)
+    if user_id is not None:
+        query = query.filter(AuditEvent.user_id == user_id)
+    if event_type is not None:
+        query = query.filter(AuditEvent.event_type == AuditEventType(event_type).value)
+    if since is not None:
+        query = query.filter(AuditEvent.created_at >= _naive_utc(since))
+    if until is not None:
+        query = query.filter(AuditEvent.created_at < _naive_utc(until))
+    return (
+        query.order_by(AuditEvent.created_at.desc(), AuditEvent.id.desc())
+        .limit(min(limit, MAX_AUDIT_PAGE))
+        .all()
+    )
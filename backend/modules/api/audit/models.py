@@ -0,0 +1,34 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Index, Integer, String, event
+from modules.database.session import AuditBase
+
+
+class AuditEvent(AuditBase):
+    __tablename__ = "audit_events"
+    __table_args__ = (
+        # Recherches de l'endpoint d'administration : par utilisateur ou par
+        # type d'événement, sur une plage de dates
+        Index("ix_audit_events_user_time", "user_id", "created_at"),
+        Index("ix_audit_events_type_time", "event_type", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    event_type = Column(String, nullable=False)
+    # Pas de clé étrangère : les utilisateurs vivent dans une autre base
+    user_id = Column(Integer, nullable=True)  # Utilisateur concerné
+    actor_id = Column(Integer, nullable=True)  # Administrateur à l'origine de l'action
+    email = Column(String, nullable=True)  # Email anonymisé
+    ip = Column(String, nullable=True)
+    detail = Column(String, nullable=True)
+
+
+# Journal en ajout seul : SQLite refuse toute modification ou suppression
+@event.listens_for(AuditEvent.__table__, "after_create")
+def forbid_changes(target, connection, **kw):
+    for operation in ("UPDATE", "DELETE"):
+        connection.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS audit_events_no_{operation.lower()} "
+            f"BEFORE {operation} ON audit_events "
+            "BEGIN SELECT RAISE(ABORT, 'journal d''audit en ajout seul'); END"
+        )
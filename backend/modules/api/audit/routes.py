@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from modules.api.audit.functions import MAX_AUDIT_PAGE, query_audit_events
+from modules.api.audit.schemas import (
+    AuditEventResponse,
+    AuditEventType,
+    audit_event_list_adapter,
+)
+from modules.api.auth.functions import get_current_user
+from modules.api.responses import ModelResponse
+from modules.database.dependencies import get_audit_db
+
+audit_router = APIRouter()
+
+
+@audit_router.get(
+    "/events",
+    response_model=list[AuditEventResponse],
+    summary="Rechercher dans le journal d'audit",
+    description="Événements les plus récents d'abord. Les événements sont écrits "
+    "par lots : les dernières secondes peuvent ne pas encore apparaître.",
+)
+def get_audit_events(
+    user_id: Optional[int] = None,
+    event_type: Optional[AuditEventType] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=MAX_AUDIT_PAGE),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_audit_db),
+):
+    if "admin" not in current_user.scopes:
+        raise HTTPException(
+            status_code=403, detail="Accès refusé : réservé aux administrateurs."
+        )
+
+    events = query_audit_events(db, user_id, event_type, since, until, limit)
+    return ModelResponse(
+        audit_event_list_adapter.validate_python(events, from_attributes=True),
+        audit_event_list_adapter,
+    )
@@ -0,0 +1,29 @@
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel, TypeAdapter
+from typing import Optional
+
+
+class AuditEventType(str, Enum):
+    login = "login"
+    login_failed = "login_failed"
+    refresh = "refresh"
+    role_changed = "role_changed"
+    user_deleted = "user_deleted"
+
+
+class AuditEventResponse(BaseModel):
+    id: int
+    created_at: datetime
+    event_type: str
+    user_id: Optional[int]
+    actor_id: Optional[int]
+    email: Optional[str]
+    ip: Optional[str]
+    detail: Optional[str]
+
+    class Config:
+        from_attributes = True
+
+
+audit_event_list_adapter = TypeAdapter(list[AuditEventResponse])
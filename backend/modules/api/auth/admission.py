@@ -0,0 +1,139 @@
+import asyncio
+import threading
+from collections import deque
+from fastapi import HTTPException, status
+from utils.logger_config import configure_logger
+from utils.settings import settings
+
+# Configuration du logger
+logger = configure_logger()
+
+# Par défaut : un hachage bcrypt par cœur, et une file de 4 requêtes par cœur
+BCRYPT_MAX_CONCURRENCY = settings.bcrypt_max_concurrency
+BCRYPT_MAX_QUEUE = settings.bcrypt_max_queue
+BCRYPT_QUEUE_TIMEOUT = settings.bcrypt_queue_timeout
+BCRYPT_RETRY_AFTER = settings.bcrypt_retry_after
+
+
+class AdmissionRejected(Exception):
+    """La requête n'a pas obtenu de créneau (file pleine ou attente trop longue)."""
+
+
+class AdmissionLimiter:
+    """Limite le nombre de requêtes simultanées, avec une file d'attente bornée.
+
+    Les créneaux sont transmis directement au premier de la file lors d'une
+    libération. L'état est protégé par un verrou et les réveils passent par
+    `call_soon_threadsafe`, ce qui rend le limiteur utilisable depuis plusieurs
+    boucles d'événements (cas du TestClient).
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int = 1,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters: deque = deque()
+        self._admitted = 0
+        self._rejected_queue_full = 0
+        self._rejected_timeout = 0
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._in_flight < self.max_concurrent and not self._waiters:
+                self._in_flight += 1
+                self._admitted += 1
+                return
+            if len(self._waiters) >= self.max_queue:
+                self._rejected_queue_full += 1
+                raise AdmissionRejected("File d'attente pleine")
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(waiter[1], self.queue_timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    self._rejected_timeout += 1
+                    raise AdmissionRejected("Attente trop longue")
+            # Le créneau a été transmis au moment même de l'expiration : on le garde
+        except asyncio.CancelledError:
+            with self._lock:
+                owned = waiter not in self._waiters
+                if not owned:
+                    self._waiters.remove(waiter)
+            if owned:
+                self.release()
+            raise
+
+        with self._lock:
+            self._admitted += 1
+
+    def release(self):
+        with self._lock:
+            if not self._waiters:
+                self._in_flight -= 1
+                return
+            # Le créneau passe au suivant sans repasser par le compteur
+            loop, future = self._waiters.popleft()
+
+        try:
+            loop.call_soon_threadsafe(_wake, future)
+        except RuntimeError:
+            # Boucle du waiter fermée : le créneau revient au suivant
+            self.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queued": len(self._waiters),
+                "admitted": self._admitted,
+                "rejected_queue_full": self._rejected_queue_full,
+                "rejected_timeout": self._rejected_timeout,
+            }
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+# Limiteur partagé par les routes qui hachent ou vérifient un mot de passe
+bcrypt_limiter = AdmissionLimiter(
+    BCRYPT_MAX_CONCURRENCY,
+    BCRYPT_MAX_QUEUE,
+    BCRYPT_QUEUE_TIMEOUT,
+    BCRYPT_RETRY_AFTER,
+)
+
+
+async def bcrypt_admission():
+    """Dépendance FastAPI : réserve un créneau bcrypt ou répond 503 immédiatement."""
+    limiter = bcrypt_limiter
+    try:
+        await limiter.acquire()
+    except AdmissionRejected as e:
+        logger.warning(f"Requête bcrypt rejetée : {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Serveur saturé, réessayez plus tard.",
+            headers={"Retry-After": str(limiter.retry_after)},
+        )
+    try:
+        yield
+    finally:
+        limiter.release()
@@ -0,0 +1,71 @@
+import secrets
+import threading
+from typing import Optional
+
+# Époque d'un utilisateur supprimé : aucun token ne la porte
+REVOKED_EPOCH = -1
+
+
+def new_token_epoch() -> int:
+    """Époque initiale d'un utilisateur : tirée au hasard, jamais 0.
+
+    Une base créée sans AUTOINCREMENT réutilise l'id d'un utilisateur supprimé ;
+    partir d'une époque fraîche empêche ses anciens tokens (uid, époque) de
+    valider le nouveau compte.
+    """
+    return secrets.randbelow(2**62) + 1
+
+
+class TokenEpochTable:
+    """Copie en mémoire de la colonne users.token_epoch (id → époque).
+
+    Chaque token embarque l'époque de son utilisateur à l'émission ; incrémenter
+    l'époque (changement de rôle, suppression, déconnexion partout) révoque d'un
+    coup tous les tokens émis auparavant. La table est chargée au démarrage puis
+    tenue à jour à chaque écriture : la vérification coûte une lecture de dict.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._epochs: dict[int, int] = {}
+        self._loaded = False
+        self._fallbacks = 0
+
+    def load(self, rows):
+        """Remplace le contenu par les couples (id, époque) fournis."""
+        epochs = {user_id: epoch for user_id, epoch in rows}
+        with self._lock:
+            self._epochs = epochs
+            self._loaded = True
+
+    def get(self, user_id: int) -> Optional[int]:
+        return self._epochs.get(user_id)
+
+    def set(self, user_id: int, epoch: int):
+        with self._lock:
+            self._epochs[user_id] = epoch
+
+    def revoke(self, user_id: int):
+        """Marque un utilisateur supprimé : ses tokens sont refusés sans requête."""
+        self.set(user_id, REVOKED_EPOCH)
+
+    def record_fallback(self):
+        with self._lock:
+            self._fallbacks += 1
+
+    def clear(self):
+        with self._lock:
+            self._epochs.clear()
+            self._loaded = False
+            self._fallbacks = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "users": len(self._epochs),
+                "database_fallbacks": self._fallbacks,
+            }
+
+
+token_epochs = TokenEpochTable()
@@ -1,27 +1,46 @@
-from modules.api.auth.security import verify_password, anonymize, hash_token
+from modules.api.auth.security import (
+    verify_password,
+    anonymize,
+    hash_token,
+    hash_password,
+    needs_rehash,
+)
 from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
-import os
-from dotenv import load_dotenv
 from utils.logger_config import configure_logger
 from modules.api.users.functions import get_user_by_email
+from modules.api.users import email_filter
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from modules.api.users.models import RefreshToken
+from typing import Optional
+from modules.api.users.models import RefreshToken, User
+from modules.api.auth.epochs import token_epochs
 from modules.api.users.schemas import TokenData
 from fastapi.security import SecurityScopes, OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
-from modules.database.dependencies import get_users_db
+from modules.database.dependencies import get_users_read_db
+from modules.database.session import UsersSessionLocal
+from modules.database import writer
+from modules.api.api_keys.functions import (
+    ApiKeyIdentity,
+    authenticate_api_key,
+    is_api_key,
+)
 from pydantic import ValidationError
+from utils.settings import settings
 
 # Configuration du logger
 logger = configure_logger()
 
-# Charger les variables d'environnement
-load_dotenv()
-
-SECRET_KEY = os.getenv("SECRET_KEY")
+SECRET_KEY = settings.secret_key
 ALGORITHM = "HS256"
 
+# Access tokens porteurs du profil : /auth/users/me répond sans base de données
+RICH_ACCESS_TOKENS = settings.rich_access_tokens
+
+# Scopes accordés par chaque rôle
+ROLE_SCOPES = {"admin": ["admin"], "reader": ["reader"]}
+
 # Gestion de l'authentification avec OAuth2
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="auth/login",
@@ -33,15 +52,18 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
-def create_token(data: dict, expires_delta: timedelta = None):
+def create_token(data: dict, expires_delta: timedelta = None, user: User = None):
     to_encode = data.copy()
+    # Époque de l'utilisateur : l'incrémenter révoque tous ses tokens
+    if user is not None:
+        to_encode["uid"] = user.id
+        to_encode["epoch"] = user.token_epoch
     expire = datetime.now(timezone.utc) + (
         expires_delta if expires_delta else timedelta(minutes=60)
     )
 
     role = data.get("role")
-    scopes_map = {"admin": ["admin"], "reader": ["reader"]}
-    scopes = scopes_map.get(role, [])
+    scopes = ROLE_SCOPES.get(role, [])
 
     # Déterminer le type du token
     token_type = data.get("type", "access")
@@ -57,6 +79,45 @@ def create_token(data: dict, expires_delta: timedelta = None):
     return encoded_jwt
 
 
+def access_token_claims(user: User) -> dict:
+    """Claims d'un access token ; enrichis du profil si RICH_ACCESS_TOKENS."""
+    claims = {"sub": user.email, "role": user.role.role, "type": "access"}
+    if RICH_ACCESS_TOKENS:
+        claims.update(name=user.name, is_active=user.is_active)
+    return claims
+
+
+def load_token_epochs():
+    """Charge la table des époques depuis la colonne users.token_epoch."""
+    db = UsersSessionLocal()
+    try:
+        token_epochs.load(db.query(User.id, User.token_epoch))
+    finally:
+        db.close()
+
+
+def current_token_epoch(user_id: int, db: Session) -> Optional[int]:
+    """Époque courante d'un utilisateur, None s'il n'existe pas."""
+    epoch = token_epochs.get(user_id)
+    if epoch is None:
+        # Utilisateur absent de la table (créé par un autre worker, table non chargée)
+        token_epochs.record_fallback()
+        epoch = db.query(User.token_epoch).filter(User.id == user_id).scalar()
+        if epoch is not None:
+            token_epochs.set(user_id, epoch)
+    return epoch
+
+
+def bump_token_epoch(db: Session, user_id: int) -> Optional[int]:
+    """Incrémente l'époque en base ; la table est mise à jour après le commit."""
+    return db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(token_epoch=User.token_epoch + 1)
+        .returning(User.token_epoch)
+    ).scalar()
+
+
 def authenticate_user(db: Session, email: str, password: str):
     """Authentifie un utilisateur en vérifiant son email et son mot de passe."""
     logger.info("Authentification de l'utilisateur...")
@@ -64,6 +125,11 @@ def authenticate_user(db: Session, email: str, password: str):
     # Hacher l'email fourni par l'utilisateur pour la comparaison
     anonymized_email = anonymize(email)  # Hacher l'email
 
+    # Email absent à coup sûr du filtre : inutile d'interroger la base
+    if email_filter.known_emails.definitely_absent(anonymized_email):
+        logger.info("Utilisateur non trouvé (filtre des emails connus).")
+        return False
+
     # Récupérer l'utilisateur en utilisant l'email haché
     user = get_user_by_email(anonymized_email, db)
 
@@ -76,20 +142,76 @@ def authenticate_user(db: Session, email: str, password: str):
         logger.info("Mot de passe invalide.")
         return False
 
+    # Re-hacher au coût courant si le coût bcrypt a changé depuis l'inscription
+    if needs_rehash(user.password):
+        user.password = hash_password(password)
+        db.commit()
+        logger.info("Mot de passe re-haché au coût bcrypt courant.")
+
     logger.info("Utilisateur authentifié avec succès")
     return user
 
 
+def group_commit(func):
+    """Écriture par l'écrivain à commit groupé ; 503 si elle n'est pas confirmée."""
+    try:
+        return writer.users_writer.execute(func)
+    except writer.WriteTimeout as e:
+        logger.warning(f"Écriture groupée non confirmée (appliquée : {e.applied})")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Écriture en attente, réessayez plus tard.",
+            headers={"Retry-After": "1"},
+        )
+
+
 def store_refresh_token(db: Session, user_id: int, token: str, expires_at: datetime):
-    refresh_token = RefreshToken(
-        token=token,
-        user_id=user_id,
-        expires_at=expires_at,
-    )
-    db.add(refresh_token)
+    def insert(session: Session):
+        session.add(RefreshToken(token=token, user_id=user_id, expires_at=expires_at))
+
+    # Écrivain à commit groupé : l'insertion partage le commit des logins simultanés
+    if writer.GROUP_COMMIT_ENABLED:
+        group_commit(insert)
+        return
+
+    insert(db)
     db.commit()
 
 
+def replace_refresh_token(
+    db: Session, old_token_id: int, user_id: int, token: str, expires_at: datetime
+) -> bool:
+    """Révoque l'ancien refresh token et stocke son successeur, en une transaction.
+
+    La révocation est conditionnelle : False si un autre worker l'a déjà faite.
+    """
+
+    def rotate(session: Session) -> bool:
+        claimed = session.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.id == old_token_id,
+                # Critère redondant qui désigne le shard de l'utilisateur
+                RefreshToken.user_id == user_id,
+                RefreshToken.revoked.is_(False),
+            )
+            .values(revoked=True)
+        ).rowcount
+        if claimed:
+            session.add(RefreshToken(token=token, user_id=user_id, expires_at=expires_at))
+        return bool(claimed)
+
+    if writer.GROUP_COMMIT_ENABLED:
+        return group_commit(rotate)
+
+    claimed = rotate(db)
+    if claimed:
+        db.commit()
+    else:
+        db.rollback()
+    return claimed
+
+
 def find_refresh_token(db: Session, provided_token: str) -> RefreshToken | None:
     refresh_token = (
         db.query(RefreshToken).filter(RefreshToken.token == provided_token).first()
@@ -110,16 +232,45 @@ def verify_token(provided_token: str, stored_hash: str) -> bool:
     return hash_token(provided_token) == stored_hash
 
 
+def api_key_token_data(identity: ApiKeyIdentity) -> TokenData:
+    """Identité d'une clé d'API ; ses scopes restent bornés par le rôle actuel."""
+    role_scopes = ROLE_SCOPES.get(identity.role, [])
+    return TokenData(
+        sub=identity.email,
+        role=identity.role,
+        scopes=[scope for scope in identity.scopes if scope in role_scopes],
+        uid=identity.user_id,
+    )
+
+
+def check_scopes(security_scopes: SecurityScopes, token_scopes: list[str]):
+    for scope in security_scopes.scopes:
+        if scope not in token_scopes:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions",
+            )
+
+
 def get_current_user(
     security_scopes: SecurityScopes,
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_users_db),
+    db: Session = Depends(get_users_read_db),
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
     )
 
+    # Clé d'API des clients de service : pas de JWT à décoder
+    if is_api_key(token):
+        identity = authenticate_api_key(token, db)
+        if identity is None:
+            raise credentials_exception
+        token_data = api_key_token_data(identity)
+        check_scopes(security_scopes, token_data.scopes)
+        return token_data
+
     try:
         # Décodage du token
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -136,14 +287,15 @@ def get_current_user(
         )
 
     # Vérification des permissions
-    for scope in security_scopes.scopes:
-        if scope not in token_scopes:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions",
-            )
+    check_scopes(security_scopes, token_scopes)
+
+    # Token porteur d'une époque : la table en mémoire suffit à le valider
+    if token_data.uid is not None and token_data.epoch is not None:
+        if current_token_epoch(token_data.uid, db) != token_data.epoch:
+            raise credentials_exception
+        return token_data
 
-    # Recherche de l'utilisateur par email
+    # Token émis avant les époques : recherche de l'utilisateur par email
     user = get_user_by_email(email, db)
     if not user:
         raise credentials_exception
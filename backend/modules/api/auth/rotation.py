@@ -0,0 +1,52 @@
+import threading
+from contextlib import contextmanager
+from utils.settings import settings
+from utils.ttl_cache import TTLCache
+
+# Fenêtre pendant laquelle un refresh token tout juste remplacé rend le même successeur
+REFRESH_GRACE_SECONDS = settings.refresh_grace_seconds
+REFRESH_GRACE_CACHE_SIZE = settings.refresh_grace_cache_size
+
+
+class RefreshRotationCache:
+    """Successeurs des refresh tokens récemment remplacés, par hash de l'ancien token.
+
+    Plusieurs onglets qui rafraîchissent en même temps le même token reçoivent
+    tous la même paire au lieu d'échouer et de repasser par /auth/login. Les
+    rotations concurrentes d'un même token sont sérialisées (single-flight) : la
+    première fait la rotation, les suivantes lisent son résultat.
+    """
+
+    def __init__(self, maxsize: int, grace_seconds: float):
+        self._successors = TTLCache(maxsize, grace_seconds)
+        self._lock = threading.Lock()
+        self._inflight: dict[str, list] = {}
+
+    @contextmanager
+    def single_flight(self, token_hash: str):
+        with self._lock:
+            entry = self._inflight.setdefault(token_hash, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._inflight[token_hash]
+
+    def successor(self, token_hash: str):
+        return self._successors.get(token_hash)
+
+    def remember(self, token_hash: str, token_pair: dict):
+        self._successors.set(token_hash, token_pair)
+
+    def clear(self):
+        self._successors.clear()
+
+    def stats(self) -> dict:
+        return {"grace_seconds": self._successors.ttl, **self._successors.stats()}
+
+
+refresh_rotation = RefreshRotationCache(REFRESH_GRACE_CACHE_SIZE, REFRESH_GRACE_SECONDS)
@@ -1,88 +1,144 @@
 from utils.logger_config import configure_logger
 from datetime import timedelta, timezone, datetime
-from dotenv import load_dotenv
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi import APIRouter, Depends, HTTPException, status
-from modules.api.users.schemas import Token
-from modules.database.dependencies import get_users_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from modules.api.users.schemas import LoginResponse, Token
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.database import writer
+from modules.database.session import users_shard_for_email
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from modules.api.auth.functions import (
+    access_token_claims,
     authenticate_user,
+    bump_token_epoch,
     create_token,
+    replace_refresh_token,
     store_refresh_token,
 )
-import os
+from modules.api.auth.epochs import REVOKED_EPOCH, token_epochs
+from modules.api.invalidation import (
+    email_added,
+    email_removed,
+    invalidation_bus,
+    token_epoch_changed,
+    user_changed,
+)
 from jose import JWTError, jwt
-from modules.api.users.schemas import UserResponse, UserCreate, RoleUpdate
-from modules.api.users.create_db import User, Role
+from modules.api.users.schemas import (
+    UserResponse,
+    UserCreate,
+    RoleUpdate,
+    user_list_adapter,
+)
+from modules.api.users.models import RefreshToken, Role, User
 from modules.api.users.functions import get_user_by_email
+from modules.api.users import email_filter
+from modules.api.users.cache import user_cache
+from modules.api.users import activity
+from modules.api.users.version import etag_matches, not_modified, users_version
 from modules.api.auth.functions import (
     find_refresh_token,
     get_current_user,
     oauth2_scheme,
 )
 from modules.api.auth.security import anonymize, hash_password, hash_token
-from fastapi.responses import JSONResponse
+from modules.api.auth import admission, rotation, throttle
+from modules.api import startup
+from modules.api.audit import functions as audit_functions
+from modules.api.audit.functions import audit
+from modules.api.audit.schemas import AuditEventType
+from modules.api.stats import broadcast
+from modules.api.stats import functions as stats_functions
+from modules.api.stats.schemas import ActivityEvent
+from modules.api.api_keys.functions import api_key_cache
+from modules.api.auth.admission import bcrypt_admission
+from modules.api.auth.throttle import login_throttle_guard
+from modules.api.responses import FastJSONResponse, ModelResponse
+from utils.settings import settings
 from uuid import uuid4
 
-load_dotenv()
-
 # Configuration du logger
 logger = configure_logger()
 
-SECRET_KEY = os.getenv("SECRET_KEY")
+SECRET_KEY = settings.secret_key
 ALGORITHM = "HS256"
 
 auth_router = APIRouter()
 
 
-@auth_router.post("/login", response_model=Token)
+@auth_router.post("/login", response_model=LoginResponse)
 def login_for_access_token(
+    request: Request,
+    include_profile: bool = Query(
+        False,
+        description="Ajoute le profil (`user`) à la réponse : évite un appel "
+        "à /auth/users/me juste après la connexion.",
+    ),
+    throttle_keys: list[str] = Depends(login_throttle_guard),
+    _: None = Depends(bcrypt_admission),
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_users_db),
 ):
+    client_ip = throttle.client_ip(request)
     user = authenticate_user(db, form_data.username, form_data.password)
     if not user:
+        throttle.record_failure(throttle_keys)
+        stats_functions.activity_series.record(ActivityEvent.login_failed)
+        audit(
+            AuditEventType.login_failed,
+            email=anonymize(form_data.username),
+            ip=client_ip,
+        )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    throttle.record_success(throttle_keys)
 
     access_token_expires = timedelta(minutes=15)
     refresh_token_expires = timedelta(days=7)
 
     access_token = create_token(
-        data={"sub": user.email, "role": user.role.role, "type": "access"},
+        data=access_token_claims(user),
         expires_delta=access_token_expires,
+        user=user,
     )
 
     refresh_token = create_token(
-        data={"sub": user.email, "type": "refresh"},
+        data={"sub": user.email, "type": "refresh", "jti": str(uuid4())},
         expires_delta=refresh_token_expires,
+        user=user,
     )
 
     refresh_expiry = datetime.now(timezone.utc) + refresh_token_expires
     hashed_token = hash_token(refresh_token)
     store_refresh_token(db, user.id, hashed_token, refresh_expiry)
+    activity.login_activity.record(user.id)
+    stats_functions.activity_series.record(ActivityEvent.login)
+    audit(AuditEventType.login, user_id=user.id, email=user.email, ip=client_ip)
 
-    return JSONResponse(
-        {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
-            "token_type": "bearer",
-        }
-    )
+    content = {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
+    if include_profile:
+        content["user"] = UserResponse.model_validate(user).model_dump(mode="json")
+    return FastJSONResponse(content)
 
 
 @auth_router.post("/refresh", response_model=Token)
 def refresh_token(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_users_db)
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_users_db),
 ):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get("sub")
-        role = payload.get("role")
         token_type = payload.get("type")
         if token_type != "refresh":
             raise HTTPException(
@@ -92,6 +148,32 @@ def refresh_token(
         raise HTTPException(status_code=401, detail="Token non valide")
 
     hashed_token = hash_token(token)
+
+    # Rafraîchissements simultanés du même token : une seule rotation
+    with rotation.refresh_rotation.single_flight(hashed_token):
+        # Token tout juste remplacé : même successeur pendant la fenêtre de grâce
+        token_pair = rotation.refresh_rotation.successor(hashed_token)
+        replayed = token_pair is not None
+        if not replayed:
+            token_pair = rotate_refresh_token(db, payload, hashed_token)
+            rotation.refresh_rotation.remember(hashed_token, token_pair)
+
+    # Un rafraîchissement compte comme activité, pas comme nouvelle connexion
+    if payload.get("uid") is not None:
+        activity.login_activity.record(payload["uid"], login=False)
+    stats_functions.activity_series.record(ActivityEvent.refresh)
+    audit(
+        AuditEventType.refresh,
+        user_id=payload.get("uid"),
+        email=payload.get("sub"),
+        ip=throttle.client_ip(request),
+        detail="grace" if replayed else None,
+    )
+    return FastJSONResponse(token_pair)
+
+
+def rotate_refresh_token(db: Session, payload: dict, hashed_token: str) -> dict:
+    """Révoque le refresh token fourni et émet une nouvelle paire de tokens."""
     refresh_token_db = find_refresh_token(db, hashed_token)
 
     if not refresh_token_db:
@@ -102,60 +184,95 @@ def refresh_token(
     ):
         raise HTTPException(status_code=401, detail="Refresh token expiré")
 
-    refresh_token_db.revoked = True
+    # Réutilisation d'un token déjà remplacé, hors fenêtre de grâce
+    if refresh_token_db.revoked:
+        raise HTTPException(status_code=401, detail="Refresh token révoqué")
 
-    hashed_email = anonymize(email)
-    user = get_user_by_email(hashed_email, db)
+    # Le propriétaire est celui du token stocké : le "sub" n'a pas à être re-haché
+    user = refresh_token_db.users
     if not user:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
 
+    # Token émis avant une déconnexion partout ou un changement de rôle
+    if "epoch" in payload and payload["epoch"] != user.token_epoch:
+        raise HTTPException(status_code=401, detail="Refresh token révoqué")
+
     new_access_token = create_token(
-        data={"sub": email, "role": role}, expires_delta=timedelta(minutes=15)
+        data=access_token_claims(user),
+        expires_delta=timedelta(minutes=15),
+        user=user,
     )
 
     new_refresh_token = create_token(
-        data={"sub": email, "role": role, "type": "refresh", "jti": str(uuid4())},
+        data={"sub": user.email, "type": "refresh", "jti": str(uuid4())},
         expires_delta=timedelta(days=7),
+        user=user,
     )
     hashed_new_refresh_token = hash_token(new_refresh_token)
     refresh_expiry = datetime.now(timezone.utc) + timedelta(days=7)
 
-    store_refresh_token(
-        db, user_id=user.id, token=hashed_new_refresh_token, expires_at=refresh_expiry
-    )
+    # Révocation conditionnelle : un autre worker a pu faire la rotation entre-temps
+    if not replace_refresh_token(
+        db, refresh_token_db.id, user.id, hashed_new_refresh_token, refresh_expiry
+    ):
+        raise HTTPException(status_code=401, detail="Refresh token révoqué")
+
+    return {
+        "access_token": new_access_token,
+        "refresh_token": new_refresh_token,
+        "token_type": "bearer",
+    }
 
-    db.commit()
 
-    return JSONResponse(
-        {
-            "access_token": new_access_token,
-            "refresh_token": new_refresh_token,
-            "token_type": "bearer",
-        }
+@auth_router.post("/logout-all")
+def logout_all(
+    current_user: dict = Depends(get_current_user), db: Session = Depends(get_users_db)
+):
+    """Déconnecte l'utilisateur de toutes ses sessions (tous ses tokens)."""
+    user = get_user_by_email(current_user.sub, db)
+    if not user:
+        raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
+
+    epoch = bump_token_epoch(db, user.id)
+    db.query(RefreshToken).filter(RefreshToken.user_id == user.id).update(
+        {"revoked": True}
     )
+    db.commit()
+    token_epoch_changed(user.id, epoch)
+
+    return FastJSONResponse({"message": "Toutes les sessions ont été fermées."})
 
 
 @auth_router.get("/users/me", response_model=UserResponse)
 def read_users_me(
-    current_user: dict = Depends(get_current_user), db: Session = Depends(get_users_db)
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_users_read_db),
 ):
+    # Token enrichi et déjà vérifié : le profil est dans les claims
+    if current_user.has_profile:
+        return ModelResponse(
+            UserResponse(
+                id=current_user.uid,
+                name=current_user.name,
+                email=current_user.sub,
+                is_active=current_user.is_active,
+                role=current_user.role,
+            )
+        )
+
     user = get_user_by_email(current_user.sub, db)
 
     if not user:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
 
-    return UserResponse(
-        id=user.id,
-        name=user.name,
-        email=user.email,
-        is_active=user.is_active,
-        role=user.role.role,
-    )
+    return ModelResponse(UserResponse.model_validate(user))
 
 
 @auth_router.get("/users/", response_model=list[UserResponse])
 def get_all_users(
-    current_user: dict = Depends(get_current_user), db: Session = Depends(get_users_db)
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_users_read_db),
 ):
     if "admin" not in current_user.scopes:
         raise HTTPException(
@@ -163,20 +280,31 @@ def get_all_users(
             detail="Accès refusé : réservé aux administrateurs.",
         )
 
-    # Récupérer tous les utilisateurs de la base de données
-    users = db.query(User).all()
-
-    # Retourner les utilisateurs sous forme de liste de UserResponse
-    return [
-        UserResponse(
-            id=u.id,
-            name=u.name,
-            email=u.email,
-            is_active=u.is_active,
-            role=u.role.role,
+    # Liste inchangée depuis le dernier appel du client : ni requête ni sérialisation
+    etag = users_version.etag("users")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    # Récupérer tous les utilisateurs en une requête jointe aux rôles (des tuples,
+    # pas d'objets ORM) ; avec plusieurs shards, les plages d'ids gardent la
+    # fusion triée par id
+    rows = db.execute(
+        select(
+            User.id,
+            User.name,
+            User.email,
+            User.is_active,
+            Role.role,
+            User.last_login_at,
+            User.login_count,
         )
-        for u in users
-    ]
+        .join(User.role)
+        .order_by(User.id)
+    ).all()
+
+    # Une seule validation par ligne, puis sérialisation JSON directe
+    users = user_list_adapter.validate_python(rows, from_attributes=True)
+    return ModelResponse(users, user_list_adapter, headers={"ETag": etag})
 
 
 @auth_router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -199,42 +327,74 @@ def delete_user(
     # Suppression de l'utilisateur
     db.delete(user_to_delete)
     db.commit()
+    email_removed(user_to_delete.email)
+    user_changed(user_id)
+    token_epoch_changed(user_id, REVOKED_EPOCH)
+    audit(
+        AuditEventType.user_deleted,
+        user_id=user_id,
+        actor_id=current_user.uid,
+        email=user_to_delete.email,
+    )
+    broadcast.publish("user_deleted", id=user_id)
 
-    return JSONResponse({"message": "Utilisateur supprimé"})
+    return FastJSONResponse({"message": "Utilisateur supprimé"})
 
 
 @auth_router.post("/users/", response_model=UserResponse)
-def create_user(user_data: UserCreate, db: Session = Depends(get_users_db)):
+def create_user(
+    user_data: UserCreate,
+    _: None = Depends(bcrypt_admission),
+    db: Session = Depends(get_users_db),
+):
     anonymized_email = anonymize(user_data.email)
-    existing_user = get_user_by_email(anonymized_email, db)
-    if existing_user:
-        raise HTTPException(
-            status_code=400,
-            detail="Un utilisateur avec cet email existe déjà",
+
+    # Une seule requête : l'index unique sur l'email arbitre les inscriptions
+    # concurrentes, et le rôle est résolu par une sous-requête
+    reader_role_id = select(Role.id).where(Role.role == "reader").scalar_subquery()
+    statement = (
+        sqlite_insert(User)
+        .values(
+            email=anonymized_email,
+            name=user_data.name,
+            password=hash_password(user_data.password),
+            role_id=reader_role_id,
+            is_active=True,
         )
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User.id, User.name, User.email, User.is_active, User.token_epoch)
+    )
 
-    role_obj = db.query(Role).filter_by(role="reader").first()
-    if not role_obj:
+    try:
+        new_user = db.execute(
+            statement,
+            bind_arguments={"shard_id": users_shard_for_email(anonymized_email)},
+        ).first()
+        db.commit()
+    except IntegrityError:
+        # Seule contrainte restante : role_id NULL si le rôle n'existe pas
+        db.rollback()
         raise HTTPException(status_code=500, detail="Le rôle 'reader' est introuvable")
 
-    new_user = User(
-        email=anonymized_email,
-        name=user_data.name,
-        password=hash_password(user_data.password),
-        role_id=role_obj.id,
-        is_active=True,
-    )
+    if new_user is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Un utilisateur avec cet email existe déjà",
+        )
+    email_added(anonymized_email)
+    token_epoch_changed(new_user.id, new_user.token_epoch)
+    stats_functions.activity_series.record(ActivityEvent.signup)
+    broadcast.publish("user_created", id=new_user.id, role="reader")
+    user_changed(new_user.id)
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-
-    return UserResponse(
-        id=new_user.id,
-        name=new_user.name,
-        email=new_user.email,
-        is_active=new_user.is_active,
-        role=new_user.role.role,
+    return ModelResponse(
+        UserResponse(
+            id=new_user.id,
+            name=new_user.name,
+            email=new_user.email,
+            is_active=new_user.is_active,
+            role="reader",
+        )
     )
 
 
@@ -260,11 +420,47 @@ def update_user_role(
     if not new_role:
         raise HTTPException(status_code=404, detail="Rôle non trouvé.")
 
-    # Mise à jour du rôle de l'utilisateur
+    # Mise à jour du rôle de l'utilisateur ; les tokens de l'ancien rôle sont révoqués
     user.role_id = new_role.id
+    epoch = bump_token_epoch(db, user_id)
     db.commit()
     db.refresh(user)
+    token_epoch_changed(user_id, epoch)
+    user_changed(user_id)
+    audit(
+        AuditEventType.role_changed,
+        user_id=user_id,
+        actor_id=current_user.uid,
+        detail=new_role.role,
+    )
+    broadcast.publish("role_changed", id=user_id, role=new_role.role)
 
-    return JSONResponse(
+    return FastJSONResponse(
         {"message": f"Rôle de l'utilisateur mis à jour en '{new_role.role}'."}
     )
+
+
+@auth_router.get("/metrics")
+def get_metrics(current_user: dict = Depends(get_current_user)):
+    if "admin" not in current_user.scopes:
+        raise HTTPException(
+            status_code=403, detail="Accès refusé : réservé aux administrateurs."
+        )
+
+    return {
+        "admission": admission.bcrypt_limiter.stats(),
+        "login_throttle": throttle.login_throttle.stats(),
+        "ip_login_throttle": throttle.ip_login_throttle.stats(),
+        "email_filter": email_filter.known_emails.stats(),
+        "user_cache": user_cache.stats(),
+        "token_epochs": token_epochs.stats(),
+        "invalidation_bus": invalidation_bus.stats(),
+        "refresh_rotation": rotation.refresh_rotation.stats(),
+        "api_key_cache": api_key_cache.stats(),
+        "group_commit": writer.users_writer.stats(),
+        "startup": startup.startup_metrics.stats(),
+        "audit": audit_functions.audit_log.stats(),
+        "login_activity": activity.login_activity.stats(),
+        "activity_series": stats_functions.activity_series.stats(),
+        "dashboard_stream": broadcast.dashboard_hub.stats(),
+    }
@@ -1,5 +1,15 @@
 import hashlib
+import hmac
+import time
 import bcrypt
+from utils.settings import settings
+
+# Coût bcrypt (log2 du nombre de tours) ; 12 est la valeur par défaut de bcrypt
+BCRYPT_ROUNDS = settings.bcrypt_rounds
+
+# Bornes du calibrage : en dessous de 10 le hachage devient trop bon marché
+MIN_CALIBRATED_ROUNDS = 10
+MAX_CALIBRATED_ROUNDS = 16
 
 
 # Fonction pour anonymiser un nom ou un prénom via hachage SHA256
@@ -13,11 +23,27 @@ def hash_token(token: str) -> str:
     return hashlib.sha256(token.encode("utf-8")).hexdigest()
 
 
+# Hachage rapide à clé (HMAC-SHA256) des secrets de clés d'API à forte entropie
+def keyed_hash(secret: str) -> str:
+    key = (settings.secret_key or "").encode("utf-8")
+    return hmac.new(key, secret.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def get_bcrypt_rounds() -> int:
+    return BCRYPT_ROUNDS
+
+
+def set_bcrypt_rounds(rounds: int):
+    """Change le coût utilisé pour les nouveaux hachages (et les re-hachages)."""
+    global BCRYPT_ROUNDS
+    BCRYPT_ROUNDS = rounds
+
+
 # Fonction pour hacher un mot de passe avec bcrypt
-def hash_password(password: str) -> str:
-    """Hache un mot de passe avec bcrypt."""
+def hash_password(password: str, rounds: int | None = None) -> str:
+    """Hache un mot de passe avec bcrypt, au coût configuré par défaut."""
     # Générer un salt unique pour chaque mot de passe
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds or BCRYPT_ROUNDS)
 
     # Hacher le mot de passe avec le salt
     hashed_password = bcrypt.hashpw(password.encode("utf-8"), salt)
@@ -30,3 +56,37 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Vérifie si le mot de passe en clair correspond au mot de passe haché."""
     return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+
+
+def get_password_rounds(hashed_password: str) -> int:
+    """Lit le coût encodé dans un hash bcrypt ($2b$<coût>$...)."""
+    return int(hashed_password.split("$")[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Indique si un hash a été calculé avec un autre coût que le coût courant."""
+    return get_password_rounds(hashed_password) != BCRYPT_ROUNDS
+
+
+def measure_verify_ms(rounds: int, samples: int = 2) -> float:
+    """Meilleure durée (ms) d'une vérification bcrypt à ce coût sur cette machine."""
+    hashed_password = hash_password("calibration", rounds=rounds)
+    best = float("inf")
+    for _ in range(samples):
+        start = time.perf_counter()
+        verify_password("calibration", hashed_password)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: float,
+    min_rounds: int = MIN_CALIBRATED_ROUNDS,
+    max_rounds: int = MAX_CALIBRATED_ROUNDS,
+) -> int:
+    """Retourne le coût le plus élevé dont la vérification tient dans `target_ms`."""
+    rounds = min_rounds
+    # Chaque tour de plus double la durée : on monte tant que la cible est tenue
+    while rounds < max_rounds and measure_verify_ms(rounds + 1) <= target_ms:
+        rounds += 1
+    return rounds
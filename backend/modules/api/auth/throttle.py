@@ -0,0 +1,235 @@
+import ipaddress
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+from modules.api.auth.security import anonymize
+from utils.logger_config import configure_logger
+from utils.settings import settings
+
+# Configuration du logger
+logger = configure_logger()
+
+LOGIN_MAX_ATTEMPTS = settings.login_max_attempts
+LOGIN_WINDOW_SECONDS = settings.login_window_seconds
+LOGIN_FREE_FAILURES = settings.login_free_failures
+LOGIN_BACKOFF_BASE = settings.login_backoff_base
+LOGIN_BACKOFF_MAX = settings.login_backoff_max
+LOGIN_THROTTLE_MAX_ENTRIES = settings.login_throttle_max_entries
+LOGIN_IP_MAX_ATTEMPTS = settings.login_ip_max_attempts
+# Adresses ou réseaux (ex. le conteneur du frontend) dont on croit X-Forwarded-For
+TRUSTED_PROXIES = tuple(
+    ipaddress.ip_network(proxy, strict=False) for proxy in settings.trusted_proxies
+)
+
+
+class _Entry:
+    __slots__ = ("attempts", "failures", "last_failure", "blocked_until")
+
+    def __init__(self, max_attempts: int):
+        self.attempts: deque = deque(maxlen=max_attempts)
+        self.failures = 0
+        self.last_failure = 0.0
+        self.blocked_until = 0.0
+
+
+class LoginThrottle:
+    """Limite les tentatives de connexion par clé (IP, email anonymisé).
+
+    Chaque clé a droit à `max_attempts` tentatives par fenêtre glissante de
+    `window` secondes. Au-delà de `free_failures` échecs consécutifs, la clé est
+    bloquée pendant une durée qui double à chaque nouvel échec. Les clés sont
+    conservées dans un LRU de `max_entries` entrées pour borner la mémoire.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int,
+        window: float,
+        free_failures: int,
+        backoff_base: float,
+        backoff_max: float,
+        max_entries: int,
+        clock=time.monotonic,
+    ):
+        self.max_attempts = max_attempts
+        self.window = window
+        self.free_failures = free_failures
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._admitted = 0
+        self._rejected = 0
+        self._evicted = 0
+
+    def _entry(self, key: str) -> _Entry:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry(self.max_attempts)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evicted += 1
+        else:
+            self._entries.move_to_end(key)
+        return entry
+
+    def check(self, keys: list[str]) -> float:
+        """Retourne 0 si la tentative est admise, sinon le délai d'attente en secondes."""
+        now = self.clock()
+        with self._lock:
+            entries = [self._entry(key) for key in keys]
+            retry_after = 0.0
+            for entry in entries:
+                retry_after = max(retry_after, entry.blocked_until - now)
+                if len(entry.attempts) >= self.max_attempts:
+                    retry_after = max(retry_after, entry.attempts[0] + self.window - now)
+
+            if retry_after > 0:
+                self._rejected += 1
+                return retry_after
+
+            for entry in entries:
+                entry.attempts.append(now)
+            self._admitted += 1
+            return 0.0
+
+    def record_failure(self, keys: list[str]):
+        now = self.clock()
+        with self._lock:
+            for key in keys:
+                entry = self._entry(key)
+                # Des échecs anciens ne comptent plus pour le backoff
+                if now - entry.last_failure > self.backoff_max:
+                    entry.failures = 0
+                entry.failures += 1
+                entry.last_failure = now
+                excess = entry.failures - self.free_failures
+                if excess > 0:
+                    delay = min(self.backoff_max, self.backoff_base * 2 ** (excess - 1))
+                    entry.blocked_until = now + delay
+
+    def record_success(self, keys: list[str]):
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.failures = 0
+                    entry.blocked_until = 0.0
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self._admitted = self._rejected = self._evicted = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "tracked_keys": len(self._entries),
+                "max_entries": self.max_entries,
+                "evicted": self._evicted,
+            }
+
+
+# Limite principale : par email, avec backoff après échecs consécutifs
+login_throttle = LoginThrottle(
+    LOGIN_MAX_ATTEMPTS,
+    LOGIN_WINDOW_SECONDS,
+    LOGIN_FREE_FAILURES,
+    LOGIN_BACKOFF_BASE,
+    LOGIN_BACKOFF_MAX,
+    LOGIN_THROTTLE_MAX_ENTRIES,
+)
+
+# Plafond large par IP, sans backoff : derrière un proxy non déclaré (le frontend
+# Streamlit), tous les utilisateurs partagent une IP et ne doivent pas se bloquer
+ip_login_throttle = LoginThrottle(
+    max(LOGIN_IP_MAX_ATTEMPTS, 1),
+    LOGIN_WINDOW_SECONDS,
+    0,
+    LOGIN_BACKOFF_BASE,
+    LOGIN_BACKOFF_MAX,
+    LOGIN_THROTTLE_MAX_ENTRIES,
+)
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+
+def client_ip(request: Request) -> str:
+    """IP du client ; X-Forwarded-For n'est lu que si la connexion vient d'un proxy
+    de confiance (TRUSTED_PROXIES), sinon n'importe qui pourrait choisir son IP."""
+    host = request.client.host if request.client else "unknown"
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded or not _is_trusted_proxy(host):
+        return host
+    # De droite à gauche : la première adresse qui n'est pas un proxy de confiance
+    for address in reversed([part.strip() for part in forwarded.split(",")]):
+        if address and not _is_trusted_proxy(address):
+            return address
+    return host
+
+
+def throttle_keys(client_ip: str, email: str) -> list[str]:
+    keys = [f"email:{anonymize(email)}"]
+    if LOGIN_IP_MAX_ATTEMPTS:
+        keys.insert(0, f"ip:{client_ip}")
+    return keys
+
+
+def _split(keys: list[str]) -> tuple[list[str], list[str]]:
+    ip_keys = [key for key in keys if key.startswith("ip:")]
+    return ip_keys, [key for key in keys if not key.startswith("ip:")]
+
+
+def check(keys: list[str]) -> float:
+    """Délai d'attente (0 si admis) : plafond par IP puis limite par email."""
+    ip_keys, email_keys = _split(keys)
+    if ip_keys:
+        retry_after = ip_login_throttle.check(ip_keys)
+        if retry_after:
+            return retry_after
+    return login_throttle.check(email_keys)
+
+
+def record_failure(keys: list[str]):
+    # Le backoff ne s'applique qu'à l'email : une IP partagée n'est pas punie
+    login_throttle.record_failure(_split(keys)[1])
+
+
+def record_success(keys: list[str]):
+    login_throttle.record_success(_split(keys)[1])
+
+
+def reset():
+    login_throttle.reset()
+    ip_login_throttle.reset()
+
+
+async def login_throttle_guard(
+    request: Request, form_data: OAuth2PasswordRequestForm = Depends()
+) -> list[str]:
+    """Dépendance FastAPI : rejette en 429 avant toute requête SQL ou bcrypt."""
+    ip = client_ip(request)
+    keys = throttle_keys(ip, form_data.username)
+
+    retry_after = check(keys)
+    if retry_after:
+        logger.warning(f"Tentative de connexion limitée pour {ip}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Trop de tentatives de connexion, réessayez plus tard.",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+    return keys
@@ -0,0 +1,79 @@
+from modules.database.bus import InvalidationBus
+from modules.database.config import DATABASE_DIR
+from modules.api.auth.epochs import token_epochs
+from modules.api.api_keys.functions import forget_api_key, forget_user_api_keys
+from modules.api.users import email_filter
+from modules.api.users.cache import user_cache
+from modules.api.users.version import users_version
+from utils.settings import settings
+
+# À activer dès que plusieurs workers uvicorn partagent le dossier db/
+INVALIDATION_BUS_ENABLED = settings.invalidation_bus_enabled
+INVALIDATION_BUS_PATH = settings.invalidation_bus_path or str(DATABASE_DIR / "bus.db")
+INVALIDATION_BUS_POLL_SECONDS = settings.invalidation_bus_poll_seconds
+
+invalidation_bus = InvalidationBus(INVALIDATION_BUS_PATH)
+
+
+def _publish(topic: str, key, value=None):
+    if INVALIDATION_BUS_ENABLED:
+        invalidation_bus.publish(topic, key, value)
+
+
+# Invalidations appliquées localement, puis relayées aux autres workers
+
+
+def _evict_user(user_id: int):
+    user_cache.pop(user_id)
+    forget_user_api_keys(user_id)
+    users_version.bump()
+
+
+def user_changed(user_id: int):
+    """Profil modifié ou supprimé : caches de profils et ETags."""
+    _evict_user(user_id)
+    _publish("user", user_id)
+
+
+def users_changed(user_ids):
+    """Plusieurs profils modifiés d'un coup (activité de connexion, par exemple)."""
+    for user_id in user_ids:
+        user_cache.pop(user_id)
+        forget_user_api_keys(user_id)
+    users_version.bump()
+    if INVALIDATION_BUS_ENABLED:
+        invalidation_bus.publish_many("user", user_ids)
+
+
+def token_epoch_changed(user_id: int, epoch: int):
+    """Nouvelle époque des tokens (révocation) ; -1 pour un utilisateur supprimé."""
+    token_epochs.set(user_id, epoch)
+    _publish("token_epoch", user_id, epoch)
+
+
+def api_key_revoked(key_id: int):
+    forget_api_key(key_id)
+    _publish("api_key", key_id)
+
+
+def email_added(email: str):
+    email_filter.known_emails.add(email)
+    _publish("email_added", email)
+
+
+def email_removed(email: str):
+    email_filter.known_emails.remove(email)
+    _publish("email_removed", email)
+
+
+invalidation_bus.subscribe("user", lambda key, value: _evict_user(int(key)))
+invalidation_bus.subscribe(
+    "token_epoch", lambda key, value: token_epochs.set(int(key), int(value))
+)
+invalidation_bus.subscribe("api_key", lambda key, value: forget_api_key(int(key)))
+invalidation_bus.subscribe(
+    "email_added", lambda key, value: email_filter.known_emails.add(key)
+)
+invalidation_bus.subscribe(
+    "email_removed", lambda key, value: email_filter.known_emails.remove(key)
+)
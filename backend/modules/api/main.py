@@ -1,15 +1,140 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, APIRouter
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 
 from modules.api.users.routes import users_router
 from modules.api.auth.routes import auth_router
+from modules.api.api_keys.routes import api_keys_router
+from modules.api.audit.routes import audit_router
+from modules.api.stats.routes import stats_router
+from modules.api import startup
+from modules.api.responses import FastJSONResponse
+from utils.logger_config import configure_logger
+from utils.settings import settings
+from utils.periodic import PeriodicTask
 
-import os
-from dotenv import load_dotenv
+# Configuration du logger
+logger = configure_logger()
 
-load_dotenv()
-FRONTEND_URL = os.getenv("FRONTEND_URL")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialise la base, prépare les caches et lance les tâches de fond de l'API.
+
+    Rien n'est servi avant la fin de cette phase : les connexions et les caches
+    sont prêts avant la première requête. Les sous-systèmes optionnels ne sont
+    importés ici que si leur option est activée.
+    """
+    # Imports tardifs : seul le cycle de vie de l'application en a besoin
+    from modules.api.auth.functions import load_token_epochs
+    from modules.api.stats import broadcast, functions as stats_functions
+    from modules.api.users import activity
+
+    background_tasks = []
+    metrics = startup.startup_metrics
+
+    # En test, la base est fournie par les fixtures
+    if settings.run_env != "test":
+        with metrics.phase("database"):
+            await run_in_threadpool(startup.initialize_database)
+
+    # Le bus démarre avant les chargements : rien de publié entre-temps n'est perdu
+    invalidation_bus = None
+    if settings.invalidation_bus_enabled:
+        from modules.api import invalidation
+
+        invalidation_bus = invalidation.invalidation_bus
+        await run_in_threadpool(invalidation_bus.start)
+        background_tasks.append(
+            PeriodicTask(
+                "invalidation_bus",
+                invalidation.INVALIDATION_BUS_POLL_SECONDS,
+                invalidation_bus.poll,
+            )
+        )
+
+    with metrics.phase("caches"):
+        await run_in_threadpool(load_token_epochs)
+        await run_in_threadpool(stats_functions.activity_series.load)
+
+        if settings.email_filter_enabled:
+            from modules.api.users import email_filter
+            from modules.api.users.functions import rebuild_email_filter
+
+            await run_in_threadpool(rebuild_email_filter)
+            background_tasks.append(
+                PeriodicTask(
+                    "email_filter",
+                    email_filter.EMAIL_FILTER_REBUILD_SECONDS,
+                    rebuild_email_filter,
+                )
+            )
+
+    if settings.warmup_enabled and settings.run_env != "test":
+        with metrics.phase("warmup"):
+            connections = await run_in_threadpool(startup.warmup)
+        logger.info(f"{connections} connexions ouvertes dans les pools")
+
+    users_writer = None
+    if settings.group_commit_enabled:
+        from modules.database.writer import users_writer
+
+        users_writer.start()
+
+    background_tasks.append(
+        PeriodicTask(
+            "login_activity",
+            activity.LOGIN_ACTIVITY_FLUSH_SECONDS,
+            activity.login_activity.flush,
+        )
+    )
+
+    background_tasks.append(
+        PeriodicTask(
+            "activity_series",
+            stats_functions.ACTIVITY_SNAPSHOT_SECONDS,
+            stats_functions.activity_series.snapshot,
+        )
+    )
+    background_tasks.append(
+        PeriodicTask(
+            "dashboard_counters",
+            broadcast.DASHBOARD_COUNTERS_SECONDS,
+            broadcast.publish_counters,
+        )
+    )
+
+    audit_log = None
+    if settings.audit_enabled:
+        from modules.api.audit import functions as audit_functions
+
+        audit_log = audit_functions.audit_log
+        background_tasks.append(
+            PeriodicTask(
+                "audit_log", audit_functions.AUDIT_FLUSH_SECONDS, audit_log.flush
+            )
+        )
+
+    for task in background_tasks:
+        task.start()
+    logger.info(f"API prête {metrics.mark_ready()} ms après l'import")
+    yield
+    # Flux SSE encore ouverts : terminés proprement
+    broadcast.dashboard_hub.close()
+    for task in background_tasks:
+        task.stop()
+    # Les écritures en attente sont commitées avant l'arrêt
+    if users_writer is not None and users_writer.running:
+        users_writer.stop()
+    await run_in_threadpool(activity.login_activity.flush)
+    await run_in_threadpool(stats_functions.activity_series.snapshot)
+    # Derniers événements d'audit encore en file
+    if audit_log is not None:
+        await run_in_threadpool(audit_log.flush)
+    if invalidation_bus is not None:
+        invalidation_bus.close()
 
 
 def create_app() -> FastAPI:
@@ -17,6 +142,8 @@ def create_app() -> FastAPI:
         title="SecureAPI",
         description="Cours Simplon: Fast API Sécurité",
         version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
     )
 
     # Ajout du middleware CORS
@@ -35,6 +162,9 @@ def create_app() -> FastAPI:
     router = APIRouter()
     router.include_router(auth_router, prefix="/auth", tags=["Authentification"])
     router.include_router(users_router, prefix="/users", tags=["Users"])
+    router.include_router(api_keys_router, prefix="/api-keys", tags=["Clés d'API"])
+    router.include_router(audit_router, prefix="/audit", tags=["Audit"])
+    router.include_router(stats_router, prefix="/stats", tags=["Statistiques"])
     app.include_router(router)
 
     @app.get("/", include_in_schema=False)
@@ -0,0 +1,52 @@
+import json
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import Response
+
+# orjson est optionnel : sans lui, repli sur le module json de la bibliothèque standard
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    orjson = None
+
+
+def dumps(content) -> bytes:
+    """Encode `content` en JSON UTF-8 (orjson si disponible)."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encodée avec `dumps` : classe de réponse par défaut de l'API."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+class ModelResponse(Response):
+    """Réponse JSON sérialisée directement par pydantic-core.
+
+    Le contenu est déjà validé (modèle ou TypeAdapter construit depuis les
+    lignes) : renvoyer une Response évite que FastAPI le revalide puis le
+    réencode via `response_model`, qui ne sert plus qu'à la documentation.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content,
+        adapter: TypeAdapter | None = None,
+        status_code: int = 200,
+        headers: dict | None = None,
+    ):
+        if adapter is not None:
+            body = adapter.dump_json(content)
+        elif isinstance(content, BaseModel):
+            body = content.model_dump_json().encode("utf-8")
+        else:
+            body = dumps(content)
+        super().__init__(body, status_code=status_code, headers=headers)
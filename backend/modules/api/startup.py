@@ -0,0 +1,141 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from modules.database.config import DATABASE_DIR
+from utils.file_lock import file_lock
+from utils.logger_config import configure_logger
+from utils.settings import settings
+
+# Configuration du logger
+logger = configure_logger()
+
+# Verrou partagé par les workers uvicorn qui démarrent ensemble
+INIT_LOCK_PATH = DATABASE_DIR / "init.lock"
+# Coût bcrypt calibré par le premier worker, relu par les suivants
+BCRYPT_ROUNDS_FILENAME = "bcrypt_rounds.json"
+
+
+class StartupMetrics:
+    """Durées du démarrage, de l'import de l'application jusqu'à « prête »."""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.imported_at = clock()
+        self.ready_at: float | None = None
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((self.clock() - start) * 1000, 1)
+
+    def mark_ready(self) -> float:
+        self.ready_at = self.clock()
+        return self.import_to_ready_ms
+
+    @property
+    def import_to_ready_ms(self) -> float | None:
+        if self.ready_at is None:
+            return None
+        return round((self.ready_at - self.imported_at) * 1000, 1)
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready_at is not None,
+            "import_to_ready_ms": self.import_to_ready_ms,
+            "phases_ms": dict(self.phases),
+        }
+
+
+# Importé en premier par run.py : `imported_at` marque le début du démarrage
+startup_metrics = StartupMetrics()
+
+
+def calibrated_bcrypt_rounds(target_ms: float, path: Path) -> int:
+    """Coût bcrypt pour `target_ms`, calibré une seule fois puis relu de `path`.
+
+    Appelé sous le verrou d'initialisation : le premier worker mesure et
+    enregistre le coût, les suivants le relisent sans hacher. Le fichier est
+    ignoré si la latence cible a changé ; le supprimer force un recalibrage
+    (nouvelle machine, par exemple).
+    """
+    from modules.api.auth import security
+
+    try:
+        with open(path, encoding="utf-8") as handle:
+            saved = json.load(handle)
+        if saved["target_ms"] == target_ms:
+            return int(saved["rounds"])
+    except FileNotFoundError:
+        pass
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Coût bcrypt enregistré illisible, recalibrage : {e}")
+
+    rounds = security.calibrate_bcrypt_rounds(target_ms)
+    # Fichier temporaire puis renommage : jamais de fichier à moitié écrit
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump({"target_ms": target_ms, "rounds": rounds}, handle)
+    os.replace(tmp_path, path)
+    logger.info(f"Coût bcrypt calibré à {rounds}")
+    return rounds
+
+
+def initialize_database(lock_path=INIT_LOCK_PATH):
+    """Crée ou met à jour la base, un worker à la fois.
+
+    Le premier worker qui obtient le verrou crée les tables, les rôles et
+    l'administrateur ; les suivants trouvent la base existante et ne font que
+    des vérifications idempotentes.
+    """
+    # Imports tardifs : seul le démarrage en a besoin
+    from modules.api.users import create_db
+    from modules.api.auth import security
+    from modules.api.audit.functions import init_audit_db
+
+    with file_lock(lock_path):
+        create_db.init_users_db()
+        init_audit_db()
+
+        # Calibrage sous verrou : des workers qui hachent en même temps
+        # fausseraient la mesure (et choisiraient un coût trop faible)
+        if settings.bcrypt_target_ms:
+            rounds_path = Path(lock_path).with_name(BCRYPT_ROUNDS_FILENAME)
+            rounds = calibrated_bcrypt_rounds(settings.bcrypt_target_ms, rounds_path)
+            security.set_bcrypt_rounds(rounds)
+
+
+def warmup(engines=None) -> int:
+    """Ouvre les connexions des pools avant d'accepter du trafic.
+
+    Chaque connexion exécute ses PRAGMA (WAL, query_only) à l'ouverture puis
+    reste dans le pool : les premières requêtes ne paient pas ce coût.
+    Retourne le nombre de connexions ouvertes.
+    """
+    from modules.database import session
+
+    if engines is None:
+        engines = [
+            *session.users_engines,
+            *session.users_read_engines,
+            session.audit_engine,
+        ]
+
+    opened = 0
+    for engine in engines:
+        connections = []
+        try:
+            for _ in range(engine.pool.size()):
+                connection = engine.connect()
+                connection.exec_driver_sql("SELECT 1")
+                connections.append(connection)
+        finally:
+            for connection in connections:
+                connection.close()
+        opened += len(connections)
+    return opened
@@ -0,0 +1,206 @@
+import asyncio
+import threading
+from collections import deque
+from modules.api.responses import dumps
+from modules.api.stats import functions as stats_functions
+from utils.logger_config import configure_logger
+from utils.settings import settings
+
+# Configuration du logger
+logger = configure_logger()
+
+DASHBOARD_BUFFER_SIZE = settings.dashboard_buffer_size
+DASHBOARD_MAX_SUBSCRIBERS = settings.dashboard_max_subscribers
+DASHBOARD_HEARTBEAT_SECONDS = settings.dashboard_heartbeat_seconds
+DASHBOARD_COUNTERS_SECONDS = settings.dashboard_counters_seconds
+
+
+class HubFull(Exception):
+    """Nombre maximal d'abonnés atteint."""
+
+
+def format_event(event_type: str, data: dict) -> bytes:
+    """Message server-sent events : `event:` + `data:` JSON sur une ligne."""
+    return b"event: " + event_type.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+KEEPALIVE = b": keepalive\n\n"
+
+
+class Subscriber:
+    """Abonné au flux : tampon borné, vidé par sa propre boucle asyncio."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.loop = loop
+        self.maxsize = maxsize
+        self.dropped = False
+        self.closed = False
+        self.delivered = 0
+        self._buffer: deque[bytes] = deque()
+        self._waiting = False
+        self._wakeup = asyncio.Event()
+
+    def _offer(self, message: bytes) -> bool:
+        # Appelé sous le verrou du hub ; False si l'abonné est trop lent
+        if len(self._buffer) >= self.maxsize:
+            self.dropped = True
+            self._wake()
+            return False
+        self._buffer.append(message)
+        self._wake()
+        return True
+
+    def _wake(self):
+        # Un seul réveil tant que l'abonné n'est pas revenu attendre :
+        # un abonné occupé ne coûte qu'un append par événement
+        if self._waiting:
+            self._waiting = False
+            try:
+                self.loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                # Boucle fermée : la connexion est déjà partie
+                self.closed = True
+
+
+class BroadcastHub:
+    """Diffuse les événements du tableau de bord aux flux SSE ouverts.
+
+    `publish` est appelé depuis les routes (threads du pool) : le message est
+    encodé une seule fois puis ajouté au tampon de chaque abonné, sous un seul
+    verrou. Un abonné dont le tampon est plein (client qui ne lit plus assez
+    vite) est déconnecté plutôt que de faire grossir la mémoire ou de ralentir
+    les autres : il reçoit un événement `overflow` et se reconnecte pour repartir
+    d'un état complet.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = 256,
+        max_subscribers: int = 100,
+        heartbeat: float = 15.0,
+    ):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self.heartbeat = heartbeat
+        self._lock = threading.Lock()
+        self._subscribers: set[Subscriber] = set()
+        self._published = 0
+        self._delivered = 0
+        self._slow_consumers = 0
+        self._high_water = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscriber:
+        """Nouvel abonné, lié à la boucle asyncio courante."""
+        subscriber = Subscriber(asyncio.get_running_loop(), self.buffer_size)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise HubFull()
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            self._delivered += subscriber.delivered
+
+    def publish(self, event_type: str, data: dict) -> int:
+        """Diffuse un événement ; retourne le nombre d'abonnés servis."""
+        if not self._subscribers:
+            return 0
+        message = format_event(event_type, data)
+        with self._lock:
+            slow = [s for s in self._subscribers if not s._offer(message)]
+            for subscriber in slow:
+                self._subscribers.discard(subscriber)
+                self._delivered += subscriber.delivered
+            self._slow_consumers += len(slow)
+            self._published += 1
+            served = len(self._subscribers)
+        if slow:
+            logger.warning(f"{len(slow)} abonné(s) trop lent(s) déconnecté(s) du flux")
+        return served
+
+    async def next_messages(self, subscriber: Subscriber, timeout: float) -> list[bytes]:
+        """Messages en attente, ou liste vide après `timeout` secondes sans rien."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            with self._lock:
+                if subscriber._buffer or subscriber.dropped or subscriber.closed:
+                    messages = list(subscriber._buffer)
+                    subscriber._buffer.clear()
+                    subscriber._waiting = False
+                    subscriber.delivered += len(messages)
+                    self._high_water = max(self._high_water, len(messages))
+                    return messages
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    subscriber._waiting = False
+                    return []
+                # Effacé sous verrou : un réveil publié ensuite n'est pas perdu
+                subscriber._wakeup.clear()
+                subscriber._waiting = True
+            try:
+                await asyncio.wait_for(subscriber._wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stream(self, subscriber: Subscriber, initial: bytes | None = None):
+        """Corps de la réponse SSE ; désabonne à la déconnexion du client."""
+        try:
+            if initial is not None:
+                yield initial
+            while True:
+                messages = await self.next_messages(subscriber, self.heartbeat)
+                if messages:
+                    yield b"".join(messages)
+                if subscriber.dropped:
+                    yield format_event("overflow", {"reason": "slow_consumer"})
+                    return
+                if subscriber.closed:
+                    return
+                if not messages:
+                    # Garde la connexion ouverte à travers les proxys
+                    yield KEEPALIVE
+        finally:
+            self.unsubscribe(subscriber)
+
+    def close(self):
+        """Termine tous les flux (arrêt de l'API)."""
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.closed = True
+                subscriber._wake()
+
+    def stats(self) -> dict:
+        with self._lock:
+            delivered = self._delivered + sum(s.delivered for s in self._subscribers)
+            return {
+                "subscribers": len(self._subscribers),
+                "max_subscribers": self.max_subscribers,
+                "published": self._published,
+                "delivered": delivered,
+                "slow_consumers": self._slow_consumers,
+                "largest_batch": self._high_water,
+            }
+
+
+dashboard_hub = BroadcastHub(
+    DASHBOARD_BUFFER_SIZE, DASHBOARD_MAX_SUBSCRIBERS, DASHBOARD_HEARTBEAT_SECONDS
+)
+
+
+def publish(event_type: str, **data):
+    """Événement du tableau de bord (sans effet si aucun flux n'est ouvert)."""
+    dashboard_hub.publish(event_type, data)
+
+
+def publish_counters():
+    """Compteurs d'activité de la dernière heure, poussés périodiquement."""
+    if dashboard_hub.subscriber_count:
+        totals = stats_functions.activity_series.series(60, 60)["totals"]
+        dashboard_hub.publish("counters", {"last_hour": totals})
@@ -0,0 +1,244 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from modules.api.stats.schemas import ActivityEvent
+from modules.api.users.models import User
+from modules.database.config import DATABASE_DIR
+from utils.file_lock import file_lock
+from utils.logger_config import configure_logger
+from utils.settings import settings
+
+# Configuration du logger
+logger = configure_logger()
+
+ACTIVITY_SERIES_MINUTES = settings.activity_series_minutes
+ACTIVITY_SNAPSHOT_SECONDS = settings.activity_snapshot_seconds
+ACTIVITY_SNAPSHOT_PATH = settings.activity_snapshot_path or str(
+    DATABASE_DIR / "activity.json"
+)
+
+EVENTS = tuple(ActivityEvent)
+_EVENT_INDEX = {event: index for index, event in enumerate(EVENTS)}
+
+
+class ActivitySeries:
+    """Compteurs d'activité par minute, dans un tampon circulaire de taille fixe.
+
+    La case `minute % capacity` porte le numéro de la minute qu'elle compte :
+    une case périmée est remise à zéro quand elle est réutilisée. `record` est
+    donc en O(1) et la mémoire ne dépend que de `capacity` (24 h par défaut).
+
+    `snapshot` ajoute les incréments non encore sauvegardés au fichier JSON
+    partagé (sous verrou : chaque worker y apporte les siens) puis recharge le
+    total en mémoire ; `load` le relit au démarrage. L'historique survit ainsi
+    aux redémarrages et chaque worker voit l'activité des autres, au délai de
+    sauvegarde près.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1440,
+        path: Path | str | None = None,
+        clock=time.time,
+    ):
+        self.capacity = capacity
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._minutes = [-1] * capacity
+        self._counts = [[0] * len(EVENTS) for _ in range(capacity)]
+        # Incréments depuis la dernière sauvegarde : minute -> compteurs
+        self._unsaved: dict[int, list[int]] = {}
+        self._snapshots = 0
+        self._snapshot_failures = 0
+        self._last_snapshot_ms = 0.0
+
+    def _now(self) -> int:
+        return int(self.clock() // 60)
+
+    def _slot(self, minute: int) -> list[int]:
+        # Appelé sous verrou
+        index = minute % self.capacity
+        if self._minutes[index] != minute:
+            self._minutes[index] = minute
+            self._counts[index] = [0] * len(EVENTS)
+        return self._counts[index]
+
+    def record(self, event: ActivityEvent, count: int = 1):
+        index = _EVENT_INDEX[event]
+        minute = self._now()
+        with self._lock:
+            self._slot(minute)[index] += count
+            unsaved = self._unsaved.setdefault(minute, [0] * len(EVENTS))
+            unsaved[index] += count
+
+    def series(self, minutes: int = 60, bucket: int = 1) -> dict:
+        """Dernières `minutes` minutes, regroupées par paquets de `bucket` minutes.
+
+        Les paquets sont alignés sur l'epoch (ex. 5 minutes : hh:00, hh:05…) :
+        le premier peut être partiel. Les paquets vides sont renvoyés à zéro.
+        """
+        minutes = max(1, min(minutes, self.capacity))
+        bucket = max(1, bucket)
+        end = self._now()
+        start = end - minutes + 1
+        first = start // bucket * bucket
+        points = [[0] * len(EVENTS) for _ in range((end - first) // bucket + 1)]
+
+        with self._lock:
+            for minute in range(start, end + 1):
+                index = minute % self.capacity
+                if self._minutes[index] != minute:
+                    continue
+                point = points[(minute - first) // bucket]
+                for event_index, count in enumerate(self._counts[index]):
+                    point[event_index] += count
+
+        totals = [sum(column) for column in zip(*points)]
+        return {
+            "bucket_minutes": bucket,
+            "points": [
+                {
+                    "time": datetime.utcfromtimestamp((first + i * bucket) * 60),
+                    **{event.value: count for event, count in zip(EVENTS, point)},
+                }
+                for i, point in enumerate(points)
+            ],
+            "totals": {event.value: total for event, total in zip(EVENTS, totals)},
+        }
+
+    def _read(self) -> dict[int, list[int]]:
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                data = json.load(handle)
+            # Compteurs indexés par nom : un nouveau type d'événement reste lisible
+            return {
+                int(minute): [counts.get(event.value, 0) for event in EVENTS]
+                for minute, counts in data["minutes"].items()
+            }
+        except FileNotFoundError:
+            return {}
+        except (ValueError, KeyError, AttributeError) as e:
+            # Fichier corrompu : l'historique est perdu, il sera réécrit
+            logger.warning(f"Historique d'activité illisible, ignoré : {e}")
+            return {}
+
+    def _write(self, saved: dict[int, list[int]]):
+        data = {
+            "minutes": {
+                str(minute): {
+                    event.value: count for event, count in zip(EVENTS, counts) if count
+                }
+                for minute, counts in sorted(saved.items())
+            }
+        }
+        # Fichier temporaire puis renommage : jamais de fichier à moitié écrit
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def _reload(self, saved: dict[int, list[int]]):
+        # Appelé sous verrou : total sauvegardé + incréments notés depuis
+        self._minutes = [-1] * self.capacity
+        self._counts = [[0] * len(EVENTS) for _ in range(self.capacity)]
+        oldest = self._now() - self.capacity
+        for source in (saved, self._unsaved):
+            for minute, counts in source.items():
+                if minute <= oldest:
+                    continue
+                slot = self._slot(minute)
+                for index, count in enumerate(counts):
+                    slot[index] += count
+
+    def _restore(self, unsaved: dict[int, list[int]]):
+        # Sauvegarde échouée : les incréments seront retentés à la suivante
+        with self._lock:
+            for minute, counts in unsaved.items():
+                pending = self._unsaved.setdefault(minute, [0] * len(EVENTS))
+                for index, count in enumerate(counts):
+                    pending[index] += count
+
+    def load(self) -> int:
+        """Recharge l'historique sauvegardé ; retourne le nombre de minutes lues."""
+        if self.path is None or not os.path.exists(self.path):
+            return 0
+        try:
+            with file_lock(f"{self.path}.lock"):
+                saved = self._read()
+        except OSError as e:
+            logger.warning(f"Historique d'activité illisible, ignoré : {e}")
+            return 0
+        with self._lock:
+            self._reload(saved)
+        return len(saved)
+
+    def snapshot(self) -> int:
+        """Ajoute les incréments en attente au fichier ; retourne ses minutes."""
+        if self.path is None:
+            return 0
+        with self._snapshot_lock:
+            with self._lock:
+                unsaved, self._unsaved = self._unsaved, {}
+            if not unsaved:
+                return 0
+
+            start = time.perf_counter()
+            try:
+                with file_lock(f"{self.path}.lock"):
+                    saved = self._read()
+                    for minute, counts in unsaved.items():
+                        merged = saved.setdefault(minute, [0] * len(EVENTS))
+                        for index, count in enumerate(counts):
+                            merged[index] += count
+                    oldest = self._now() - self.capacity
+                    saved = {minute: c for minute, c in saved.items() if minute > oldest}
+                    self._write(saved)
+            except OSError as e:
+                self._restore(unsaved)
+                with self._lock:
+                    self._snapshot_failures += 1
+                logger.error(f"Sauvegarde de l'historique d'activité impossible : {e}")
+                return 0
+
+            with self._lock:
+                self._reload(saved)
+                self._snapshots += 1
+                self._last_snapshot_ms = round((time.perf_counter() - start) * 1000, 2)
+            return len(saved)
+
+    def clear(self):
+        with self._lock:
+            self._minutes = [-1] * self.capacity
+            self._counts = [[0] * len(EVENTS) for _ in range(self.capacity)]
+            self._unsaved.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "capacity_minutes": self.capacity,
+                "unsaved_minutes": len(self._unsaved),
+                "snapshots": self._snapshots,
+                "snapshot_failures": self._snapshot_failures,
+                "last_snapshot_ms": self._last_snapshot_ms,
+            }
+
+
+activity_series = ActivitySeries(ACTIVITY_SERIES_MINUTES, ACTIVITY_SNAPSHOT_PATH)
+
+
+def user_totals(db: Session) -> dict:
+    """Nombre d'utilisateurs et connexion la plus récente (une ligne par shard)."""
+    rows = db.execute(select(func.count(User.id), func.max(User.last_login_at))).all()
+    last_logins = [last_login for _, last_login in rows if last_login is not None]
+    last_login = max(last_logins, default=None)
+    return {
+        "user_count": sum(count for count, _ in rows),
+        "last_login_at": last_login.isoformat() if last_login else None,
+    }
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from modules.api.auth.functions import get_current_user
+from modules.api.responses import ModelResponse
+from modules.api.stats import broadcast
+from modules.api.stats import functions as stats_functions
+from modules.database.dependencies import get_users_read_db
+from modules.api.stats.schemas import ActivitySeriesResponse
+
+stats_router = APIRouter()
+
+
+@stats_router.get(
+    "/activity",
+    response_model=ActivitySeriesResponse,
+    summary="Activité d'authentification par période",
+    description="Connexions, échecs, rafraîchissements et inscriptions des dernières "
+    "`minutes` minutes, regroupés par paquets de `bucket` minutes. Servi depuis "
+    "des compteurs en mémoire, sans requête en base.",
+)
+def get_activity(
+    minutes: int = Query(60, ge=1, le=7 * 24 * 60),
+    bucket: int = Query(1, ge=1, le=24 * 60),
+    current_user: dict = Depends(get_current_user),
+):
+    if "admin" not in current_user.scopes:
+        raise HTTPException(
+            status_code=403, detail="Accès refusé : réservé aux administrateurs."
+        )
+
+    series = stats_functions.activity_series.series(minutes, bucket)
+    return ModelResponse(ActivitySeriesResponse(**series))
+
+
+@stats_router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    summary="Flux temps réel du tableau de bord (server-sent events)",
+    description="Un événement `snapshot` (nombre d'utilisateurs, dernière "
+    "connexion) puis les changements : `user_created`, `user_deleted`, "
+    "`role_changed` et `counters` (activité de la dernière heure). Un client "
+    "trop lent reçoit `overflow` et doit se reconnecter.",
+)
+async def stream_dashboard(
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_users_read_db),
+):
+    if "admin" not in current_user.scopes:
+        raise HTTPException(
+            status_code=403, detail="Accès refusé : réservé aux administrateurs."
+        )
+
+    # Seule lecture en base du flux : les mises à jour suivantes sont poussées
+    totals = await run_in_threadpool(stats_functions.user_totals, db)
+    hub = broadcast.dashboard_hub
+    try:
+        subscriber = hub.subscribe()
+    except broadcast.HubFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Trop de flux ouverts, réessayez plus tard.",
+            headers={"Retry-After": "5"},
+        )
+
+    return StreamingResponse(
+        hub.stream(subscriber, broadcast.format_event("snapshot", totals)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,24 @@
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel
+
+
+class ActivityEvent(str, Enum):
+    login = "login"
+    login_failed = "login_failed"
+    refresh = "refresh"
+    signup = "signup"
+
+
+class ActivityPoint(BaseModel):
+    time: datetime
+    login: int
+    login_failed: int
+    refresh: int
+    signup: int
+
+
+class ActivitySeriesResponse(BaseModel):
+    bucket_minutes: int
+    points: list[ActivityPoint]
+    totals: dict[str, int]
@@ -0,0 +1,119 @@
+import threading
+from datetime import datetime
+from sqlalchemy import case, update
+from sqlalchemy.exc import SQLAlchemyError
+from modules.api import invalidation
+from modules.api.users.models import User
+from modules.database.session import UsersSessionLocal
+from utils.logger_config import configure_logger
+from utils.settings import settings
+
+# Configuration du logger
+logger = configure_logger()
+
+LOGIN_ACTIVITY_FLUSH_SECONDS = settings.login_activity_flush_seconds
+
+# Ids par UPDATE : 3 paramètres par id, loin de la limite de variables SQLite
+MAX_IDS_PER_UPDATE = 500
+
+
+class LoginActivityTracker:
+    """Dernière connexion et nombre de connexions, agrégés en mémoire.
+
+    Les routes notent l'activité sans toucher la base ; `flush` écrit tout ce
+    qui s'est accumulé depuis le vidage précédent en un seul UPDATE (CASE par
+    id). Le compteur est incrémenté en base (`login_count + n`) : plusieurs
+    workers peuvent vider leurs propres compteurs sans se marcher dessus.
+    """
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # user_id -> [dernière activité, connexions à ajouter]
+        self._pending: dict[int, list] = {}
+        self._recorded = 0
+        self._flushes = 0
+        self._rows = 0
+        self._failures = 0
+
+    def record(self, user_id: int, login: bool = True, at: datetime | None = None):
+        """Note une activité ; `login=False` (rafraîchissement) ne compte pas."""
+        at = at or datetime.utcnow()
+        with self._lock:
+            entry = self._pending.setdefault(user_id, [at, 0])
+            entry[0] = max(entry[0], at)
+            if login:
+                entry[1] += 1
+            self._recorded += 1
+
+    def _restore(self, entries: dict[int, list]):
+        # Vidage échoué : on fusionne avec ce qui a été noté entre-temps
+        with self._lock:
+            for user_id, (at, logins) in entries.items():
+                entry = self._pending.setdefault(user_id, [at, 0])
+                entry[0] = max(entry[0], at)
+                entry[1] += logins
+
+    def flush(self) -> int:
+        """Écrit l'activité en attente ; retourne le nombre d'utilisateurs mis à jour."""
+        with self._flush_lock:
+            with self._lock:
+                entries, self._pending = self._pending, {}
+            if not entries:
+                return 0
+
+            user_ids = list(entries)
+            try:
+                with self.session_factory() as db:
+                    for start in range(0, len(user_ids), MAX_IDS_PER_UPDATE):
+                        end = start + MAX_IDS_PER_UPDATE
+                        chunk = user_ids[start:end]
+                        db.execute(
+                            update(User)
+                            .where(User.id.in_(chunk))
+                            .values(
+                                last_login_at=case(
+                                    {user_id: entries[user_id][0] for user_id in chunk},
+                                    value=User.id,
+                                ),
+                                login_count=User.login_count
+                                + case(
+                                    {user_id: entries[user_id][1] for user_id in chunk},
+                                    value=User.id,
+                                ),
+                            )
+                            .execution_options(synchronize_session=False)
+                        )
+                    db.commit()
+            except SQLAlchemyError as e:
+                self._restore(entries)
+                with self._lock:
+                    self._failures += 1
+                logger.error(f"Écriture des dernières connexions impossible : {e}")
+                return 0
+
+            # Profils en cache et ETag de la liste, ici et dans les autres workers :
+            # la prochaine lecture voit l'activité
+            invalidation.users_changed(user_ids)
+            with self._lock:
+                self._flushes += 1
+                self._rows += len(user_ids)
+            return len(user_ids)
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending_users": len(self._pending),
+                "recorded": self._recorded,
+                "flushes": self._flushes,
+                "rows_updated": self._rows,
+                "failures": self._failures,
+            }
+
+
+login_activity = LoginActivityTracker(UsersSessionLocal)
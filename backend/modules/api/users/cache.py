@@ -0,0 +1,8 @@
+from utils.settings import settings
+from utils.ttl_cache import TTLCache
+
+USER_CACHE_SIZE = settings.user_cache_size
+USER_CACHE_TTL = settings.user_cache_ttl
+
+# Profils publics (UserResponse) par id, invalidés à chaque modification
+user_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
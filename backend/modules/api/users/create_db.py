@@ -1,19 +1,22 @@
-import os
+from sqlalchemy import inspect, text
 from sqlalchemy.orm import Session
-from dotenv import load_dotenv
 
 from modules.api.auth.security import anonymize, hash_password
 from utils.logger_config import configure_logger
 from modules.api.users.models import User, Role
 from modules.database.config import USERS_DATABASE_PATH
-from modules.database.session import users_engine, UsersSessionLocal, Base
+from modules.database.session import (
+    users_engine,
+    users_engines,
+    UsersSessionLocal,
+    Base,
+)
+from modules.database.shards import seed_shard_ids
+from utils.settings import settings
 
 # Configuration du logger
 logger = configure_logger()
 
-# Charger les variables d'environnement
-load_dotenv()
-
 
 def init_users_db():
     """Vérifie si la base de données existe et crée l'admin si besoin."""
@@ -23,11 +26,79 @@ def init_users_db():
         logger.info("La base de données 'users' n'existe pas. Création en cours...")
         Base.metadata.create_all(bind=users_engine)
         logger.info("Base de données 'users' créée avec succès.")
+        init_user_shards()
         create_roles_and_first_users()
     else:
-        logger.info(
-            "La base de données 'users' existe déjà. Aucun changement nécessaire."
-        )
+        logger.info("La base de données 'users' existe déjà.")
+        # Nouvelles tables (ex. api_keys) ; les tables existantes sont ignorées
+        Base.metadata.create_all(bind=users_engine)
+        create_missing_columns()
+        create_missing_indexes()
+        init_user_shards()
+        replicate_roles()
+
+
+def init_user_shards(engines=None):
+    """Crée les tables des shards supplémentaires (USERS_SHARDS > 1)."""
+    engines = users_engines if engines is None else engines
+    for index, engine in enumerate(engines[1:], start=1):
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            seed_shard_ids(connection, index)
+
+
+def replicate_roles(engines=None):
+    """Copie les rôles du shard 0 vers les autres shards, avec les mêmes ids."""
+    engines = users_engines if engines is None else engines
+    with engines[0].connect() as source:
+        roles = source.execute(text("SELECT id, role FROM roles")).fetchall()
+    for engine in engines[1:]:
+        with engine.begin() as connection:
+            for role_id, role in roles:
+                connection.execute(
+                    text("INSERT OR IGNORE INTO roles (id, role) VALUES (:id, :role)"),
+                    {"id": role_id, "role": role},
+                )
+
+
+def create_missing_columns(engines=None):
+    """Ajoute les colonnes des modèles absentes des bases existantes (tous les shards)."""
+    engines = [users_engine, *users_engines[1:]] if engines is None else engines
+    for engine in engines:
+        _create_missing_columns(engine)
+
+
+def _create_missing_columns(engine):
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = (
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+                    f"{column.type.compile(dialect=engine.dialect)}"
+                )
+                if column.server_default is not None:
+                    ddl += f" NOT NULL DEFAULT {column.server_default.arg}"
+                connection.execute(text(ddl))
+                logger.info(f"Colonne '{table.name}.{column.name}' ajoutée.")
+
+
+def create_missing_indexes(engines=None):
+    """Crée les index des modèles absents des bases existantes (tous les shards)."""
+    engines = [users_engine, *users_engines[1:]] if engines is None else engines
+    for engine in engines:
+        inspector = inspect(engine)
+        for table in Base.metadata.sorted_tables:
+            # Shard pas encore créé : create_all posera ses index
+            if not inspector.has_table(table.name):
+                continue
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
 
 
 def create_roles_and_first_users():
@@ -41,6 +112,7 @@ def create_roles_and_first_users():
             if not role:
                 db.add(Role(role=role_name))
         db.commit()
+        replicate_roles()
 
         # Vérifier si un admin existe déjà
         admin_role = db.query(Role).filter_by(role="admin").first()
@@ -53,9 +125,9 @@ def create_roles_and_first_users():
             return
 
         # Récupération depuis le .env
-        admin_email = os.getenv("ADMIN_EMAIL")
-        admin_name = os.getenv("ADMIN_NAME")
-        admin_password = os.getenv("ADMIN_PASSWORD")
+        admin_email = settings.admin_email
+        admin_name = settings.admin_name
+        admin_password = settings.admin_password
 
         # Création du premier utilisateur admin
         admin_user = User(
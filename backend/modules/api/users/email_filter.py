@@ -0,0 +1,128 @@
+import hashlib
+import math
+import threading
+from utils.settings import settings
+
+EMAIL_FILTER_ENABLED = settings.email_filter_enabled
+EMAIL_FILTER_CAPACITY = settings.email_filter_capacity
+EMAIL_FILTER_FP_RATE = settings.email_filter_fp_rate
+EMAIL_FILTER_REBUILD_SECONDS = settings.email_filter_rebuild_seconds
+
+# Un compteur saturé ne peut plus être décrémenté sans risque de faux négatif
+MAX_COUNTER = 255
+
+
+class EmailBloomFilter:
+    """Filtre de Bloom à compteurs des emails anonymisés présents en base.
+
+    Répond "absent à coup sûr" ou "peut-être présent". Les compteurs (un octet
+    par case) permettent de retirer un email supprimé ; la reconstruction
+    périodique depuis la table `users` corrige les dérives éventuelles.
+    Tant qu'il n'a pas été construit, le filtre ne déclare jamais un email absent.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self._lock = threading.Lock()
+        size, hashes = self._dimensions(capacity, fp_rate)
+        # Compteurs et nombre de hachages sont remplacés ensemble, atomiquement
+        self._table = (bytearray(size), hashes)
+        self._entries = 0
+        self._pending: list[str] | None = None
+        self.ready = False
+        self._lookups = 0
+        self._negatives = 0
+
+    @staticmethod
+    def _dimensions(capacity: int, fp_rate: float) -> tuple[int, int]:
+        size = math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)
+        hashes = max(1, round(size / capacity * math.log(2)))
+        return size, hashes
+
+    @staticmethod
+    def _positions(email: str, size: int, hashes: int) -> list[int]:
+        # Les emails anonymisés sont déjà des SHA256 : on réutilise leurs bits
+        try:
+            h1, h2 = int(email[:16], 16), int(email[16:32], 16) | 1
+        except ValueError:
+            digest = hashlib.sha256(email.encode("utf-8")).digest()
+            h1 = int.from_bytes(digest[:8], "big")
+            h2 = int.from_bytes(digest[8:16], "big") | 1
+        return [(h1 + i * h2) % size for i in range(hashes)]
+
+    def _increment(self, table: tuple[bytearray, int], email: str):
+        counters, hashes = table
+        for position in self._positions(email, len(counters), hashes):
+            if counters[position] < MAX_COUNTER:
+                counters[position] += 1
+
+    def add(self, email: str):
+        with self._lock:
+            self._increment(self._table, email)
+            self._entries += 1
+            if self._pending is not None:
+                self._pending.append(email)
+
+    def remove(self, email: str):
+        with self._lock:
+            counters, hashes = self._table
+            positions = self._positions(email, len(counters), hashes)
+            if not all(counters[position] for position in positions):
+                return
+            for position in positions:
+                if counters[position] < MAX_COUNTER:
+                    counters[position] -= 1
+            self._entries = max(0, self._entries - 1)
+
+    def might_contain(self, email: str) -> bool:
+        counters, hashes = self._table
+        return all(
+            counters[position]
+            for position in self._positions(email, len(counters), hashes)
+        )
+
+    def definitely_absent(self, email: str) -> bool:
+        """Vrai seulement si le filtre est construit et que l'email n'y est pas."""
+        if not self.ready:
+            return False
+        absent = not self.might_contain(email)
+        with self._lock:
+            self._lookups += 1
+            self._negatives += absent
+        return absent
+
+    def rebuild(self, load_emails):
+        """Reconstruit le filtre depuis `load_emails()`, ajouts concurrents compris."""
+        with self._lock:
+            self._pending = []
+
+        emails = list(load_emails())
+        capacity = max(self.capacity, 2 * len(emails))
+        size, hashes = self._dimensions(capacity, self.fp_rate)
+        table = (bytearray(size), hashes)
+
+        with self._lock:
+            for email in emails + self._pending:
+                self._increment(table, email)
+            self._table = table
+            self._entries = len(emails) + len(self._pending)
+            self._pending = None
+            self.ready = True
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters, hashes = self._table
+            fill = hashes * self._entries / len(counters)
+            return {
+                "ready": self.ready,
+                "entries": self._entries,
+                "memory_bytes": len(counters),
+                "hash_functions": hashes,
+                "estimated_fp_rate": round((1 - math.exp(-fill)) ** hashes, 6),
+                "lookups": self._lookups,
+                "skipped_lookups": self._negatives,
+            }
+
+
+known_emails = EmailBloomFilter(EMAIL_FILTER_CAPACITY, EMAIL_FILTER_FP_RATE)
@@ -1,4 +1,6 @@
-from modules.api.users.create_db import User
+from modules.api.users.models import User
+from modules.api.users import email_filter
+from modules.database.session import UsersSessionLocal
 from sqlalchemy.orm import Session
 
 
@@ -7,3 +9,14 @@ def get_user_by_email(email: str, db: Session):
     user = db.query(User).filter(User.email == email).first()
 
     return user
+
+
+def rebuild_email_filter():
+    """Reconstruit le filtre des emails connus depuis la table users."""
+    db = UsersSessionLocal()
+    try:
+        email_filter.known_emails.rebuild(
+            lambda: (email for (email,) in db.query(User.email))
+        )
+    finally:
+        db.close()
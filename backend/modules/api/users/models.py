@@ -1,23 +1,35 @@
 from sqlalchemy import Column, ForeignKey, Integer, String, Boolean, DateTime
 from sqlalchemy.orm import relationship
 from modules.database.session import Base
+from modules.api.auth.epochs import new_token_epoch
 from datetime import datetime
 
 
 class User(Base):
     __tablename__ = "users"
+    # Jamais de réutilisation d'id : un ancien token ne peut viser un nouvel utilisateur
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String)
     email = Column(String, unique=True, index=True)
     password = Column(String)
     is_active = Column(Boolean, default=True)
+    # Incrémentée pour révoquer d'un coup tous les tokens de l'utilisateur ;
+    # aléatoire à la création, 0 pour les lignes antérieures à la colonne
+    token_epoch = Column(
+        Integer, nullable=False, default=new_token_epoch, server_default="0"
+    )
+    # Écrits par lots par LoginActivityTracker, pas à chaque connexion
+    last_login_at = Column(DateTime, nullable=True)
+    login_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     role_id = Column(Integer, ForeignKey("roles.id"), nullable=False)
     role = relationship("Role", back_populates="users")
     refresh_tokens = relationship(
         "RefreshToken", back_populates="users", cascade="all, delete-orphan"
     )
+    api_keys = relationship("ApiKey", back_populates="user", cascade="all, delete-orphan")
 
 
 class Role(Base):
@@ -34,9 +46,26 @@ class RefreshToken(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     token = Column(String, unique=True, nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     expires_at = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     revoked = Column(Boolean, default=False, nullable=False)
 
     users = relationship("User", back_populates="refresh_tokens")
+
+
+class ApiKey(Base):
+    __tablename__ = "api_keys"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    # Préfixe public de la clé, seul critère de recherche
+    prefix = Column(String, unique=True, index=True, nullable=False)
+    # HMAC-SHA256 du secret : la clé en clair n'est jamais stockée
+    secret_hash = Column(String, nullable=False)
+    scopes = Column(String, nullable=False)  # Scopes séparés par des espaces
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    revoked = Column(Boolean, default=False, nullable=False)
+
+    user = relationship("User", back_populates="api_keys")
@@ -0,0 +1,129 @@
+"""Répartit les utilisateurs sur N shards après un changement de USERS_SHARDS.
+
+Lancement depuis `backend/`, API arrêtée :
+
+    python -m modules.api.users.rebalance --shards 4 --dry-run
+    python -m modules.api.users.rebalance --shards 4
+
+Chaque utilisateur dont le shard cible (d'après son email anonymisé) a changé
+est copié avec ses refresh tokens et ses clés d'API, puis supprimé du shard
+d'origine. L'id encodant le shard, un utilisateur déplacé change d'id et ses
+sessions en cours sont invalidées. La commande peut être relancée sans risque
+après une interruption.
+"""
+
+import argparse
+import json
+import sys
+from sqlalchemy.orm import sessionmaker
+from modules.api.users.create_db import init_user_shards, replicate_roles
+from modules.api.users.models import ApiKey, RefreshToken, User
+from modules.database.config import USERS_SHARDS, users_shard_path, users_shard_url
+from modules.database.session import create_session
+from modules.database.shards import shard_index_for_email
+from utils.logger_config import configure_logger
+
+# Configuration du logger
+logger = configure_logger()
+
+
+def existing_shard_count() -> int:
+    count = 0
+    while users_shard_path(count).exists():
+        count += 1
+    return count
+
+
+def copy_user(user: User, target) -> User:
+    """Copie un utilisateur et ses données liées dans la session `target`."""
+    copy = User(
+        name=user.name,
+        email=user.email,
+        password=user.password,
+        is_active=user.is_active,
+        role_id=user.role_id,
+        token_epoch=user.token_epoch,
+    )
+    target.add(copy)
+    target.flush()
+    for token in user.refresh_tokens:
+        target.add(
+            RefreshToken(
+                token=token.token,
+                user_id=copy.id,
+                expires_at=token.expires_at,
+                created_at=token.created_at,
+                revoked=token.revoked,
+            )
+        )
+    for api_key in user.api_keys:
+        target.add(
+            ApiKey(
+                name=api_key.name,
+                prefix=api_key.prefix,
+                secret_hash=api_key.secret_hash,
+                scopes=api_key.scopes,
+                user_id=copy.id,
+                created_at=api_key.created_at,
+                revoked=api_key.revoked,
+            )
+        )
+    return copy
+
+
+def rebalance(engines: list, shards: int, dry_run: bool = False) -> dict:
+    """Déplace les utilisateurs vers leur shard parmi les `shards` premiers moteurs.
+
+    `engines` contient tous les shards, existants et cibles.
+    """
+    if not dry_run:
+        init_user_shards(engines)
+        replicate_roles(engines)
+
+    sessions = [sessionmaker(autoflush=False, bind=engine)() for engine in engines]
+    moved = 0
+    try:
+        for index, source in enumerate(sessions):
+            for user in source.query(User).all():
+                target_index = shard_index_for_email(user.email, shards)
+                if target_index == index:
+                    continue
+                moved += 1
+                if dry_run:
+                    continue
+                target = sessions[target_index]
+                # Relance après interruption : la copie existe déjà
+                if target.query(User).filter(User.email == user.email).first() is None:
+                    copy_user(user, target)
+                    target.commit()
+                source.delete(user)
+                source.commit()
+
+        counts = [session.query(User).count() for session in sessions]
+    finally:
+        for session in sessions:
+            session.close()
+
+    return {"shards": shards, "moved": moved, "dry_run": dry_run, "users": counts}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shards", type=int, default=USERS_SHARDS)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    total = max(existing_shard_count(), args.shards)
+    engines = [create_session(users_shard_url(index))[0] for index in range(total)]
+    report = rebalance(engines, args.shards, args.dry_run)
+    print(json.dumps(report, indent=2))
+
+    if total > args.shards and not args.dry_run:
+        logger.info(f"Shards {args.shards} à {total - 1} vides : fichiers supprimables.")
+    for engine in engines:
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
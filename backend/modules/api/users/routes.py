@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from modules.api.users.create_db import User
-from modules.api.users.schemas import UserResponse
+from sqlalchemy.orm import Session, joinedload
+from modules.api.users.models import User
+from modules.api.users.cache import user_cache
+from modules.api.users.version import etag_matches, not_modified, users_version
+from modules.api.users.schemas import (
+    UserBatchRequest,
+    UserLookupResult,
+    UserResponse,
+    lookup_list_adapter,
+)
+from modules.api.responses import ModelResponse
 from utils.logger_config import configure_logger
-from modules.database.dependencies import get_users_db
+from modules.database.dependencies import get_users_read_db
 
 
 # Configuration du logger
@@ -16,6 +24,38 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 users_router = APIRouter()
 
 
+@users_router.post(
+    "/users/batch",
+    response_model=list[UserLookupResult],
+    summary="Récupérer plusieurs utilisateurs par leurs IDs",
+    description="Retourne les utilisateurs demandés dans l'ordre de la requête, "
+    "avec found=false pour les IDs inexistants.",
+)
+def get_users_batch(batch: UserBatchRequest, db: Session = Depends(get_users_read_db)):
+    users = user_cache.get_many(batch.ids)
+
+    # Une seule requête IN, jointe aux rôles, pour les ids absents du cache
+    missing_ids = [
+        user_id for user_id in dict.fromkeys(batch.ids) if user_id not in users
+    ]
+    if missing_ids:
+        rows = (
+            db.query(User)
+            .options(joinedload(User.role))
+            .filter(User.id.in_(missing_ids))
+            .all()
+        )
+        for user in rows:
+            users[user.id] = UserResponse.model_validate(user)
+            user_cache.set(user.id, users[user.id])
+
+    results = [
+        UserLookupResult(id=user_id, found=user_id in users, user=users.get(user_id))
+        for user_id in batch.ids
+    ]
+    return ModelResponse(results, lookup_list_adapter)
+
+
 @users_router.get(
     "/users/{user_id}",
     response_model=UserResponse,
@@ -23,15 +63,22 @@ users_router = APIRouter()
     description="Retourne les informations d'un utilisateur "
     "spécifique en fonction de son ID.",
 )
-def get_user(user_id: int, db: Session = Depends(get_users_db)):
+def get_user(
+    user_id: int,
+    request: Request,
+    db: Session = Depends(get_users_read_db),
+):
+    # La version est incrémentée à chaque suppression : un ETag exact désigne
+    # un utilisateur qui existait encore, la base n'est pas interrogée
+    etag = users_version.etag(f"user-{user_id}")
+    if etag_matches(request, etag, wildcard=False):
+        return not_modified(etag)
+
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
+    # `*` : 304 seulement une fois l'existence vérifiée
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-    return UserResponse(
-        id=user.id,
-        name=user.name,
-        email=user.email,
-        is_active=user.is_active,
-        role=user.role.role,
-    )
+    return ModelResponse(UserResponse.model_validate(user), headers={"ETag": etag})
@@ -1,5 +1,9 @@
-from pydantic import BaseModel, EmailStr, constr
-from typing import List
+from pydantic import BaseModel, EmailStr, TypeAdapter, conlist, constr, field_validator
+from datetime import datetime
+from typing import List, Optional
+
+# Nombre maximal d'ids par requête de recherche groupée
+MAX_BATCH_SIZE = 100
 
 
 # Modèle Pydantic pour validation
@@ -16,10 +20,37 @@ class UserResponse(BaseModel):
     name: str
     is_active: bool
     role: str
+    # Absents (None) quand le profil vient des claims d'un access token enrichi
+    last_login_at: Optional[datetime] = None
+    login_count: Optional[int] = None
 
     class Config:
         from_attributes = True
 
+    # Construit depuis un objet User, `role` est la relation : on garde son nom
+    @field_validator("role", mode="before")
+    @classmethod
+    def role_name(cls, role):
+        return role if isinstance(role, str) else role.role
+
+
+# Recherche groupée d'utilisateurs par id
+class UserBatchRequest(BaseModel):
+    ids: conlist(int, min_length=1, max_length=MAX_BATCH_SIZE)  # type: ignore
+
+
+# Résultat pour un id demandé : found=False si l'utilisateur n'existe pas
+class UserLookupResult(BaseModel):
+    id: int
+    found: bool
+    user: Optional[UserResponse] = None
+
+
+# Adaptateurs construits une fois : validation depuis les lignes (from_attributes)
+# puis sérialisation JSON directe, sans second passage par response_model
+user_list_adapter = TypeAdapter(list[UserResponse])
+lookup_list_adapter = TypeAdapter(list[UserLookupResult])
+
 
 # Modèle pour mettre à jour un rôle
 class RoleUpdate(BaseModel):
@@ -31,8 +62,23 @@ class Token(BaseModel):
     token_type: str
 
 
+# Réponse du login : profil inclus sur demande (?include_profile=true)
+class LoginResponse(Token):
+    refresh_token: str
+    user: Optional[UserResponse] = None
+
+
 class TokenData(BaseModel):
     sub: str  # L'identifiant de l'utilisateur (l'email)
-    exp: int  # La date d'expiration du token
+    exp: Optional[int] = None  # La date d'expiration du token (aucune : clé d'API)
     role: str  # Le rôle de l'utilisateur
     scopes: List[str]  # Les permissions (scopes)
+    uid: Optional[int] = None  # L'id de l'utilisateur
+    epoch: Optional[int] = None  # L'époque des tokens de l'utilisateur
+    # Claims de profil des access tokens enrichis (RICH_ACCESS_TOKENS)
+    name: Optional[str] = None
+    is_active: Optional[bool] = None
+
+    @property
+    def has_profile(self) -> bool:
+        return self.uid is not None and self.is_active is not None
@@ -0,0 +1,48 @@
+import threading
+from uuid import uuid4
+from fastapi import Request, Response, status
+
+
+class DataVersion:
+    """Compteur monotone des modifications d'utilisateurs et de rôles.
+
+    Le compteur vit en mémoire : l'identifiant de démarrage inclus dans les
+    ETags évite qu'un autre processus (ou un redémarrage) réponde 304 à tort.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0
+        self.boot_id = uuid4().hex[:8]
+
+    @property
+    def current(self) -> int:
+        return self._value
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+    def etag(self, scope: str) -> str:
+        return f'W/"{scope}-{self.boot_id}-{self._value}"'
+
+
+users_version = DataVersion()
+
+
+def etag_matches(request: Request, etag: str, wildcard: bool = True) -> bool:
+    """Vrai si l'en-tête If-None-Match du client contient déjà cet ETag.
+
+    `*` ne vaut que pour une ressource dont l'existence est établie :
+    `wildcard=False` l'ignore tant qu'elle n'a pas été vérifiée.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return (wildcard and "*" in candidates) or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,152 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from uuid import uuid4
+from utils.logger_config import configure_logger
+
+# Configuration du logger
+logger = configure_logger()
+
+
+class InvalidationBus:
+    """Journal d'invalidations partagé entre les workers via un fichier SQLite.
+
+    Chaque mutation publie une ligne (sujet, clé, valeur) ; chaque worker relit
+    périodiquement les lignes plus récentes que la dernière vue et appelle les
+    abonnés du sujet. Les lignes publiées par le worker lui-même sont ignorées :
+    il a déjà appliqué l'invalidation localement.
+    """
+
+    def __init__(self, path: Path, retention: float = 300.0):
+        self.path = Path(path)
+        self.retention = retention
+        self.origin = uuid4().hex
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._handlers: dict[str, list] = {}
+        self._last_id = 0
+        self._last_prune = 0.0
+        self._published = 0
+        self._received = 0
+        self._last_delay = 0.0
+        self._max_delay = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS invalidations ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, origin TEXT NOT NULL, "
+                "topic TEXT NOT NULL, key TEXT NOT NULL, value TEXT, "
+                "created_at REAL NOT NULL)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def subscribe(self, topic: str, handler):
+        """Enregistre `handler(key, value)` pour les invalidations du sujet."""
+        self._handlers.setdefault(topic, []).append(handler)
+
+    def start(self):
+        """Ignore l'historique : seules les invalidations à venir sont appliquées."""
+        with self._lock:
+            row = self._connect().execute("SELECT MAX(id) FROM invalidations").fetchone()
+            self._last_id = row[0] or 0
+
+    def publish(self, topic: str, key, value=None):
+        with self._lock:
+            self._connect().execute(
+                "INSERT INTO invalidations (origin, topic, key, value, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    self.origin,
+                    topic,
+                    str(key),
+                    None if value is None else str(value),
+                    time.time(),
+                ),
+            )
+            self._published += 1
+
+    def publish_many(self, topic: str, keys):
+        """Publie une invalidation par clé, en une seule transaction."""
+        now = time.time()
+        rows = [(self.origin, topic, str(key), None, now) for key in keys]
+        if not rows:
+            return
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN")
+            try:
+                connection.executemany(
+                    "INSERT INTO invalidations (origin, topic, key, value, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                connection.execute("COMMIT")
+            except sqlite3.Error:
+                connection.execute("ROLLBACK")
+                raise
+            self._published += len(rows)
+
+    def poll(self) -> int:
+        """Applique les invalidations publiées par les autres workers."""
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT id, origin, topic, key, value, created_at "
+                    "FROM invalidations WHERE id > ? ORDER BY id",
+                    (self._last_id,),
+                )
+                .fetchall()
+            )
+            if rows:
+                self._last_id = rows[-1][0]
+
+        applied = 0
+        now = time.time()
+        for _, origin, topic, key, value, created_at in rows:
+            if origin == self.origin:
+                continue
+            for handler in self._handlers.get(topic, []):
+                try:
+                    handler(key, value)
+                except Exception as e:
+                    logger.error(f"Erreur d'invalidation '{topic}' ({key}) : {e}")
+            applied += 1
+            self._last_delay = max(now - created_at, 0.0)
+            self._max_delay = max(self._max_delay, self._last_delay)
+        self._received += applied
+
+        if now - self._last_prune > self.retention:
+            self.prune(now)
+        return applied
+
+    def prune(self, now: float = None):
+        """Supprime les lignes plus anciennes que la rétention."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._connect().execute(
+                "DELETE FROM invalidations WHERE created_at < ?", (now - self.retention,)
+            )
+            self._last_prune = now
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def stats(self) -> dict:
+        return {
+            "published": self._published,
+            "received": self._received,
+            "last_id": self._last_id,
+            "last_delay_ms": round(self._last_delay * 1000, 2),
+            "max_delay_ms": round(self._max_delay * 1000, 2),
+        }
@@ -1,4 +1,5 @@
 from pathlib import Path
+from utils.settings import settings
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -6,7 +7,26 @@ DATABASE_DIR = BASE_DIR / "db"
 DATABASE_DIR.mkdir(parents=True, exist_ok=True)
 
 USERS_DATABASE_PATH = DATABASE_DIR / "users.db"
-# SECOND_DB_DATABASE_PATH = DATABASE_DIR / "secondDb.db" # A modifier
+# Journal d'audit : fichier séparé, ses écritures ne verrouillent pas users.db
+AUDIT_DATABASE_PATH = DATABASE_DIR / "audit.db"
 
 USERS_DATABASE_URL = f"sqlite:///{USERS_DATABASE_PATH}"
-# SECOND_DB_DATABASE_URL = f"sqlite:///{SECOND_DB_DATABASE_PATH}" # A modifier
+# Même fichier ouvert en lecture seule, pour les routes qui ne font que lire
+USERS_READ_DATABASE_URL = f"sqlite:///file:{USERS_DATABASE_PATH}?mode=ro&uri=true"
+AUDIT_DATABASE_URL = f"sqlite:///{AUDIT_DATABASE_PATH}"
+
+# Nombre de fichiers SQLite sur lesquels les utilisateurs sont répartis
+USERS_SHARDS = settings.users_shards
+
+
+def users_shard_path(index: int) -> Path:
+    """Fichier du shard `index` ; le shard 0 est la base users.db historique."""
+    if index == 0:
+        return USERS_DATABASE_PATH
+    return DATABASE_DIR / f"users_shard{index}.db"
+
+
+def users_shard_url(index: int, read_only: bool = False) -> str:
+    if read_only:
+        return f"sqlite:///file:{users_shard_path(index)}?mode=ro&uri=true"
+    return f"sqlite:///{users_shard_path(index)}"
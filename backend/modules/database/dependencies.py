@@ -1,6 +1,8 @@
-from modules.database.session import UsersSessionLocal
-
-# from modules.database.session import SecondDbSessionLocal  # A modifier
+from modules.database.session import (
+    AuditSessionLocal,
+    UsersReadSessionLocal,
+    UsersSessionLocal,
+)
 
 
 def get_users_db():
@@ -11,9 +13,18 @@ def get_users_db():
         db.close()
 
 
-# def get_second_db_db():  # A modifier
-#     db = SecondDbSessionLocal()
-#     try:
-#         yield db
-#     finally:
-#         db.close()
+def get_users_read_db():
+    """Session en lecture seule, pour les routes qui n'écrivent pas."""
+    db = UsersReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_audit_db():
+    db = AuditSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
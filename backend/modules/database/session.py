@@ -1,18 +1,78 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
-from modules.database.config import USERS_DATABASE_URL
+from modules.database.config import AUDIT_DATABASE_URL, USERS_SHARDS, users_shard_url
+from modules.database.shards import ShardRouter, create_sharded_sessionmaker
+from utils.settings import settings
 
-# from modules.database.config import SECOND_DB_DATABASE_URL
+# Tailles des pools : l'écriture est sérialisée par SQLite, la lecture non
+USERS_DB_POOL_SIZE = settings.users_db_pool_size
+USERS_READ_POOL_SIZE = settings.users_read_pool_size
 
 Base = declarative_base()
+# Tables du journal d'audit, créées dans audit.db et non dans users.db
+AuditBase = declarative_base()
 
 
-def create_session(database_url: str):
-    engine = create_engine(database_url, connect_args={"check_same_thread": False})
+def create_session(database_url: str, pool_size: int = 5):
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size,
+        max_overflow=pool_size * 2,
+    )
+
+    # Mode WAL : les lecteurs ne bloquent pas l'écrivain (et inversement)
+    @event.listens_for(engine, "connect")
+    def enable_wal(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     return engine, SessionLocal
 
 
-users_engine, UsersSessionLocal = create_session(USERS_DATABASE_URL)
-# second_db_engine, SecondDbSessionLocal =
-# create_session(SECOND_DB_DATABASE_URL) # A modifier
+def create_read_session(database_url: str, pool_size: int = 10):
+    """Connexions en lecture seule : URI SQLite `mode=ro` et `query_only`."""
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size,
+        max_overflow=pool_size * 2,
+    )
+
+    @event.listens_for(engine, "connect")
+    def set_query_only(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA query_only = ON")
+
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return engine, SessionLocal
+
+
+# Un moteur par shard ; sans sharding (USERS_SHARDS=1), seul users.db existe
+users_engines, users_read_engines = [], []
+for index in range(USERS_SHARDS):
+    users_engines.append(create_session(users_shard_url(index), USERS_DB_POOL_SIZE)[0])
+    users_read_engines.append(
+        create_read_session(users_shard_url(index, read_only=True), USERS_READ_POOL_SIZE)[
+            0
+        ]
+    )
+users_engine, users_read_engine = users_engines[0], users_read_engines[0]
+users_router = ShardRouter(USERS_SHARDS)
+
+if USERS_SHARDS > 1:
+    UsersSessionLocal = create_sharded_sessionmaker(users_engines)
+    UsersReadSessionLocal = create_sharded_sessionmaker(users_read_engines)
+else:
+    UsersSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=users_engine)
+    UsersReadSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=users_read_engine
+    )
+
+
+def users_shard_for_email(email: str) -> str:
+    """Shard des écritures d'un nouvel utilisateur (ignoré sans sharding)."""
+    return users_router.for_email(email)
+
+
+# Un seul écrivain (la tâche de vidage) et des lectures d'administration rares
+audit_engine, AuditSessionLocal = create_session(AUDIT_DATABASE_URL, pool_size=2)
@@ -0,0 +1,132 @@
+import zlib
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy import text
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
+
+# Chaque shard attribue les ids de sa propre plage : l'id d'un utilisateur
+# désigne son shard sans table de correspondance
+SHARD_ID_SPAN = 2**40
+
+
+def shard_index_for_email(email: str, shards: int) -> int:
+    """Shard d'un utilisateur, d'après son email anonymisé."""
+    return zlib.crc32(email.encode("utf-8")) % shards
+
+
+def shard_index_for_id(user_id: int) -> int:
+    return int(user_id) // SHARD_ID_SPAN
+
+
+def seed_shard_ids(connection, index: int):
+    """Place la séquence d'ids des utilisateurs au début de la plage du shard."""
+    if index == 0:
+        return
+    connection.execute(
+        text(
+            "INSERT INTO sqlite_sequence (name, seq) SELECT 'users', :start "
+            "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'users')"
+        ),
+        {"start": index * SHARD_ID_SPAN},
+    )
+
+
+def _equality_criteria(clause):
+    """(colonne, valeurs) des critères `col == valeur` et `col IN (...)`.
+
+    Les critères sont supposés combinés par AND, comme dans toutes les requêtes
+    de l'API ; une requête sans critère reconnu interroge tous les shards.
+    """
+    if clause is None:
+        return
+    for element in visitors.iterate(clause):
+        if not isinstance(element, BinaryExpression):
+            continue
+        if not isinstance(element.right, BindParameter):
+            continue
+        if element.operator is operators.eq:
+            yield element.left, [element.right.effective_value]
+        elif element.operator is operators.in_op:
+            yield element.left, list(element.right.effective_value or [])
+
+
+class ShardRouter:
+    """Choisit le(s) shard(s) de chaque écriture, lecture par id ou requête.
+
+    - `users` : par email anonymisé (critère `email`) ou par id (critère `id`) ;
+    - tables liées (`refresh_tokens`, `api_keys`) : par `user_id` ;
+    - `roles` : répliqués à l'identique, lus sur le premier shard.
+    Le reste (liste des utilisateurs, recherche d'un token par hash) interroge
+    tous les shards et fusionne les résultats.
+    """
+
+    def __init__(self, shards: int):
+        self.shard_ids = [str(index) for index in range(shards)]
+
+    def for_email(self, email: str) -> str:
+        return self.shard_ids[shard_index_for_email(email, len(self.shard_ids))]
+
+    def for_ids(self, user_ids) -> list[str]:
+        indexes = {shard_index_for_id(user_id) for user_id in user_ids if user_id}
+        # Id hors des shards configurés : il n'existe nulle part, on reste exhaustif
+        if not indexes or max(indexes) >= len(self.shard_ids):
+            return self.shard_ids
+        return [self.shard_ids[index] for index in sorted(indexes)]
+
+    def shard_chooser(self, mapper, instance, clause=None):
+        if instance is not None:
+            state = sa_inspect(instance)
+            if state.identity_token is not None:
+                return state.identity_token
+            if mapper.local_table.name == "users" and instance.email:
+                return self.for_email(instance.email)
+            user_id = getattr(instance, "user_id", None)
+            if user_id is not None:
+                return self.for_ids([user_id])[0]
+        return self.shard_ids[0]
+
+    def identity_chooser(self, mapper, primary_key, *, lazy_loaded_from, **kw):
+        if lazy_loaded_from is not None:
+            return [lazy_loaded_from.identity_token]
+        table = mapper.local_table.name
+        if table == "users":
+            return self.for_ids([primary_key[0]])
+        if table == "roles":
+            return self.shard_ids[:1]
+        return self.shard_ids
+
+    def execute_chooser(self, orm_context):
+        mapper = orm_context.bind_mapper
+        table = mapper.local_table.name if mapper is not None else None
+        if table == "roles":
+            return self.shard_ids[:1]
+        if orm_context.is_insert:
+            raise ValueError(
+                "Insertion sans shard : passer bind_arguments={'shard_id': ...}"
+            )
+
+        where = getattr(orm_context.statement, "whereclause", None)
+        for column, values in _equality_criteria(where):
+            column_table = getattr(getattr(column, "table", None), "name", None)
+            if column_table != table:
+                continue
+            if table == "users" and column.key == "email":
+                return sorted({self.for_email(value) for value in values})
+            if (table == "users" and column.key == "id") or column.key == "user_id":
+                return self.for_ids(values)
+        return self.shard_ids
+
+
+def create_sharded_sessionmaker(engines: list) -> sessionmaker:
+    """Sessions réparties sur `engines`, le shard i étant engines[i]."""
+    router = ShardRouter(len(engines))
+    return sessionmaker(
+        class_=ShardedSession,
+        autoflush=False,
+        shards={shard_id: engine for shard_id, engine in zip(router.shard_ids, engines)},
+        shard_chooser=router.shard_chooser,
+        identity_chooser=router.identity_chooser,
+        execute_chooser=router.execute_chooser,
+    )
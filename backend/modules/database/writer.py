@@ -0,0 +1,174 @@
+import queue
+import threading
+import time
+from concurrent import futures
+from concurrent.futures import Future
+from utils.logger_config import configure_logger
+from modules.database.session import UsersSessionLocal
+from utils.settings import settings
+
+# Configuration du logger
+logger = configure_logger()
+
+GROUP_COMMIT_ENABLED = settings.group_commit_enabled
+GROUP_COMMIT_MAX_BATCH = settings.group_commit_max_batch
+GROUP_COMMIT_MAX_DELAY_MS = settings.group_commit_max_delay_ms
+GROUP_COMMIT_TIMEOUT = settings.group_commit_timeout
+
+
+class WriteTimeout(Exception):
+    """Écriture non confirmée à temps.
+
+    `applied` vaut False si l'intention a été annulée avant d'être exécutée,
+    None si son lot était déjà en cours : le commit a pu aboutir.
+    """
+
+    def __init__(self, applied: bool | None):
+        super().__init__("Écriture non confirmée dans le délai imparti")
+        self.applied = applied
+
+
+class GroupCommitWriter:
+    """Unique écrivain SQLite qui regroupe les écritures en une transaction.
+
+    Les routes soumettent des intentions d'écriture (`func(session)`) ; le thread
+    écrivain rassemble ce qui attend, au plus `max_batch` intentions ou
+    `max_delay` secondes après la première, les exécute dans une seule
+    transaction puis résout chaque future une fois le commit effectué. Si le lot
+    échoue, chaque intention est rejouée seule pour isoler la fautive.
+    """
+
+    def __init__(self, session_factory, max_batch: int = 64, max_delay: float = 0.005):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: queue.Queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._batches = 0
+        self._writes = 0
+        self._largest_batch = 0
+        self._fallbacks = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="group_commit_writer", daemon=True
+        )
+        self._thread.start()
+        logger.info("Écrivain SQLite à commit groupé démarré")
+
+    def stop(self, timeout: float = 5.0):
+        """Termine les écritures en attente puis arrête le thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, func) -> Future:
+        future = Future()
+        self._queue.put((func, future))
+        return future
+
+    def execute(self, func, timeout: float | None = None):
+        """Soumet une écriture et attend que son lot soit commité.
+
+        Passé `timeout`, une intention encore en file est annulée : elle ne sera
+        jamais écrite. Si son lot est déjà en cours, on attend encore au plus
+        `timeout` pour renvoyer le vrai résultat plutôt qu'une erreur alors que
+        l'écriture aboutit. Lève WriteTimeout dans les deux cas d'échec.
+        """
+        if timeout is None:
+            timeout = GROUP_COMMIT_TIMEOUT
+        future = self.submit(func)
+        try:
+            return future.result(timeout)
+        except futures.TimeoutError:
+            if future.cancel():
+                raise WriteTimeout(applied=False)
+        try:
+            return future.result(timeout)
+        except futures.TimeoutError:
+            raise WriteTimeout(applied=None)
+
+    def _collect(self) -> list:
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: list):
+        intents = [
+            (func, future)
+            for func, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        session = self.session_factory()
+        try:
+            results = [func(session) for func, _ in intents]
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Lot d'écritures annulé ({e}) : rejeu une par une")
+            self._fallbacks += 1
+            self._write_one_by_one(session, intents)
+            return
+        finally:
+            session.close()
+
+        self._batches += 1
+        self._writes += len(intents)
+        self._largest_batch = max(self._largest_batch, len(intents))
+        for (_, future), result in zip(intents, results):
+            future.set_result(result)
+
+    def _write_one_by_one(self, session, intents: list):
+        for func, future in intents:
+            try:
+                result = func(session)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                future.set_exception(e)
+            else:
+                self._batches += 1
+                self._writes += 1
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "pending": self._queue.qsize(),
+            "batches": self._batches,
+            "writes": self._writes,
+            "largest_batch": self._largest_batch,
+            "average_batch": (
+                round(self._writes / self._batches, 2) if self._batches else 0
+            ),
+            "fallbacks": self._fallbacks,
+        }
+
+
+users_writer = GroupCommitWriter(
+    UsersSessionLocal, GROUP_COMMIT_MAX_BATCH, GROUP_COMMIT_MAX_DELAY_MS / 1000
+)
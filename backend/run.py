@@ -1,9 +1,7 @@
-from modules.api.users.create_db import init_users_db
+# Importé en premier : mesure le délai entre l'import et l'API prête
+from modules.api.startup import startup_metrics  # noqa: F401
 from modules.api.main import create_app
-import os
-
-# Si on n'est pas en test, on initialise la base
-if os.getenv("RUN_ENV") != "test":
-    init_users_db()
 
+# Base, calibrage bcrypt et préchauffage sont faits au démarrage (lifespan),
+# sous verrou entre les workers, et non à l'import
 app = create_app()
@@ -4,6 +4,14 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from tests.setup_db import reset_test_db
+from modules.api.auth import throttle
+from modules.api.users.cache import user_cache
+from modules.api.auth.epochs import token_epochs
+from modules.api.auth.rotation import refresh_rotation
+from modules.api.api_keys.functions import api_key_cache
+from modules.api.audit.functions import audit_log
+from modules.api.users.activity import login_activity
+from modules.api.stats.functions import activity_series
 
 import os
 
@@ -31,3 +39,19 @@ def db_session(test_engine):
     finally:
         db.rollback()
         db.close()
+
+
+@pytest.fixture(autouse=True)
+def reset_in_memory_state(tmp_path, monkeypatch):
+    # Les tests partagent la même IP : on repart d'un limiteur vierge à chaque test
+    throttle.reset()
+    # Les ids SQLite peuvent être réutilisés d'un test à l'autre
+    user_cache.clear()
+    token_epochs.clear()
+    refresh_rotation.clear()
+    api_key_cache.clear()
+    audit_log.clear()
+    login_activity.clear()
+    activity_series.clear()
+    # Les sauvegardes de l'historique d'activité ne touchent pas db/
+    monkeypatch.setattr(activity_series, "path", tmp_path / "activity.json")
@@ -0,0 +1,166 @@
+import json
+import uuid
+import pytest
+from datetime import datetime, timezone
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.api.stats import functions as stats_functions
+from modules.api.stats.functions import ActivitySeries
+from modules.api.stats.schemas import ActivityEvent
+from tests.test_audit import admin_headers
+from tests.test_auth import create_test_user
+
+# Lundi 1er janvier 2024, 12:00 UTC
+NOON = datetime(2024, 1, 1, 12, tzinfo=timezone.utc).timestamp()
+
+
+class FakeClock:
+    def __init__(self, now: float = NOON):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, minutes: float):
+        self.now += minutes * 60
+
+
+@pytest.fixture
+def client(db_session):
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: db_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
+    return TestClient(app)
+
+
+def test_counts_are_grouped_by_minute_and_bucket():
+    clock = FakeClock()
+    series = ActivitySeries(capacity=60, clock=clock)
+    for minute in range(10):
+        series.record(ActivityEvent.login)
+        series.record(ActivityEvent.refresh, count=minute)
+        clock.advance(1)
+    clock.advance(-1)
+
+    per_minute = series.series(minutes=10)
+    assert [point["login"] for point in per_minute["points"]] == [1] * 10
+    assert per_minute["points"][0]["time"] == datetime(2024, 1, 1, 12, 0)
+    assert per_minute["totals"] == {
+        "login": 10,
+        "login_failed": 0,
+        "refresh": 45,
+        "signup": 0,
+    }
+
+    # Paquets de 5 minutes alignés : 12:00 et 12:05
+    by_five = series.series(minutes=10, bucket=5)
+    assert [point["time"].minute for point in by_five["points"]] == [0, 5]
+    assert [point["refresh"] for point in by_five["points"]] == [10, 35]
+    assert by_five["totals"] == per_minute["totals"]
+
+
+def test_old_minutes_are_overwritten():
+    clock = FakeClock()
+    series = ActivitySeries(capacity=5, clock=clock)
+    series.record(ActivityEvent.signup)
+    clock.advance(5)
+    # Même case, minute différente : le compteur repart de zéro
+    series.record(ActivityEvent.login)
+
+    result = series.series(minutes=60)
+    assert len(result["points"]) == 5
+    assert result["totals"]["signup"] == 0
+    assert result["totals"]["login"] == 1
+
+
+def test_snapshot_survives_restart_and_merges_workers(tmp_path):
+    path = tmp_path / "activity.json"
+    clock = FakeClock()
+    first = ActivitySeries(capacity=60, path=path, clock=clock)
+    second = ActivitySeries(capacity=60, path=path, clock=clock)
+
+    first.record(ActivityEvent.login, count=3)
+    second.record(ActivityEvent.login, count=2)
+    second.record(ActivityEvent.login_failed)
+    assert first.snapshot() == 1
+    assert second.snapshot() == 1
+    # Rien de nouveau : pas d'écriture
+    assert second.snapshot() == 0
+
+    # Le second worker voit aussi les connexions du premier
+    assert second.series(minutes=1)["totals"]["login"] == 5
+
+    restarted = ActivitySeries(capacity=60, path=path, clock=clock)
+    assert restarted.load() == 1
+    totals = restarted.series(minutes=1)["totals"]
+    assert totals["login"] == 5 and totals["login_failed"] == 1
+
+    # Les minutes sorties de la fenêtre ne sont plus sauvegardées
+    clock.advance(120)
+    restarted.record(ActivityEvent.refresh)
+    restarted.snapshot()
+    saved = json.loads(path.read_text())["minutes"]
+    assert list(saved.values()) == [{"refresh": 1}]
+
+
+def test_failed_snapshot_keeps_counts(tmp_path):
+    clock = FakeClock()
+    series = ActivitySeries(
+        capacity=60, path=tmp_path / "missing" / "a.json", clock=clock
+    )
+    series.record(ActivityEvent.signup)
+
+    assert series.snapshot() == 0
+    assert series.stats()["snapshot_failures"] == 1
+    assert series.stats()["unsaved_minutes"] == 1
+
+    series.path = tmp_path / "activity.json"
+    assert series.snapshot() == 1
+    assert series.series(minutes=1)["totals"]["signup"] == 1
+
+
+def test_corrupted_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "activity.json"
+    path.write_text("{not json")
+    series = ActivitySeries(capacity=60, path=path)
+
+    assert series.load() == 0
+    series.record(ActivityEvent.login)
+    assert series.snapshot() == 1
+    assert json.loads(path.read_text())["minutes"]
+
+
+def test_activity_endpoint(client, db_session):
+    headers = admin_headers(db_session)
+    email = f"series_{uuid.uuid4()}@example.com"
+    create_test_user(db_session, email)
+
+    client.post("/auth/login", data={"username": email, "password": "bad"})
+    tokens = client.post(
+        "/auth/login", data={"username": email, "password": "testpass123"}
+    ).json()
+    client.post(
+        "/auth/refresh", headers={"Authorization": f"Bearer {tokens['refresh_token']}"}
+    )
+
+    response = client.get("/stats/activity?minutes=60&bucket=15", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["bucket_minutes"] == 15
+    assert body["totals"] == {"login": 1, "login_failed": 1, "refresh": 1, "signup": 0}
+    assert sum(point["login"] for point in body["points"]) == 1
+    assert stats_functions.activity_series.stats()["unsaved_minutes"] >= 1
+
+
+def test_activity_endpoint_is_admin_only(client, db_session):
+    email = f"series_{uuid.uuid4()}@example.com"
+    create_test_user(db_session, email)
+    tokens = client.post(
+        "/auth/login", data={"username": email, "password": "testpass123"}
+    ).json()
+
+    response = client.get(
+        "/stats/activity", headers={"Authorization": f"Bearer {tokens['access_token']}"}
+    )
+    assert response.status_code == 403
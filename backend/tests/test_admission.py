@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.api.auth import admission
+from modules.api.auth.admission import AdmissionLimiter, AdmissionRejected
+
+
+# Fixture pour l'application et la base de données de test
+@pytest.fixture
+def client(db_session):
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: db_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
+    return TestClient(app)
+
+
+def test_limiter_rejects_when_queue_is_full():
+    async def scenario():
+        limiter = AdmissionLimiter(max_concurrent=1, max_queue=1, queue_timeout=1.0)
+        await limiter.acquire()
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected):
+            await limiter.acquire()
+        assert limiter.stats()["in_flight"] == 1
+        assert limiter.stats()["queued"] == 1
+
+        # La libération transmet le créneau au premier de la file
+        limiter.release()
+        await waiting
+        stats = limiter.stats()
+        assert stats["in_flight"] == 1
+        assert stats["queued"] == 0
+        assert stats["admitted"] == 2
+        assert stats["rejected_queue_full"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_limiter_rejects_after_queue_timeout():
+    async def scenario():
+        limiter = AdmissionLimiter(max_concurrent=1, max_queue=4, queue_timeout=0.05)
+        await limiter.acquire()
+
+        with pytest.raises(AdmissionRejected):
+            await limiter.acquire()
+
+        stats = limiter.stats()
+        assert stats["queued"] == 0
+        assert stats["rejected_timeout"] == 1
+
+        limiter.release()
+        assert limiter.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_saturated_login_fails_fast_with_retry_after(client, monkeypatch):
+    saturated = AdmissionLimiter(
+        max_concurrent=0, max_queue=0, queue_timeout=1.0, retry_after=3
+    )
+    monkeypatch.setattr(admission, "bcrypt_limiter", saturated)
+
+    response = client.post(
+        "/auth/login", data={"username": "nouser@example.com", "password": "any"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+    # Les routes sans bcrypt ne passent pas par le limiteur
+    assert client.get("/hello").status_code == 200
+    assert saturated.stats()["rejected_queue_full"] == 1
+
+
+def test_login_releases_its_slot(client, monkeypatch):
+    limiter = AdmissionLimiter(max_concurrent=1, max_queue=0, queue_timeout=1.0)
+    monkeypatch.setattr(admission, "bcrypt_limiter", limiter)
+
+    for _ in range(2):
+        response = client.post(
+            "/auth/login", data={"username": "nouser@example.com", "password": "any"}
+        )
+        assert response.status_code == 401
+
+    assert limiter.stats()["in_flight"] == 0
+    assert limiter.stats()["admitted"] == 2
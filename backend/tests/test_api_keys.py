@@ -0,0 +1,110 @@
+import uuid
+import pytest
+from datetime import timedelta
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.api.api_keys.functions import api_key_cache
+from modules.api.auth.functions import create_token
+from modules.api.auth.security import anonymize
+from modules.api.users.models import ApiKey
+from tests.test_auth import create_test_user
+
+
+# Fixture pour l'application et la base de données de test
+@pytest.fixture
+def client(db_session):
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: db_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
+    return TestClient(app)
+
+
+@pytest.fixture
+def reader(db_session):
+    email = f"service_{uuid.uuid4()}@example.com"
+    return create_test_user(db_session, email), email
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def admin_headers(email):
+    return bearer(
+        create_token(
+            data={"sub": anonymize(email), "role": "admin"},
+            expires_delta=timedelta(minutes=5),
+        )
+    )
+
+
+def issue_key(client, admin_email, user_id, scopes=("reader",)):
+    return client.post(
+        "/api-keys/",
+        json={"user_id": user_id, "name": "batch", "scopes": list(scopes)},
+        headers=admin_headers(admin_email),
+    )
+
+
+def test_api_key_authenticates_its_user(client, db_session, reader):
+    user, email = reader
+    response = issue_key(client, email, user.id)
+    assert response.status_code == 200, response.text
+    key = response.json()["key"]
+    assert key.startswith("sk_" + response.json()["prefix"])
+
+    # Seul le hash du secret est stocké
+    stored = db_session.query(ApiKey).filter(ApiKey.id == response.json()["id"]).one()
+    assert key.split("_")[-1] not in stored.secret_hash
+
+    me = client.get("/auth/users/me", headers=bearer(key))
+    assert me.status_code == 200
+    assert me.json()["email"] == anonymize(email)
+
+    # Deuxième appel servi par le cache de vérification
+    assert client.get("/auth/users/me", headers=bearer(key)).status_code == 200
+    assert api_key_cache.stats()["hits"] == 1
+
+
+def test_revoked_key_is_rejected(client, reader):
+    user, email = reader
+    created = issue_key(client, email, user.id).json()
+    assert client.get("/auth/users/me", headers=bearer(created["key"])).status_code == 200
+
+    response = client.delete(f"/api-keys/{created['id']}", headers=admin_headers(email))
+    assert response.status_code == 200
+    assert client.get("/auth/users/me", headers=bearer(created["key"])).status_code == 401
+
+    listing = client.get(f"/api-keys/?user_id={user.id}", headers=admin_headers(email))
+    assert listing.status_code == 200
+    assert [api_key["revoked"] for api_key in listing.json()] == [True]
+    assert "key" not in listing.json()[0]
+
+
+def test_wrong_secret_is_rejected(client, reader):
+    user, email = reader
+    key = issue_key(client, email, user.id).json()["key"]
+    forged = key[:-4] + ("aaaa" if not key.endswith("aaaa") else "bbbb")
+
+    assert client.get("/auth/users/me", headers=bearer(forged)).status_code == 401
+    assert client.get("/auth/users/me", headers=bearer("sk_unknown")).status_code == 401
+
+
+def test_key_scopes_are_bounded_by_role(client, reader):
+    user, email = reader
+    response = issue_key(client, email, user.id, scopes=["admin"])
+    assert response.status_code == 400
+
+
+def test_only_admins_manage_keys(client, reader):
+    user, email = reader
+    key = issue_key(client, email, user.id).json()["key"]
+
+    assert client.get("/api-keys/", headers=bearer(key)).status_code == 403
+    response = client.post(
+        "/api-keys/",
+        json={"user_id": user.id, "name": "escalade", "scopes": ["reader"]},
+        headers=bearer(key),
+    )
+    assert response.status_code == 403
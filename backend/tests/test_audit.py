@@ -0,0 +1,196 @@
+import uuid
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database.dependencies import get_audit_db, get_users_db, get_users_read_db
+from modules.api.audit import functions as audit_functions
+from modules.api.audit.functions import AuditLog, init_audit_db
+from modules.api.audit.models import AuditEvent
+from modules.api.audit.schemas import AuditEventType
+from modules.api.auth.functions import create_token
+from modules.api.auth.security import anonymize
+from tests.test_auth import create_test_user
+from tests.test_routes import create_roles_if_not_exists
+
+
+@pytest.fixture
+def audit_engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    init_audit_db(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def audit_log(audit_engine, monkeypatch):
+    log = AuditLog(sessionmaker(bind=audit_engine), maxsize=100, batch_size=50)
+    monkeypatch.setattr(audit_functions, "audit_log", log)
+    monkeypatch.setattr(audit_functions, "AUDIT_ENABLED", True)
+    return log
+
+
+@pytest.fixture
+def client(db_session, audit_engine):
+    AuditSession = sessionmaker(bind=audit_engine)
+
+    def get_test_audit_db():
+        db = AuditSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: db_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
+    app.dependency_overrides[get_audit_db] = get_test_audit_db
+    return TestClient(app)
+
+
+def admin_headers(db_session):
+    create_roles_if_not_exists(db_session)
+    email = f"audit_admin_{uuid.uuid4()}@example.com"
+    admin = create_test_user(db_session, email)
+    token = create_token(
+        data={"sub": anonymize(email), "role": "admin"},
+        expires_delta=timedelta(minutes=5),
+        user=admin,
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_auth_events_are_recorded_and_queryable(client, db_session, audit_log):
+    headers = admin_headers(db_session)
+    email = f"audit_{uuid.uuid4()}@example.com"
+    user = create_test_user(db_session, email)
+    user_id = user.id
+
+    failed = client.post("/auth/login", data={"username": email, "password": "bad"})
+    assert failed.status_code == 401
+    login = client.post(
+        "/auth/login", data={"username": email, "password": "testpass123"}
+    )
+    assert login.status_code == 200
+    refreshed = client.post(
+        "/auth/refresh",
+        headers={"Authorization": f"Bearer {login.json()['refresh_token']}"},
+    )
+    assert refreshed.status_code == 200
+    role = client.patch(
+        f"/auth/users/{user_id}/role", json={"role": "admin"}, headers=headers
+    )
+    assert role.status_code == 200
+    assert client.delete(f"/auth/users/{user_id}", headers=headers).status_code == 200
+
+    # Rien n'est écrit avant le vidage par lot
+    assert audit_log.stats()["written"] == 0
+    assert audit_log.flush() == 5
+    assert audit_log.stats()["batches"] == 1
+
+    response = client.get(f"/audit/events?user_id={user_id}", headers=headers)
+    assert response.status_code == 200
+    events = response.json()
+    assert [event["event_type"] for event in events] == [
+        "user_deleted",
+        "role_changed",
+        "refresh",
+        "login",
+    ]
+    assert events[1]["detail"] == "admin"
+    assert events[0]["actor_id"] is not None
+
+    failures = client.get("/audit/events?event_type=login_failed", headers=headers)
+    assert [event["email"] for event in failures.json()] == [anonymize(email)]
+
+
+def test_time_range_filter(client, db_session, audit_log):
+    headers = admin_headers(db_session)
+    audit_log.record(AuditEventType.login, user_id=1)
+    audit_log.flush()
+    now = datetime.now(timezone.utc)
+
+    def count(**params):
+        response = client.get("/audit/events", params=params, headers=headers)
+        return len(response.json())
+
+    assert count(since=(now - timedelta(minutes=1)).isoformat()) == 1
+    assert count(since=(now + timedelta(minutes=1)).isoformat()) == 0
+    assert count(until=(now - timedelta(minutes=1)).isoformat()) == 0
+
+
+def test_events_endpoint_is_admin_only(client, db_session):
+    email = f"reader_{uuid.uuid4()}@example.com"
+    user = create_test_user(db_session, email)
+    token = create_token(
+        data={"sub": anonymize(email), "role": "reader"},
+        expires_delta=timedelta(minutes=5),
+        user=user,
+    )
+    response = client.get("/audit/events", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+
+def test_full_queue_drops_and_counts(audit_engine):
+    log = AuditLog(sessionmaker(bind=audit_engine), maxsize=3, batch_size=2)
+
+    results = [log.record(AuditEventType.login, user_id=i) for i in range(5)]
+    assert results == [True, True, True, False, False]
+    assert log.stats()["dropped"] == 2
+    assert log.stats()["high_water"] == 3
+
+    # Lots de batch_size insertions
+    assert log.flush() == 3
+    assert log.stats()["batches"] == 2
+    assert log.stats()["queued"] == 0
+
+
+def test_failed_batch_is_retried(audit_engine):
+    real_factory = sessionmaker(bind=audit_engine)
+    calls = []
+
+    def flaky_factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        return real_factory()
+
+    log = AuditLog(flaky_factory, maxsize=10, batch_size=10)
+    log.record(AuditEventType.refresh, user_id=1)
+
+    assert log.flush() == 0
+    assert log.stats()["failures"] == 1
+    assert log.stats()["queued"] == 1
+    assert log.flush() == 1
+    with real_factory() as db:
+        assert db.query(AuditEvent).count() == 1
+
+
+def test_audit_log_is_append_only(audit_engine, audit_log):
+    audit_log.record(AuditEventType.login, user_id=1)
+    audit_log.flush()
+
+    with audit_engine.connect() as connection:
+        for statement in (
+            "UPDATE audit_events SET user_id = 2",
+            "DELETE FROM audit_events",
+        ):
+            with pytest.raises(Exception, match="ajout seul"):
+                connection.execute(text(statement))
+
+
+def test_user_query_uses_index(audit_engine):
+    with audit_engine.connect() as connection:
+        plan = connection.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM audit_events WHERE user_id = 1 "
+                "AND created_at >= '2024-01-01' ORDER BY created_at DESC"
+            )
+        ).fetchall()
+    assert "ix_audit_events_user_time" in " ".join(str(row) for row in plan)
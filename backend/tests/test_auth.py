@@ -1,13 +1,21 @@
 import os
+import uuid
 import pytest
 from datetime import timedelta, timezone, datetime
 from jose import jwt
 from sqlalchemy import inspect
 from fastapi.testclient import TestClient
 from modules.api.main import create_app
-from modules.database.dependencies import get_users_db
+from modules.database.dependencies import get_users_db, get_users_read_db
 from modules.api.users.models import User, Role
-from modules.api.auth.security import hash_password, anonymize, hash_token
+from modules.api.auth import security
+from modules.api.auth.security import (
+    hash_password,
+    anonymize,
+    hash_token,
+    get_password_rounds,
+    calibrate_bcrypt_rounds,
+)
 from modules.api.users.functions import get_user_by_email
 from modules.api.auth.functions import (
     create_token,
@@ -33,6 +41,7 @@ def client(db_session):
     # Création de l'application FastAPI avec une DB de test
     app = create_app()
     app.dependency_overrides[get_users_db] = lambda: db_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
 
     # Création d’un client de test
     client = TestClient(app)
@@ -186,3 +195,60 @@ def test_refresh_token_validity(db_session, test_user):
     assert refresh_token_db.expires_at.replace(tzinfo=timezone.utc) > datetime.now(
         timezone.utc
     )
+
+
+def test_hash_password_uses_configured_rounds(monkeypatch):
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 5)
+    hashed = hash_password("testpass123")
+    assert get_password_rounds(hashed) == 5
+    assert get_password_rounds(hash_password("testpass123", rounds=4)) == 4
+
+
+def test_authenticate_user_rehashes_on_cost_change(db_session, monkeypatch):
+    email = f"rehash_{uuid.uuid4()}@example.com"
+    user = create_test_user(db_session, email)
+    user.password = hash_password("testpass123", rounds=4)
+    db_session.commit()
+
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 5)
+    authenticated = authenticate_user(db_session, email, "testpass123")
+
+    assert authenticated is not False
+    assert get_password_rounds(authenticated.password) == 5
+    assert authenticate_user(db_session, email, "testpass123") is not False
+
+
+def test_calibrate_bcrypt_rounds_respects_bounds():
+    assert calibrate_bcrypt_rounds(0.0, min_rounds=4, max_rounds=6) == 4
+    assert calibrate_bcrypt_rounds(60_000.0, min_rounds=4, max_rounds=6) == 6
+
+
+def test_login_includes_profile_on_request(db_session, client):
+    email = f"profile_{uuid.uuid4()}@example.com"
+    user = create_test_user(db_session, email)
+    credentials = {"username": email, "password": "testpass123"}
+
+    plain = client.post("/auth/login", data=credentials)
+    assert plain.status_code == 200
+    assert "user" not in plain.json()
+
+    response = client.post("/auth/login?include_profile=true", data=credentials)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["access_token"] and data["refresh_token"]
+    assert data["user"]["id"] == user.id
+    assert data["user"]["name"] == "test"
+    assert data["user"]["role"] == "reader"
+    assert data["user"]["email"] == anonymize(email)
+
+
+def test_login_profile_not_returned_on_failure(db_session, client):
+    email = f"profile_{uuid.uuid4()}@example.com"
+    create_test_user(db_session, email)
+
+    response = client.post(
+        "/auth/login?include_profile=true",
+        data={"username": email, "password": "wrong-password"},
+    )
+    assert response.status_code == 401
+    assert "user" not in response.json()
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.api.stats import broadcast
+from modules.api.stats.broadcast import KEEPALIVE, BroadcastHub, HubFull
+from tests.test_audit import admin_headers
+from tests.test_auth import create_test_user
+
+
+@pytest.fixture
+def app(db_session):
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: db_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
+    return app
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    hub = BroadcastHub(buffer_size=8, max_subscribers=4, heartbeat=0.05)
+    monkeypatch.setattr(broadcast, "dashboard_hub", hub)
+    return hub
+
+
+def parse_events(body: bytes) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.decode().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.splitlines() if not line.startswith(":")
+        )
+        if fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_publish_fans_out_to_every_subscriber():
+    async def scenario():
+        hub = BroadcastHub(buffer_size=8)
+        subscribers = [hub.subscribe() for _ in range(3)]
+        assert hub.publish("user_created", {"id": 1}) == 3
+        hub.publish("user_deleted", {"id": 1})
+        return [await hub.next_messages(s, timeout=1) for s in subscribers], hub
+
+    batches, hub = asyncio.run(scenario())
+    for messages in batches:
+        assert parse_events(b"".join(messages)) == [
+            ("user_created", {"id": 1}),
+            ("user_deleted", {"id": 1}),
+        ]
+    assert hub.stats()["delivered"] == 6
+
+
+def test_publish_without_subscribers_is_a_no_op():
+    hub = BroadcastHub()
+    assert hub.publish("user_created", {"id": 1}) == 0
+    assert hub.stats()["published"] == 0
+
+
+def test_publish_from_another_thread_wakes_subscriber():
+    async def scenario():
+        hub = BroadcastHub()
+        subscriber = hub.subscribe()
+        threading.Timer(0.05, hub.publish, ("role_changed", {"id": 2})).start()
+        start = time.perf_counter()
+        messages = await hub.next_messages(subscriber, timeout=5)
+        return messages, time.perf_counter() - start
+
+    messages, waited = asyncio.run(scenario())
+    assert parse_events(b"".join(messages)) == [("role_changed", {"id": 2})]
+    assert waited < 1
+
+
+def test_slow_consumer_is_disconnected():
+    async def scenario():
+        hub = BroadcastHub(buffer_size=2, heartbeat=0.01)
+        slow, fast = hub.subscribe(), hub.subscribe()
+        for i in range(2):
+            hub.publish("user_created", {"id": i})
+        await hub.next_messages(fast, timeout=1)
+        # Tampon du lent plein : il est retiré, le rapide continue
+        assert hub.publish("user_created", {"id": 2}) == 1
+        chunks = [chunk async for chunk in hub.stream(slow)]
+        return hub, chunks
+
+    hub, chunks = asyncio.run(scenario())
+    events = parse_events(b"".join(chunks))
+    assert [event for event, _ in events] == ["user_created", "user_created", "overflow"]
+    stats = hub.stats()
+    assert stats["slow_consumers"] == 1 and stats["subscribers"] == 1
+
+
+def test_stream_sends_heartbeats_and_ends_on_close():
+    async def scenario():
+        hub = BroadcastHub(heartbeat=0.01)
+        subscriber = hub.subscribe()
+        stream = hub.stream(subscriber, b"event: snapshot\ndata: {}\n\n")
+        chunks = [await stream.__anext__(), await stream.__anext__()]
+        hub.close()
+        chunks += [chunk async for chunk in stream]
+        return hub, chunks
+
+    hub, chunks = asyncio.run(scenario())
+    assert chunks[1] == KEEPALIVE
+    assert hub.stats()["subscribers"] == 0
+
+
+def test_subscriber_limit():
+    async def scenario():
+        hub = BroadcastHub(max_subscribers=1)
+        hub.subscribe()
+        with pytest.raises(HubFull):
+            hub.subscribe()
+
+    asyncio.run(scenario())
+
+
+def test_stream_endpoint_pushes_user_changes(app, db_session, hub):
+    headers = admin_headers(db_session)
+    create_test_user(db_session, f"stream_{uuid.uuid4()}@example.com")
+
+    def mutate():
+        deadline = time.monotonic() + 5
+        while hub.subscriber_count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        other = TestClient(app)
+        user = other.post(
+            "/auth/users/",
+            json={
+                "name": "stream",
+                "email": f"stream_{uuid.uuid4()}@example.com",
+                "password": "testpass123",
+            },
+        ).json()
+        other.patch(
+            f"/auth/users/{user['id']}/role", json={"role": "admin"}, headers=headers
+        )
+        hub.close()
+
+    thread = threading.Thread(target=mutate)
+    thread.start()
+    response = TestClient(app).get("/stats/stream", headers=headers)
+    thread.join()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.content)
+    assert events[0][0] == "snapshot"
+    assert events[0][1]["user_count"] >= 2
+    created = events[1][1]
+    assert events[1:] == [
+        ("user_created", {"id": created["id"], "role": "reader"}),
+        ("role_changed", {"id": created["id"], "role": "admin"}),
+    ]
+
+
+def test_stream_endpoint_is_admin_only(app, db_session, hub):
+    email = f"stream_{uuid.uuid4()}@example.com"
+    create_test_user(db_session, email)
+    client = TestClient(app)
+    tokens = client.post(
+        "/auth/login", data={"username": email, "password": "testpass123"}
+    ).json()
+
+    response = client.get(
+        "/stats/stream", headers={"Authorization": f"Bearer {tokens['access_token']}"}
+    )
+    assert response.status_code == 403
+    assert hub.subscriber_count == 0
@@ -0,0 +1,118 @@
+import uuid
+import pytest
+from datetime import timedelta
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.api.auth import functions
+from modules.api.auth.functions import create_token
+from modules.api.auth.security import anonymize
+from modules.api.users import email_filter
+from modules.api.users.email_filter import EmailBloomFilter
+from tests.test_auth import create_test_user
+
+
+# Fixture pour l'application et la base de données de test
+@pytest.fixture
+def client(db_session):
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: db_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
+    return TestClient(app)
+
+
+@pytest.fixture
+def known_emails(monkeypatch):
+    """Filtre vierge et déjà construit (base vide), propre au test."""
+    bloom = EmailBloomFilter(capacity=1000, fp_rate=0.01)
+    bloom.rebuild(lambda: [])
+    monkeypatch.setattr(email_filter, "known_emails", bloom)
+    return bloom
+
+
+def test_filter_is_permissive_until_built():
+    bloom = EmailBloomFilter(capacity=1000, fp_rate=0.01)
+    assert bloom.definitely_absent(anonymize("a@example.com")) is False
+
+    bloom.rebuild(lambda: [anonymize("a@example.com")])
+    assert bloom.definitely_absent(anonymize("a@example.com")) is False
+    assert bloom.definitely_absent(anonymize("b@example.com")) is True
+
+
+def test_filter_add_and_remove():
+    bloom = EmailBloomFilter(capacity=1000, fp_rate=0.01)
+    bloom.rebuild(lambda: [])
+    email = anonymize("a@example.com")
+
+    bloom.add(email)
+    assert bloom.might_contain(email)
+    bloom.remove(email)
+    assert not bloom.might_contain(email)
+    assert bloom.stats()["entries"] == 0
+
+
+def test_rebuild_keeps_concurrent_additions():
+    bloom = EmailBloomFilter(capacity=1000, fp_rate=0.01)
+    added_during_rebuild = anonymize("new@example.com")
+
+    def load_emails():
+        # Un utilisateur s'inscrit pendant la lecture de la table
+        bloom.add(added_during_rebuild)
+        return [anonymize("old@example.com")]
+
+    bloom.rebuild(load_emails)
+    assert bloom.might_contain(added_during_rebuild)
+    assert bloom.stats()["entries"] == 2
+
+
+def test_false_positive_rate_matches_target():
+    bloom = EmailBloomFilter(capacity=5000, fp_rate=0.01)
+    bloom.rebuild(lambda: [anonymize(f"user_{i}@example.com") for i in range(5000)])
+
+    probes = 20_000
+    false_positives = sum(
+        bloom.might_contain(anonymize(f"other_{i}@example.com")) for i in range(probes)
+    )
+    assert false_positives / probes < 0.02
+    # Le filtre est dimensionné pour le double des entrées : marge sous la cible
+    assert 0 < bloom.stats()["estimated_fp_rate"] <= 0.01
+
+
+def test_unknown_email_login_skips_database(client, known_emails, monkeypatch):
+    def fail_lookup(email, db):
+        raise AssertionError("La base ne doit pas être interrogée")
+
+    monkeypatch.setattr(functions, "get_user_by_email", fail_lookup)
+
+    response = client.post(
+        "/auth/login", data={"username": "nouser@example.com", "password": "any"}
+    )
+    assert response.status_code == 401
+    assert known_emails.stats()["skipped_lookups"] == 1
+
+
+def test_signup_and_delete_update_filter(client, db_session, known_emails):
+    create_test_user(db_session, f"roles_{uuid.uuid4()}@example.com")
+    email = f"signup_{uuid.uuid4()}@example.com"
+
+    response = client.post(
+        "/auth/users/", json={"email": email, "name": "test", "password": "testpass123"}
+    )
+    assert response.status_code == 200, response.text
+    assert known_emails.might_contain(anonymize(email))
+
+    login = client.post(
+        "/auth/login", data={"username": email, "password": "testpass123"}
+    )
+    assert login.status_code == 200
+
+    admin_token = create_token(
+        data={"sub": anonymize(email), "role": "admin"},
+        expires_delta=timedelta(minutes=5),
+    )
+    deleted = client.delete(
+        f"/auth/users/{response.json()['id']}",
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert deleted.status_code == 200
+    assert known_emails.definitely_absent(anonymize(email))
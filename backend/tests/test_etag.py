@@ -0,0 +1,116 @@
+import uuid
+import pytest
+from datetime import timedelta
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.database.session import Base
+from modules.api.auth.functions import create_token
+from modules.api.auth.security import anonymize
+from tests.test_auth import create_test_user
+from tests.test_routes import create_roles_if_not_exists
+
+
+@pytest.fixture
+def etag_engine():
+    """Base isolée : la liste complète des utilisateurs doit être cohérente."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def etag_session(etag_engine):
+    db = sessionmaker(bind=etag_engine)()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def client(etag_session):
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: etag_session
+    app.dependency_overrides[get_users_read_db] = lambda: etag_session
+    return TestClient(app)
+
+
+@pytest.fixture
+def admin(etag_session):
+    create_roles_if_not_exists(etag_session)
+    email = f"etag_{uuid.uuid4()}@example.com"
+    user = create_test_user(etag_session, email)
+    token = create_token(
+        data={"sub": anonymize(email), "role": "admin"},
+        expires_delta=timedelta(minutes=5),
+    )
+    return user, {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def statements(etag_engine):
+    """Requêtes SQL émises sur la base de test pendant le test."""
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        executed.append(statement)
+
+    event.listen(etag_engine, "before_cursor_execute", before_cursor_execute)
+    yield executed
+    event.remove(etag_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_user_detail_revalidates_without_query(client, admin, statements):
+    user, _ = admin
+    user_id = user.id
+    first = client.get(f"/users/users/{user_id}")
+    etag = first.headers["ETag"]
+    statements.clear()
+
+    response = client.get(f"/users/users/{user_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert statements == []
+
+
+def test_user_detail_etag_does_not_hide_a_missing_user(client, admin):
+    user, headers = admin
+    user_id = user.id
+    etag = client.get(f"/users/users/{user_id}").headers["ETag"]
+
+    def revalidate(user_id, if_none_match):
+        response = client.get(
+            f"/users/users/{user_id}", headers={"If-None-Match": if_none_match}
+        )
+        return response.status_code
+
+    # `*` ne vaut que pour un utilisateur qui existe
+    assert revalidate(user_id, "*") == 304
+    assert revalidate(user_id + 1000, "*") == 404
+
+    # Après suppression, l'ancien ETag n'est plus valable
+    assert client.delete(f"/auth/users/{user_id}", headers=headers).status_code == 200
+    assert revalidate(user_id, etag) == 404
+    assert revalidate(user_id, "*") == 404
+
+
+def test_users_listing_etag_changes_after_mutation(client, admin):
+    user, headers = admin
+    user_id = user.id
+    listing = client.get("/auth/users/", headers=headers)
+    assert listing.status_code == 200
+    etag = listing.headers["ETag"]
+
+    unchanged = client.get("/auth/users/", headers={**headers, "If-None-Match": etag})
+    assert unchanged.status_code == 304
+
+    client.patch(f"/auth/users/{user_id}/role", json={"role": "admin"}, headers=headers)
+
+    changed = client.get("/auth/users/", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
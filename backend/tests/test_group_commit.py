@@ -0,0 +1,224 @@
+import threading
+import uuid
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database import writer
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.database.session import Base
+from modules.database.writer import GroupCommitWriter, WriteTimeout
+from modules.api.auth import security
+from modules.api.auth.security import anonymize, hash_password
+from modules.api.users.models import RefreshToken, Role, User
+
+CONCURRENT_WRITES = 32
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'users.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        reader = Role(role="reader")
+        db.add(reader)
+        db.flush()
+        db.add(User(email="writer", name="test", password="x", role_id=reader.id))
+        db.commit()
+    yield SessionLocal
+    engine.dispose()
+
+
+@pytest.fixture
+def group_writer(session_factory):
+    group_writer = GroupCommitWriter(session_factory, max_batch=64, max_delay=0.05)
+    group_writer.start()
+    yield group_writer
+    group_writer.stop()
+
+
+def insert_token(token: str):
+    def insert(session):
+        user_id = session.query(User.id).filter(User.email == "writer").scalar()
+        session.add(
+            RefreshToken(
+                token=token,
+                user_id=user_id,
+                expires_at=datetime.utcnow() + timedelta(days=7),
+            )
+        )
+        return token
+
+    return insert
+
+
+def test_concurrent_writes_share_commits(group_writer, session_factory):
+    with ThreadPoolExecutor(max_workers=CONCURRENT_WRITES) as pool:
+        results = list(
+            pool.map(
+                lambda i: group_writer.execute(insert_token(f"token-{i}")),
+                range(CONCURRENT_WRITES),
+            )
+        )
+
+    assert results == [f"token-{i}" for i in range(CONCURRENT_WRITES)]
+    with session_factory() as db:
+        assert db.query(RefreshToken).count() == CONCURRENT_WRITES
+    stats = group_writer.stats()
+    assert stats["writes"] == CONCURRENT_WRITES
+    assert stats["batches"] < CONCURRENT_WRITES
+    assert stats["largest_batch"] > 1
+
+
+def test_failing_write_does_not_sink_its_batch(group_writer, session_factory):
+    def duplicate(session):
+        session.add(RefreshToken(token="same", user_id=1, expires_at=datetime.utcnow()))
+        session.flush()
+
+    futures = [group_writer.submit(insert_token("ok-1")), group_writer.submit(duplicate)]
+    futures += [group_writer.submit(duplicate), group_writer.submit(insert_token("ok-2"))]
+
+    assert futures[0].result(5) == "ok-1"
+    assert futures[1].result(5) is None
+    with pytest.raises(Exception):
+        futures[2].result(5)
+    assert futures[3].result(5) == "ok-2"
+    with session_factory() as db:
+        assert db.query(RefreshToken).count() == 3
+
+
+def test_stop_flushes_pending_writes(session_factory):
+    group_writer = GroupCommitWriter(session_factory, max_batch=64, max_delay=0.05)
+    group_writer.start()
+    futures = [group_writer.submit(insert_token(f"pending-{i}")) for i in range(10)]
+    group_writer.stop()
+
+    assert all(future.done() for future in futures)
+    with session_factory() as db:
+        assert db.query(RefreshToken).count() == 10
+
+
+def test_timed_out_write_is_cancelled(session_factory):
+    # Écrivain arrêté : l'intention reste en file jusqu'au délai
+    group_writer = GroupCommitWriter(session_factory, max_delay=0.001)
+    with pytest.raises(WriteTimeout) as error:
+        group_writer.execute(insert_token("late"), timeout=0.05)
+    assert error.value.applied is False
+
+    # Annulée, elle n'est jamais écrite, même une fois l'écrivain démarré
+    group_writer.start()
+    assert group_writer.execute(insert_token("next"), timeout=5) == "next"
+    group_writer.stop()
+    with session_factory() as db:
+        assert [t.token for t in db.query(RefreshToken)] == ["next"]
+
+
+def test_running_write_returns_its_result_after_timeout(group_writer, session_factory):
+    release = threading.Event()
+    insert = insert_token("slow")
+
+    def slow(session):
+        release.wait(5)
+        return insert(session)
+
+    threading.Timer(0.2, release.set).start()
+    # Le lot a commencé avant le délai : la route reçoit le vrai résultat
+    assert group_writer.execute(slow, timeout=0.15) == "slow"
+    with session_factory() as db:
+        assert db.query(RefreshToken).count() == 1
+
+
+def test_login_answers_503_when_write_times_out(session_factory, monkeypatch):
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+    email = f"group_{uuid.uuid4()}@example.com"
+    with session_factory() as db:
+        db.add(
+            User(
+                email=anonymize(email),
+                name="test",
+                password=hash_password("testpass123"),
+                role_id=1,
+                is_active=True,
+            )
+        )
+        db.commit()
+
+    # Écrivain jamais démarré : l'insertion du refresh token expire
+    monkeypatch.setattr(writer, "GROUP_COMMIT_ENABLED", True)
+    monkeypatch.setattr(writer, "GROUP_COMMIT_TIMEOUT", 0.05)
+    monkeypatch.setattr(writer, "users_writer", GroupCommitWriter(session_factory))
+
+    def get_file_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = create_app()
+    app.dependency_overrides[get_users_db] = get_file_db
+    app.dependency_overrides[get_users_read_db] = get_file_db
+    response = TestClient(app).post(
+        "/auth/login", data={"username": email, "password": "testpass123"}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    with session_factory() as db:
+        assert db.query(RefreshToken).count() == 0
+
+
+def test_login_and_refresh_through_writer(session_factory, monkeypatch):
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+    email = f"group_{uuid.uuid4()}@example.com"
+    with session_factory() as db:
+        db.add(
+            User(
+                email=anonymize(email),
+                name="test",
+                password=hash_password("testpass123"),
+                role_id=1,
+                is_active=True,
+            )
+        )
+        db.commit()
+
+    group_writer = GroupCommitWriter(session_factory, max_delay=0.001)
+    group_writer.start()
+    monkeypatch.setattr(writer, "GROUP_COMMIT_ENABLED", True)
+    monkeypatch.setattr(writer, "users_writer", group_writer)
+
+    def get_file_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = create_app()
+    app.dependency_overrides[get_users_db] = get_file_db
+    app.dependency_overrides[get_users_read_db] = get_file_db
+    client = TestClient(app)
+    try:
+        login = client.post(
+            "/auth/login", data={"username": email, "password": "testpass123"}
+        )
+        assert login.status_code == 200, login.text
+        refreshed = client.post(
+            "/auth/refresh",
+            headers={"Authorization": f"Bearer {login.json()['refresh_token']}"},
+        )
+        assert refreshed.status_code == 200, refreshed.text
+    finally:
+        group_writer.stop()
+
+    with session_factory() as db:
+        tokens = db.query(RefreshToken).order_by(RefreshToken.id).all()
+        assert [token.revoked for token in tokens] == [True, False]
+    assert group_writer.stats()["writes"] == 2
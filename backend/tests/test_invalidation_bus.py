@@ -0,0 +1,143 @@
+import multiprocessing
+import time
+import uuid
+import pytest
+from datetime import timedelta
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.database.bus import InvalidationBus
+from modules.api import invalidation
+from modules.api.auth.epochs import REVOKED_EPOCH
+from modules.api.auth.functions import create_token
+from modules.api.auth.security import anonymize
+from utils.periodic import PeriodicTask
+from tests.test_auth import create_test_user
+
+POLL_SECONDS = 0.05
+# Délai maximal toléré entre la publication et l'éviction dans l'autre processus
+MAX_DELAY_SECONDS = 1.0
+
+
+# Fixture pour l'application et la base de données de test
+@pytest.fixture
+def client(db_session):
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: db_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
+    return TestClient(app)
+
+
+def collect(bus: InvalidationBus, topics):
+    received = []
+    for topic in topics:
+        bus.subscribe(
+            topic, lambda key, value, topic=topic: received.append((topic, key, value))
+        )
+    return received
+
+
+def test_other_worker_receives_invalidations(tmp_path):
+    publisher = InvalidationBus(tmp_path / "bus.db")
+    subscriber = InvalidationBus(tmp_path / "bus.db")
+    received = collect(subscriber, ["user"])
+    own = collect(publisher, ["user"])
+    subscriber.start()
+    publisher.start()
+
+    publisher.publish("user", 42)
+    assert subscriber.poll() == 1
+    assert received == [("user", "42", None)]
+
+    # Le publieur a déjà appliqué l'invalidation localement
+    assert publisher.poll() == 0
+    assert own == []
+    # Une ligne n'est appliquée qu'une fois
+    assert subscriber.poll() == 0
+
+
+def test_start_skips_history(tmp_path):
+    publisher = InvalidationBus(tmp_path / "bus.db")
+    publisher.publish("user", 1)
+
+    subscriber = InvalidationBus(tmp_path / "bus.db")
+    received = collect(subscriber, ["user"])
+    subscriber.start()
+    assert subscriber.poll() == 0
+    assert received == []
+
+
+def test_prune_removes_old_rows(tmp_path):
+    bus = InvalidationBus(tmp_path / "bus.db", retention=60)
+    bus.publish("user", 1)
+    bus.prune(now=time.time() + 120)
+
+    other = InvalidationBus(tmp_path / "bus.db")
+    received = collect(other, ["user"])
+    assert other.poll() == 0
+    assert received == []
+
+
+def test_routes_publish_invalidations(client, db_session, tmp_path, monkeypatch):
+    bus = InvalidationBus(tmp_path / "bus.db")
+    monkeypatch.setattr(invalidation, "INVALIDATION_BUS_ENABLED", True)
+    monkeypatch.setattr(invalidation, "invalidation_bus", bus)
+    other_worker = InvalidationBus(tmp_path / "bus.db")
+    received = collect(other_worker, ["user", "token_epoch", "email_removed"])
+    other_worker.start()
+
+    email = f"bus_{uuid.uuid4()}@example.com"
+    user_id = create_test_user(db_session, email).id
+    admin_token = create_token(
+        data={"sub": anonymize(email), "role": "admin"},
+        expires_delta=timedelta(minutes=5),
+    )
+    response = client.delete(
+        f"/auth/users/{user_id}", headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+
+    other_worker.poll()
+    assert ("user", str(user_id), None) in received
+    assert ("token_epoch", str(user_id), str(REVOKED_EPOCH)) in received
+    assert ("email_removed", anonymize(email), None) in received
+
+
+def run_subscriber(path, ready, stop, queue):
+    """Worker simulé : relaie l'heure de réception de chaque invalidation."""
+    bus = InvalidationBus(path)
+    bus.subscribe("user", lambda key, value: queue.put((key, time.time())))
+    bus.start()
+    poller = PeriodicTask("invalidation_bus", POLL_SECONDS, bus.poll)
+    poller.start()
+    ready.set()
+    stop.wait(30)
+    poller.stop()
+    bus.close()
+
+
+def test_invalidation_delay_across_processes(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    ready, stop, queue = context.Event(), context.Event(), context.Queue()
+    path = str(tmp_path / "bus.db")
+    worker = context.Process(target=run_subscriber, args=(path, ready, stop, queue))
+    worker.start()
+    try:
+        assert ready.wait(30)
+        publisher = InvalidationBus(path)
+        published_at = {}
+        for user_id in range(20):
+            published_at[str(user_id)] = time.time()
+            publisher.publish("user", user_id)
+            time.sleep(0.01)
+
+        delays = []
+        for _ in published_at:
+            key, received_at = queue.get(timeout=10)
+            delays.append(received_at - published_at[key])
+    finally:
+        stop.set()
+        worker.join(10)
+
+    assert len(delays) == len(published_at)
+    assert max(delays) < MAX_DELAY_SECONDS, f"délais : {sorted(delays)[-3:]}"
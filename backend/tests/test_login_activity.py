@@ -0,0 +1,209 @@
+import uuid
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.database.bus import InvalidationBus
+from modules.database.session import Base
+from modules.api.auth import security
+from modules.api.auth.functions import create_token
+from modules.api.auth.security import anonymize, hash_password
+from modules.api import invalidation
+from modules.api.users import activity
+from modules.api.users.activity import LoginActivityTracker
+from modules.api.users.models import Role, User
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'users.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def SessionLocal(engine):
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        db.add_all([Role(role="admin"), Role(role="reader")])
+        db.commit()
+    return SessionLocal
+
+
+@pytest.fixture
+def tracker(SessionLocal, monkeypatch):
+    tracker = LoginActivityTracker(SessionLocal)
+    monkeypatch.setattr(activity, "login_activity", tracker)
+    return tracker
+
+
+@pytest.fixture
+def client(SessionLocal, monkeypatch):
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+
+    def get_file_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = create_app()
+    app.dependency_overrides[get_users_db] = get_file_db
+    app.dependency_overrides[get_users_read_db] = get_file_db
+    return TestClient(app)
+
+
+def add_user(SessionLocal, role: str = "reader") -> tuple[int, str]:
+    email = f"activity_{uuid.uuid4()}@example.com"
+    with SessionLocal() as db:
+        role_id = db.query(Role.id).filter(Role.role == role).scalar()
+        user = User(
+            email=anonymize(email),
+            name="test",
+            password=hash_password("testpass123"),
+            role_id=role_id,
+        )
+        db.add(user)
+        db.commit()
+        return user.id, email
+
+
+def login(client, email):
+    return client.post("/auth/login", data={"username": email, "password": "testpass123"})
+
+
+def test_logins_are_written_on_flush(client, SessionLocal, tracker):
+    user_id, email = add_user(SessionLocal)
+
+    first = login(client, email)
+    assert login(client, email).status_code == 200
+    refreshed = client.post(
+        "/auth/refresh",
+        headers={"Authorization": f"Bearer {first.json()['refresh_token']}"},
+    )
+    assert refreshed.status_code == 200
+
+    # Rien en base avant le vidage
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        assert user.last_login_at is None and user.login_count == 0
+
+    assert tracker.flush() == 1
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        # Le rafraîchissement met à jour la date sans compter une connexion
+        assert user.login_count == 2
+        assert datetime.utcnow() - user.last_login_at < timedelta(minutes=1)
+    assert tracker.stats()["pending_users"] == 0
+
+
+def test_flush_issues_a_single_update(engine, SessionLocal, tracker):
+    user_ids = [add_user(SessionLocal)[0] for _ in range(5)]
+    for user_id in user_ids:
+        tracker.record(user_id)
+        tracker.record(user_id)
+
+    updates = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if statement.startswith("UPDATE"):
+            updates.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    assert tracker.flush() == 5
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert len(updates) == 1
+    with SessionLocal() as db:
+        counts = db.query(User.login_count).filter(User.id.in_(user_ids)).all()
+    assert [count for (count,) in counts] == [2] * 5
+    assert tracker.flush() == 0
+
+
+def test_counts_accumulate_across_flushes(SessionLocal, tracker):
+    user_id, _ = add_user(SessionLocal)
+    earlier = datetime.utcnow() - timedelta(hours=1)
+
+    tracker.record(user_id, at=earlier)
+    tracker.flush()
+    tracker.record(user_id)
+    tracker.record(user_id, login=False, at=earlier)
+    tracker.flush()
+
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        assert user.login_count == 2
+        assert user.last_login_at > earlier
+
+
+def test_flush_publishes_user_invalidations(SessionLocal, tracker, tmp_path, monkeypatch):
+    monkeypatch.setattr(invalidation, "INVALIDATION_BUS_ENABLED", True)
+    monkeypatch.setattr(
+        invalidation, "invalidation_bus", InvalidationBus(tmp_path / "bus.db")
+    )
+    other_worker = InvalidationBus(tmp_path / "bus.db")
+    received = []
+    other_worker.subscribe("user", lambda key, value: received.append(int(key)))
+    other_worker.start()
+
+    user_ids = [add_user(SessionLocal)[0] for _ in range(3)]
+    for user_id in user_ids:
+        tracker.record(user_id)
+    assert tracker.flush() == 3
+
+    # Les autres workers oublient les profils en cache et l'ETag de la liste
+    assert other_worker.poll() == 3
+    assert sorted(received) == sorted(user_ids)
+
+
+def test_failed_flush_keeps_activity(SessionLocal):
+    calls = []
+
+    def flaky_factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OperationalError("UPDATE", {}, Exception("database is locked"))
+        return SessionLocal()
+
+    tracker = LoginActivityTracker(flaky_factory)
+    user_id, _ = add_user(SessionLocal)
+    tracker.record(user_id)
+
+    assert tracker.flush() == 0
+    tracker.record(user_id)
+    assert tracker.stats()["failures"] == 1
+    assert tracker.flush() == 1
+    with SessionLocal() as db:
+        assert db.get(User, user_id).login_count == 2
+
+
+def test_listing_exposes_last_login(client, SessionLocal, tracker):
+    admin_id, admin_email = add_user(SessionLocal, role="admin")
+    token = create_token(
+        data={"sub": anonymize(admin_email), "role": "admin"},
+        expires_delta=timedelta(minutes=5),
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    before = client.get("/auth/users/", headers=headers)
+    assert before.json()[0]["last_login_at"] is None
+
+    assert login(client, admin_email).status_code == 200
+    tracker.flush()
+
+    # Le vidage change l'ETag de la liste
+    after = client.get(
+        "/auth/users/", headers={**headers, "If-None-Match": before.headers["ETag"]}
+    )
+    assert after.status_code == 200
+    assert after.json()[0]["login_count"] == 1
+    assert after.json()[0]["last_login_at"] is not None
+    detail = client.get(f"/users/users/{admin_id}")
+    assert detail.json()["login_count"] == 1
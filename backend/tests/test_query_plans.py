@@ -0,0 +1,193 @@
+import re
+import uuid
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.database.session import Base
+from modules.api.users.models import User, Role, RefreshToken
+from modules.api.users.functions import get_user_by_email
+from modules.api.auth.functions import create_token, find_refresh_token
+from modules.api.auth.security import anonymize, hash_password, hash_token
+
+# Nombre de lignes insérées : assez pour qu'un SCAN soit coûteux en production
+SEEDED_USERS = 500
+TOKENS_PER_USER = 3
+
+# Un SCAN n'est acceptable que s'il parcourt un index (ex: COUNT(*))
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?! USING (COVERING )?INDEX)")
+
+
+@pytest.fixture(scope="module")
+def plan_engine():
+    """Base SQLite en mémoire peuplée, propre à ce module."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+
+    db = sessionmaker(bind=engine)()
+    admin_role = Role(role="admin")
+    reader_role = Role(role="reader")
+    db.add_all([admin_role, reader_role])
+    db.flush()
+
+    # Un seul hash bcrypt partagé : seul le plan d'exécution nous intéresse
+    password = hash_password("testpass123")
+    expires_at = datetime.now(timezone.utc) + timedelta(days=7)
+    for i in range(SEEDED_USERS):
+        user = User(
+            email=anonymize(f"seed_{i}@example.com"),
+            name=f"seed_{i}",
+            password=password,
+            role_id=admin_role.id if i == 0 else reader_role.id,
+            is_active=True,
+        )
+        user.refresh_tokens = [
+            RefreshToken(token=hash_token(f"seed_{i}_{j}"), expires_at=expires_at)
+            for j in range(TOKENS_PER_USER)
+        ]
+        db.add(user)
+    db.commit()
+    db.close()
+
+    # Statistiques à jour pour que le planificateur décide comme en production
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def plan_session(plan_engine):
+    db = sessionmaker(bind=plan_engine)()
+    try:
+        yield db
+    finally:
+        db.rollback()
+        db.close()
+
+
+@pytest.fixture
+def plan_client(plan_session):
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: plan_session
+    app.dependency_overrides[get_users_read_db] = lambda: plan_session
+    return TestClient(app)
+
+
+@pytest.fixture
+def admin_headers():
+    token = create_token(
+        data={"sub": anonymize("seed_0@example.com"), "role": "admin"},
+        expires_delta=timedelta(minutes=5),
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@contextmanager
+def captured_queries(engine):
+    """Enregistre les requêtes de lecture/écriture ciblée émises sur le moteur."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if (
+            statement.lstrip()
+            .upper()
+            .startswith(("SELECT", "INSERT", "UPDATE", "DELETE"))
+        ):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def explain(engine, statement, parameters):
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        ).fetchall()
+    return [row[3] for row in rows]
+
+
+def assert_indexed(engine, statements, expected_table):
+    """Vérifie qu'aucune requête capturée ne parcourt une table entière."""
+    assert statements, "Aucune requête capturée"
+
+    searched_tables = set()
+    for statement, parameters in statements:
+        plan = explain(engine, statement, parameters)
+        printable_plan = "\n".join(f"  {detail}" for detail in plan)
+        for detail in plan:
+            match = FULL_SCAN.match(detail)
+            assert match is None, (
+                f"Parcours complet de '{match.group(1)}' détecté.\n"
+                f"Requête :\n  {statement}\nPlan :\n{printable_plan}"
+            )
+            if detail.startswith("SEARCH "):
+                searched_tables.add(detail.split()[1])
+
+    assert expected_table in searched_tables, (
+        f"Aucune recherche indexée sur '{expected_table}' "
+        f"(tables recherchées : {sorted(searched_tables)})"
+    )
+
+
+def test_get_user_by_email_uses_index(plan_engine, plan_session):
+    with captured_queries(plan_engine) as statements:
+        user = get_user_by_email(anonymize("seed_42@example.com"), plan_session)
+        assert user is not None
+        assert user.role.role == "reader"
+
+    assert_indexed(plan_engine, statements, "users")
+
+
+def test_find_refresh_token_uses_index(plan_engine, plan_session):
+    with captured_queries(plan_engine) as statements:
+        refresh_token = find_refresh_token(plan_session, hash_token("seed_42_1"))
+        assert refresh_token is not None
+
+    assert_indexed(plan_engine, statements, "refresh_tokens")
+
+
+def test_role_lookup_uses_index(plan_engine, plan_client):
+    email = f"plan_{uuid.uuid4()}@example.com"
+    with captured_queries(plan_engine) as statements:
+        response = plan_client.post(
+            "/auth/users/",
+            json={"email": email, "name": "plan", "password": "testpass123"},
+        )
+        assert response.status_code == 200, response.text
+
+    assert_indexed(plan_engine, statements, "roles")
+
+
+def test_update_user_role_uses_index(plan_engine, plan_client, admin_headers):
+    with captured_queries(plan_engine) as statements:
+        response = plan_client.patch(
+            "/auth/users/7/role", json={"role": "admin"}, headers=admin_headers
+        )
+        assert response.status_code == 200, response.text
+
+    assert_indexed(plan_engine, statements, "users")
+    assert_indexed(plan_engine, statements, "roles")
+
+
+def test_delete_user_uses_index(plan_engine, plan_client, admin_headers):
+    with captured_queries(plan_engine) as statements:
+        response = plan_client.delete("/auth/users/9", headers=admin_headers)
+        assert response.status_code == 200, response.text
+
+    assert_indexed(plan_engine, statements, "users")
+    assert_indexed(plan_engine, statements, "refresh_tokens")
@@ -0,0 +1,65 @@
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.database.session import create_read_session, create_session
+from modules.api.auth.functions import create_token
+from modules.api.auth.security import anonymize
+from tests.test_auth import create_test_user
+
+
+@pytest.fixture
+def engines(tmp_path):
+    path = tmp_path / "users.db"
+    write_engine, WriteSession = create_session(f"sqlite:///{path}")
+    read_engine, ReadSession = create_read_session(
+        f"sqlite:///file:{path}?mode=ro&uri=true"
+    )
+    with write_engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+    yield WriteSession, ReadSession
+    read_engine.dispose()
+    write_engine.dispose()
+
+
+def test_read_sessions_cannot_write(engines):
+    _, ReadSession = engines
+    with ReadSession() as db:
+        assert db.execute(text("SELECT COUNT(*) FROM items")).scalar() == 0
+        with pytest.raises(OperationalError, match="readonly"):
+            db.execute(text("INSERT INTO items DEFAULT VALUES"))
+
+
+def test_readers_see_committed_writes_in_wal_mode(engines):
+    WriteSession, ReadSession = engines
+    with WriteSession() as writer, ReadSession() as reader:
+        assert writer.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        # Un lecteur ouvert pendant une transaction d'écriture n'est pas bloqué
+        writer.execute(text("INSERT INTO items DEFAULT VALUES"))
+        assert reader.execute(text("SELECT COUNT(*) FROM items")).scalar() == 0
+        writer.commit()
+        reader.rollback()
+        assert reader.execute(text("SELECT COUNT(*) FROM items")).scalar() == 1
+
+
+def test_read_routes_use_read_sessions(db_session):
+    def no_write_session():
+        raise AssertionError("Route en lecture : pas de session d'écriture")
+
+    app = create_app()
+    app.dependency_overrides[get_users_db] = no_write_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
+    client = TestClient(app)
+
+    email = f"read_{uuid.uuid4()}@example.com"
+    user = create_test_user(db_session, email)
+    token = create_token(data={"sub": anonymize(email), "role": "reader"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/auth/users/me", headers=headers).status_code == 200
+    assert client.get(f"/users/users/{user.id}").status_code == 200
+    response = client.post("/users/users/batch", json={"ids": [user.id]})
+    assert response.status_code == 200
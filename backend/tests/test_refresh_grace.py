@@ -0,0 +1,109 @@
+import uuid
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.database.session import Base
+from modules.api.auth import rotation, security
+from modules.api.auth.rotation import RefreshRotationCache
+from modules.api.auth.security import anonymize, hash_password
+from modules.api.users.models import RefreshToken, Role, User
+
+PARALLEL_REFRESHES = 8
+
+
+@pytest.fixture
+def file_client(tmp_path, monkeypatch):
+    """Client sur une vraie base fichier : une session (connexion) par requête."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'users.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+
+    email = f"grace_{uuid.uuid4()}@example.com"
+    with SessionLocal() as db:
+        reader = Role(role="reader")
+        db.add(reader)
+        db.flush()
+        db.add(
+            User(
+                email=anonymize(email),
+                name="test",
+                password=hash_password("testpass123"),
+                role_id=reader.id,
+                is_active=True,
+            )
+        )
+        db.commit()
+
+    def get_file_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = create_app()
+    app.dependency_overrides[get_users_db] = get_file_db
+    app.dependency_overrides[get_users_read_db] = get_file_db
+    client = TestClient(app)
+    login = client.post(
+        "/auth/login", data={"username": email, "password": "testpass123"}
+    )
+    assert login.status_code == 200, login.text
+    yield client, SessionLocal, login.json()["refresh_token"]
+    engine.dispose()
+
+
+def refresh(client, refresh_token):
+    return client.post(
+        "/auth/refresh", headers={"Authorization": f"Bearer {refresh_token}"}
+    )
+
+
+def test_reuse_within_grace_window_returns_same_pair(file_client):
+    client, SessionLocal, refresh_token = file_client
+
+    first = refresh(client, refresh_token)
+    second = refresh(client, refresh_token)
+
+    assert first.status_code == 200, first.text
+    assert second.status_code == 200, second.text
+    assert second.json() == first.json()
+    with SessionLocal() as db:
+        assert db.query(RefreshToken).filter(RefreshToken.revoked.is_(False)).count() == 1
+
+    # Le successeur se renouvelle normalement
+    assert refresh(client, first.json()["refresh_token"]).status_code == 200
+
+
+def test_reuse_outside_grace_window_is_rejected(file_client, monkeypatch):
+    client, _, refresh_token = file_client
+    monkeypatch.setattr(
+        rotation, "refresh_rotation", RefreshRotationCache(100, grace_seconds=0)
+    )
+
+    assert refresh(client, refresh_token).status_code == 200
+    response = refresh(client, refresh_token)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Refresh token révoqué"
+
+
+def test_parallel_refreshes_share_one_rotation(file_client):
+    client, SessionLocal, refresh_token = file_client
+
+    with ThreadPoolExecutor(max_workers=PARALLEL_REFRESHES) as pool:
+        responses = list(
+            pool.map(lambda _: refresh(client, refresh_token), range(PARALLEL_REFRESHES))
+        )
+
+    assert [response.status_code for response in responses] == [200] * PARALLEL_REFRESHES
+    assert len({response.json()["refresh_token"] for response in responses}) == 1
+    with SessionLocal() as db:
+        # Le token de login (révoqué) et son unique successeur
+        assert db.query(RefreshToken).count() == 2
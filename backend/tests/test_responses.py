@@ -0,0 +1,101 @@
+import json
+import uuid
+import pytest
+from datetime import timedelta
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from fastapi.testclient import TestClient
+from modules.api import responses
+from modules.api.main import create_app
+from modules.api.responses import FastJSONResponse, ModelResponse, dumps
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.database.session import Base
+from modules.api.auth.functions import create_token
+from modules.api.auth.security import anonymize
+from modules.api.users.schemas import UserResponse, user_list_adapter
+from tests.test_auth import create_test_user
+from tests.test_routes import create_roles_if_not_exists
+
+
+@pytest.fixture
+def engine():
+    """Base isolée : la liste complète des utilisateurs est comparée."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def client(session):
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: session
+    app.dependency_overrides[get_users_read_db] = lambda: session
+    return TestClient(app)
+
+
+@pytest.fixture
+def admin_headers(session):
+    create_roles_if_not_exists(session)
+    email = f"json_{uuid.uuid4()}@example.com"
+    create_test_user(session, email)
+    token = create_token(
+        data={"sub": anonymize(email), "role": "admin"},
+        expires_delta=timedelta(minutes=5),
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_stdlib_fallback_matches_orjson(monkeypatch):
+    content = {"message": "Rôle mis à jour", "ids": [1, 2], "ok": True, "none": None}
+    fast = dumps(content)
+
+    monkeypatch.setattr(responses, "orjson", None)
+    assert dumps(content) == fast
+    assert json.loads(FastJSONResponse(content).body) == content
+
+
+def test_user_response_from_orm_object(session):
+    create_roles_if_not_exists(session)
+    user = create_test_user(session, f"orm_{uuid.uuid4()}@example.com")
+
+    response = UserResponse.model_validate(user)
+    assert response.role == "reader"
+    assert json.loads(ModelResponse(response).body)["id"] == user.id
+
+
+def test_users_listing_single_query(client, admin_headers, session, engine):
+    for _ in range(3):
+        create_test_user(session, f"list_{uuid.uuid4()}@example.com")
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    response = client.get("/auth/users/", headers=admin_headers)
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert "ETag" in response.headers
+    users = response.json()
+    assert len(users) == 4
+    assert [user["id"] for user in users] == sorted(user["id"] for user in users)
+    assert {user["role"] for user in users} == {"reader"}
+    # Rôles joints : une requête pour la liste, pas une par utilisateur
+    assert not any(
+        statement.lstrip().startswith("SELECT roles") for statement in executed
+    )
+    assert sum("JOIN roles" in statement for statement in executed) == 1
+    assert user_list_adapter.validate_json(response.content)[0].email == users[0]["email"]
@@ -0,0 +1,109 @@
+import uuid
+import pytest
+from datetime import timedelta
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import event
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.api.auth import functions
+from modules.api.auth.functions import create_token
+from modules.api.auth.security import anonymize
+from tests.test_auth import create_test_user
+
+
+# Fixture pour l'application et la base de données de test
+@pytest.fixture
+def client(db_session, monkeypatch):
+    monkeypatch.setattr(functions, "RICH_ACCESS_TOKENS", True)
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: db_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
+    return TestClient(app)
+
+
+@pytest.fixture
+def count_queries(test_engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(test_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def login(client, email):
+    response = client.post(
+        "/auth/login", data={"username": email, "password": "testpass123"}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_users_me_served_from_claims(client, db_session, count_queries):
+    email = f"rich_{uuid.uuid4()}@example.com"
+    user = create_test_user(db_session, email)
+    user_id = user.id
+    access_token = login(client, email)["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    # Première requête : l'époque est lue en base puis gardée en mémoire
+    assert client.get("/auth/users/me", headers=headers).status_code == 200
+
+    count_queries.clear()
+    response = client.get("/auth/users/me", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": user_id,
+        "name": "test",
+        "email": anonymize(email),
+        "is_active": True,
+        "role": "reader",
+        # L'activité n'est pas dans les claims
+        "last_login_at": None,
+        "login_count": None,
+    }
+    assert count_queries == []
+
+
+def test_role_change_invalidates_rich_token(client, db_session):
+    email = f"rich_{uuid.uuid4()}@example.com"
+    user = create_test_user(db_session, email)
+    tokens = login(client, email)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    admin_token = create_token(
+        data={"sub": anonymize(email), "role": "admin"},
+        expires_delta=timedelta(minutes=5),
+    )
+    response = client.patch(
+        f"/auth/users/{user.id}/role",
+        json={"role": "reader"},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 200
+
+    assert client.get("/auth/users/me", headers=headers).status_code == 401
+
+    # Une nouvelle connexion émet des tokens à l'époque courante
+    new_headers = {"Authorization": f"Bearer {login(client, email)['access_token']}"}
+    response = client.get("/auth/users/me", headers=new_headers)
+    assert response.status_code == 200
+    assert response.json()["role"] == "reader"
+
+
+def test_plain_tokens_still_use_database(client, db_session, monkeypatch):
+    monkeypatch.setattr(functions, "RICH_ACCESS_TOKENS", False)
+    email = f"plain_{uuid.uuid4()}@example.com"
+    create_test_user(db_session, email)
+    access_token = login(client, email)["access_token"]
+
+    payload = jwt.get_unverified_claims(access_token)
+    assert "name" not in payload
+    response = client.get(
+        "/auth/users/me", headers={"Authorization": f"Bearer {access_token}"}
+    )
+    assert response.status_code == 200
+    assert response.json()["email"] == anonymize(email)
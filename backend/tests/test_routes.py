@@ -1,7 +1,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from modules.api.main import create_app
-from modules.database.dependencies import get_users_db
+from modules.database.dependencies import get_users_db, get_users_read_db
 from modules.api.auth.security import hash_password, anonymize
 from modules.api.users.models import User, Role
 import uuid
@@ -18,6 +18,7 @@ def client(db_session):
     # Création de l'application FastAPI avec une DB de test
     app = create_app()
     app.dependency_overrides[get_users_db] = lambda: db_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
 
     # Création d’un client de test
     client = TestClient(app)
@@ -157,3 +158,28 @@ def test_refresh_token_invalid(client):
     """Test de refresh token invalide"""
     response = client.post("/auth/refresh", headers={"Authorization": "Bearer faketoken"})
     assert response.status_code == 401
+
+
+def test_refresh_after_login(client, db_session):
+    """Le refresh token émis au login permet d'obtenir un access token utilisable"""
+    create_roles_if_not_exists(db_session)
+    email = f"test_{uuid.uuid4()}@example.com"
+    create_test_user(db_session, email)
+
+    login = client.post(
+        "/auth/login", data={"username": email, "password": "testpass123"}
+    )
+    assert login.status_code == 200
+
+    refreshed = client.post(
+        "/auth/refresh",
+        headers={"Authorization": f"Bearer {login.json()['refresh_token']}"},
+    )
+    assert refreshed.status_code == 200, refreshed.text
+
+    me = client.get(
+        "/auth/users/me",
+        headers={"Authorization": f"Bearer {refreshed.json()['access_token']}"},
+    )
+    assert me.status_code == 200, me.text
+    assert me.json()["role"] == "reader"
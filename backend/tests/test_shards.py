@@ -0,0 +1,229 @@
+import uuid
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import sessionmaker
+from modules.api.main import create_app
+from modules.database import session as session_module
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.database.session import create_session
+from modules.database.shards import (
+    SHARD_ID_SPAN,
+    ShardRouter,
+    create_sharded_sessionmaker,
+    shard_index_for_email,
+    shard_index_for_id,
+)
+from modules.api.auth import security
+from modules.api.auth.functions import create_token
+from modules.api.auth.security import anonymize, hash_password
+from modules.api.users.create_db import (
+    create_missing_indexes,
+    init_user_shards,
+    replicate_roles,
+)
+from modules.api.users.models import RefreshToken, Role, User
+from modules.api.users.rebalance import rebalance
+from modules.database.session import Base
+
+SHARDS = 3
+
+
+def make_engines(tmp_path, count):
+    return [
+        create_session(f"sqlite:///{tmp_path / f'shard{i}.db'}")[0] for i in range(count)
+    ]
+
+
+def init_shards(engines):
+    Base.metadata.create_all(bind=engines[0])
+    with sessionmaker(bind=engines[0])() as db:
+        db.add_all([Role(role="admin"), Role(role="reader")])
+        db.commit()
+    init_user_shards(engines)
+    replicate_roles(engines)
+
+
+@pytest.fixture
+def engines(tmp_path):
+    engines = make_engines(tmp_path, SHARDS)
+    init_shards(engines)
+    yield engines
+    for engine in engines:
+        engine.dispose()
+
+
+def count_statements(engines):
+    counts = [0] * len(engines)
+    for index, engine in enumerate(engines):
+
+        def before_cursor_execute(*args, index=index):
+            counts[index] += 1
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    return counts
+
+
+def add_user(db, email, role_id=2):
+    user = User(
+        email=anonymize(email),
+        name="test",
+        password=hash_password("testpass123"),
+        role_id=role_id,
+        is_active=True,
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_router_maps_ids_and_emails():
+    router = ShardRouter(SHARDS)
+    assert shard_index_for_id(5) == 0
+    assert shard_index_for_id(2 * SHARD_ID_SPAN + 7) == 2
+    assert router.for_ids([SHARD_ID_SPAN + 1, 3]) == ["0", "1"]
+    # Id d'un shard inexistant : recherche exhaustive
+    assert router.for_ids([10 * SHARD_ID_SPAN]) == ["0", "1", "2"]
+
+    emails = [anonymize(f"user_{i}@example.com") for i in range(300)]
+    per_shard = [0] * SHARDS
+    for email in emails:
+        per_shard[shard_index_for_email(email, SHARDS)] += 1
+    assert min(per_shard) > 60
+
+
+def test_users_land_on_their_shard(engines, monkeypatch):
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+    ShardedSession = create_sharded_sessionmaker(engines)
+    emails = [f"shard_{i}@example.com" for i in range(12)]
+
+    with ShardedSession() as db:
+        users = [add_user(db, email) for email in emails]
+        for user, email in zip(users, emails):
+            expected = shard_index_for_email(anonymize(email), SHARDS)
+            assert shard_index_for_id(user.id) == expected
+            # Rôle lu sur le shard de l'utilisateur (rôles répliqués)
+            assert user.role.role == "reader"
+
+    counts = count_statements(engines)
+    with ShardedSession() as db:
+        email = anonymize(emails[0])
+        assert db.query(User).filter(User.email == email).one().email == email
+        # Recherche par email : un seul shard interrogé
+        assert sum(1 for count in counts if count) == 1
+
+        user_id = users[1].id
+        assert db.get(User, user_id).id == user_id
+
+        listing = db.query(User).order_by(User.id).all()
+        assert len(listing) == len(emails)
+        assert [user.id for user in listing] == sorted(user.id for user in listing)
+
+
+def test_api_on_sharded_storage(engines, monkeypatch):
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+    ShardedSession = create_sharded_sessionmaker(engines)
+    monkeypatch.setattr(session_module, "users_router", ShardRouter(SHARDS))
+
+    def get_sharded_db():
+        db = ShardedSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = create_app()
+    app.dependency_overrides[get_users_db] = get_sharded_db
+    app.dependency_overrides[get_users_read_db] = get_sharded_db
+    client = TestClient(app)
+
+    emails = [f"api_{uuid.uuid4()}@example.com" for _ in range(6)]
+    for email in emails:
+        response = client.post(
+            "/auth/users/",
+            json={"email": email, "name": "test", "password": "testpass123"},
+        )
+        assert response.status_code == 200, response.text
+        expected = shard_index_for_email(anonymize(email), SHARDS)
+        assert shard_index_for_id(response.json()["id"]) == expected
+
+    duplicate = client.post(
+        "/auth/users/", json={"email": emails[0], "name": "x", "password": "testpass123"}
+    )
+    assert duplicate.status_code == 400
+
+    login = client.post(
+        "/auth/login", data={"username": emails[0], "password": "testpass123"}
+    )
+    assert login.status_code == 200, login.text
+    refreshed = client.post(
+        "/auth/refresh",
+        headers={"Authorization": f"Bearer {login.json()['refresh_token']}"},
+    )
+    assert refreshed.status_code == 200, refreshed.text
+    me = client.get(
+        "/auth/users/me",
+        headers={"Authorization": f"Bearer {refreshed.json()['access_token']}"},
+    )
+    assert me.status_code == 200
+    assert me.json()["email"] == anonymize(emails[0])
+
+    admin_token = create_token(data={"sub": anonymize(emails[0]), "role": "admin"})
+    listing = client.get(
+        "/auth/users", headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert listing.status_code == 200
+    assert len(listing.json()) == len(emails)
+
+
+def test_missing_indexes_are_created_on_every_shard(engines):
+    # Shards créés avant l'index sur refresh_tokens.user_id
+    for engine in engines:
+        with engine.begin() as connection:
+            connection.execute(text("DROP INDEX ix_refresh_tokens_user_id"))
+
+    create_missing_indexes(engines)
+
+    for engine in engines:
+        indexes = {
+            index["name"] for index in inspect(engine).get_indexes("refresh_tokens")
+        }
+        assert "ix_refresh_tokens_user_id" in indexes
+
+
+def test_rebalance_moves_users_and_tokens(tmp_path, monkeypatch):
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+    engines = make_engines(tmp_path, SHARDS)
+    init_shards(engines[:1])
+    emails = [anonymize(f"rebalance_{i}@example.com") for i in range(20)]
+
+    # Tous les utilisateurs sur un seul shard, avec un refresh token chacun
+    with sessionmaker(bind=engines[0])() as db:
+        for email in emails:
+            user = User(email=email, name="test", password="x", role_id=2)
+            db.add(user)
+            db.flush()
+            db.add(
+                RefreshToken(
+                    token=f"token-{email}", user_id=user.id, expires_at=datetime.utcnow()
+                )
+            )
+        db.commit()
+
+    report = rebalance(engines, SHARDS)
+    assert report["moved"] > 0
+    assert sum(report["users"]) == len(emails)
+
+    ShardedSession = create_sharded_sessionmaker(engines)
+    with ShardedSession() as db:
+        for email in emails:
+            user = db.query(User).filter(User.email == email).one()
+            assert shard_index_for_id(user.id) == shard_index_for_email(email, SHARDS)
+            assert [token.token for token in user.refresh_tokens] == [f"token-{email}"]
+            assert user.role.role == "reader"
+
+    # Relance : plus rien à déplacer
+    assert rebalance(engines, SHARDS)["moved"] == 0
+    for engine in engines:
+        engine.dispose()
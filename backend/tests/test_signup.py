@@ -0,0 +1,88 @@
+import uuid
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.database.session import Base
+from modules.api.auth import admission, security
+from modules.api.auth.admission import AdmissionLimiter
+from modules.api.users.models import User, Role
+
+PARALLEL_SIGNUPS = 8
+
+
+@pytest.fixture
+def file_client(tmp_path, monkeypatch):
+    """Client sur une vraie base fichier : une session (connexion) par requête."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'users.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        db.add_all([Role(role="admin"), Role(role="reader")])
+        db.commit()
+
+    def get_file_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    # bcrypt rapide et limiteur assez large pour laisser passer toutes les requêtes
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+    monkeypatch.setattr(
+        admission,
+        "bcrypt_limiter",
+        AdmissionLimiter(PARALLEL_SIGNUPS, PARALLEL_SIGNUPS, queue_timeout=10.0),
+    )
+
+    app = create_app()
+    app.dependency_overrides[get_users_db] = get_file_db
+    app.dependency_overrides[get_users_read_db] = get_file_db
+    yield TestClient(app), SessionLocal
+    engine.dispose()
+
+
+def signup(client, email):
+    return client.post(
+        "/auth/users/", json={"email": email, "name": "test", "password": "testpass123"}
+    )
+
+
+def test_signup_returns_reader_profile(file_client):
+    client, _ = file_client
+    response = signup(client, f"test_{uuid.uuid4()}@example.com")
+
+    assert response.status_code == 200, response.text
+    assert response.json()["role"] == "reader"
+    assert response.json()["is_active"] is True
+
+
+def test_duplicate_signup_is_rejected(file_client):
+    client, _ = file_client
+    email = f"test_{uuid.uuid4()}@example.com"
+
+    assert signup(client, email).status_code == 200
+    response = signup(client, email)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Un utilisateur avec cet email existe déjà"
+
+
+def test_parallel_duplicate_signups(file_client):
+    client, SessionLocal = file_client
+    email = f"test_{uuid.uuid4()}@example.com"
+
+    with ThreadPoolExecutor(max_workers=PARALLEL_SIGNUPS) as pool:
+        responses = list(
+            pool.map(lambda _: signup(client, email), range(PARALLEL_SIGNUPS))
+        )
+
+    status_codes = sorted(response.status_code for response in responses)
+    assert status_codes == [200] + [400] * (PARALLEL_SIGNUPS - 1)
+    with SessionLocal() as db:
+        assert db.query(User).count() == 1
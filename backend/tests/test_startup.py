@@ -0,0 +1,160 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from fastapi.testclient import TestClient
+from modules.api import main, startup
+from modules.api.audit import functions as audit_functions
+from modules.api.auth import functions as auth_functions, security
+from modules.api.main import create_app
+from modules.api.startup import StartupMetrics, initialize_database, warmup
+from modules.api.users import create_db
+from modules.database.session import Base, create_read_session, create_session
+from utils.file_lock import file_lock
+from utils.logger_config import configure_logger
+
+WORKERS = 4
+
+
+def test_configure_logger_installs_sinks_once():
+    logger = configure_logger()
+    handlers = dict(logger._core.handlers)
+
+    assert configure_logger() is logger
+    assert logger._core.handlers == handlers
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    events = []
+
+    def hold(name):
+        with file_lock(tmp_path / "test.lock"):
+            events.append(("start", name))
+            time.sleep(0.02)
+            events.append(("end", name))
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        list(pool.map(hold, range(WORKERS)))
+
+    # Jamais deux détenteurs à la fois : chaque début est suivi de sa fin
+    for start, end in zip(events[::2], events[1::2]):
+        assert start[0] == "start" and end == ("end", start[1])
+
+
+def test_database_initialized_once_across_workers(tmp_path, monkeypatch):
+    marker = tmp_path / "users.db"
+    created, active, overlaps = [], [0], []
+    counter_lock = threading.Lock()
+
+    def fake_init_users_db():
+        with counter_lock:
+            active[0] += 1
+            overlaps.append(active[0] > 1)
+        if not marker.exists():
+            time.sleep(0.05)
+            marker.touch()
+            created.append(threading.get_ident())
+        with counter_lock:
+            active[0] -= 1
+
+    monkeypatch.setattr(create_db, "init_users_db", fake_init_users_db)
+    monkeypatch.setattr(audit_functions, "init_audit_db", lambda: None)
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        list(
+            pool.map(
+                lambda _: initialize_database(tmp_path / "init.lock"), range(WORKERS)
+            )
+        )
+
+    assert len(created) == 1
+    assert not any(overlaps)
+
+
+def test_bcrypt_calibrated_once_across_workers(tmp_path, monkeypatch):
+    calibrations, applied = [], []
+
+    def fake_calibrate(target_ms):
+        calibrations.append(target_ms)
+        time.sleep(0.05)
+        return 11
+
+    monkeypatch.setattr(create_db, "init_users_db", lambda: None)
+    monkeypatch.setattr(audit_functions, "init_audit_db", lambda: None)
+    monkeypatch.setattr(security, "calibrate_bcrypt_rounds", fake_calibrate)
+    monkeypatch.setattr(security, "set_bcrypt_rounds", applied.append)
+    monkeypatch.setattr(
+        startup, "settings", replace(startup.settings, bcrypt_target_ms=250.0)
+    )
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        list(
+            pool.map(
+                lambda _: initialize_database(tmp_path / "init.lock"), range(WORKERS)
+            )
+        )
+
+    # Un seul calibrage ; les autres workers relisent le coût enregistré
+    assert calibrations == [250.0]
+    assert applied == [11] * WORKERS
+    assert (tmp_path / "bcrypt_rounds.json").exists()
+
+    # Nouvelle latence cible : le coût enregistré n'est plus valable
+    monkeypatch.setattr(
+        startup, "settings", replace(startup.settings, bcrypt_target_ms=500.0)
+    )
+    initialize_database(tmp_path / "init.lock")
+    assert calibrations == [250.0, 500.0]
+
+
+def test_warmup_fills_pools(tmp_path):
+    url = f"sqlite:///{tmp_path / 'users.db'}"
+    engine, _ = create_session(url, pool_size=3)
+    Base.metadata.create_all(bind=engine)
+    read_engine, _ = create_read_session(
+        f"sqlite:///file:{tmp_path / 'users.db'}?mode=ro&uri=true", pool_size=2
+    )
+
+    assert warmup([engine, read_engine]) == 5
+    assert engine.pool.checkedin() == 3
+    assert read_engine.pool.checkedin() == 2
+    engine.dispose()
+    read_engine.dispose()
+
+
+def test_startup_metrics_phases():
+    clock = iter([0.0, 1.0, 1.25, 2.0]).__next__
+    metrics = StartupMetrics(clock=clock)
+
+    with metrics.phase("caches"):
+        pass
+    assert metrics.stats()["ready"] is False
+    assert metrics.mark_ready() == 2000.0
+    assert metrics.stats() == {
+        "ready": True,
+        "import_to_ready_ms": 2000.0,
+        "phases_ms": {"caches": 250.0},
+    }
+
+
+def test_lifespan_marks_app_ready(monkeypatch):
+    metrics = StartupMetrics()
+    monkeypatch.setattr(startup, "startup_metrics", metrics)
+    # Ni initialisation ni préchauffage de la vraie base db/ pendant les tests
+    monkeypatch.setattr(
+        main,
+        "settings",
+        replace(
+            main.settings,
+            run_env="test",
+            warmup_enabled=False,
+            email_filter_enabled=False,
+        ),
+    )
+    monkeypatch.setattr(auth_functions, "load_token_epochs", lambda: None)
+
+    with TestClient(create_app()) as client:
+        assert client.get("/hello").status_code == 200
+        assert metrics.stats()["ready"] is True
+        assert "caches" in metrics.stats()["phases_ms"]
+        assert "database" not in metrics.stats()["phases_ms"]
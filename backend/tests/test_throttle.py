@@ -0,0 +1,174 @@
+import ipaddress
+import uuid
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.api.auth import routes, throttle
+from modules.api.auth.throttle import LoginThrottle
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_throttle(clock, **overrides):
+    settings = dict(
+        max_attempts=3,
+        window=60,
+        free_failures=1,
+        backoff_base=2,
+        backoff_max=30,
+        max_entries=100,
+    )
+    settings.update(overrides)
+    return LoginThrottle(clock=clock, **settings)
+
+
+# Fixture pour l'application et la base de données de test
+@pytest.fixture
+def client(db_session):
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: db_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
+    return TestClient(app)
+
+
+def test_sliding_window_limits_attempts():
+    clock = FakeClock()
+    limiter = make_throttle(clock)
+
+    for _ in range(3):
+        assert limiter.check(["ip:a"]) == 0
+    assert limiter.check(["ip:a"]) == 60
+
+    clock.now += 61
+    assert limiter.check(["ip:a"]) == 0
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_failures_trigger_exponential_backoff():
+    clock = FakeClock()
+    limiter = make_throttle(clock, max_attempts=100)
+
+    limiter.record_failure(["email:x"])
+    assert limiter.check(["email:x"]) == 0
+
+    limiter.record_failure(["email:x"])
+    assert limiter.check(["email:x"]) == 2
+    limiter.record_failure(["email:x"])
+    assert limiter.check(["email:x"]) == 4
+
+    # Le succès remet le compteur d'échecs à zéro
+    limiter.record_success(["email:x"])
+    assert limiter.check(["email:x"]) == 0
+
+
+def test_state_is_bounded_by_lru_eviction():
+    limiter = make_throttle(FakeClock(), max_entries=2)
+
+    for key in ("ip:a", "ip:b", "ip:c"):
+        limiter.check([key])
+
+    stats = limiter.stats()
+    assert stats["tracked_keys"] == 2
+    assert stats["evicted"] == 1
+
+
+def test_throttled_login_skips_database_and_bcrypt(client, monkeypatch):
+    monkeypatch.setattr(
+        throttle, "login_throttle", make_throttle(FakeClock(), max_attempts=2)
+    )
+    calls = []
+
+    def fake_authenticate_user(db, email, password):
+        calls.append(email)
+        return False
+
+    monkeypatch.setattr(routes, "authenticate_user", fake_authenticate_user)
+
+    form = {"username": "victim@example.com", "password": "guess"}
+    assert client.post("/auth/login", data=form).status_code == 401
+    assert client.post("/auth/login", data=form).status_code == 401
+
+    response = client.post("/auth/login", data=form)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    assert len(calls) == 2
+    assert throttle.login_throttle.stats()["rejected"] == 1
+
+
+def test_many_emails_from_one_ip_are_not_locked_out(client, db_session, monkeypatch):
+    # Le frontend Streamlit relaie toutes les connexions depuis la même IP
+    from tests.test_auth import create_test_user
+
+    email = f"shared_ip_{uuid.uuid4()}@example.com"
+    create_test_user(db_session, email)
+
+    for i in range(3 * throttle.LOGIN_MAX_ATTEMPTS):
+        form = {"username": f"wrong_{i}@example.com", "password": "guess"}
+        for _ in range(throttle.LOGIN_FREE_FAILURES + 1):
+            assert client.post("/auth/login", data=form).status_code == 401
+
+    response = client.post(
+        "/auth/login", data={"username": email, "password": "testpass123"}
+    )
+    assert response.status_code == 200
+
+
+def test_ip_limit_is_a_plain_cap(client, monkeypatch):
+    monkeypatch.setattr(
+        throttle, "ip_login_throttle", make_throttle(FakeClock(), max_attempts=5)
+    )
+    monkeypatch.setattr(routes, "authenticate_user", lambda db, email, password: False)
+
+    for i in range(5):
+        form = {"username": f"spray_{i}@example.com", "password": "guess"}
+        assert client.post("/auth/login", data=form).status_code == 401
+    form = {"username": "spray_last@example.com", "password": "guess"}
+    assert client.post("/auth/login", data=form).status_code == 429
+
+
+def test_forwarded_ip_is_trusted_only_from_configured_proxies(db_session, monkeypatch):
+    monkeypatch.setattr(
+        throttle, "TRUSTED_PROXIES", (ipaddress.ip_network("10.0.0.0/24"),)
+    )
+    monkeypatch.setattr(
+        throttle, "ip_login_throttle", make_throttle(FakeClock(), max_attempts=2)
+    )
+    monkeypatch.setattr(routes, "authenticate_user", lambda db, email, password: False)
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: db_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
+    proxy = TestClient(app, client=("10.0.0.7", 50000))
+    outsider = TestClient(app, client=("203.0.113.9", 50000))
+
+    def login(http, forwarded_for, n):
+        return http.post(
+            "/auth/login",
+            data={"username": f"user_{n}@example.com", "password": "guess"},
+            headers={"X-Forwarded-For": forwarded_for},
+        ).status_code
+
+    # Via le proxy : chaque client réel a son propre compteur
+    for n in range(4):
+        assert login(proxy, f"198.51.100.{n}", n) == 401
+    # Hors proxy : l'en-tête est ignoré, l'IP de connexion est limitée
+    assert login(outsider, "198.51.100.50", 10) == 401
+    assert login(outsider, "198.51.100.51", 11) == 401
+    assert login(outsider, "198.51.100.52", 12) == 429
+
+    # Chaîne de proxys : on remonte jusqu'à la première IP non fiable
+    request = Request(
+        {
+            "type": "http",
+            "client": ("10.0.0.7", 50000),
+            "headers": [(b"x-forwarded-for", b"198.51.100.1, 10.0.0.3")],
+        }
+    )
+    assert throttle.client_ip(request) == "198.51.100.1"
@@ -0,0 +1,176 @@
+import uuid
+import pytest
+from datetime import timedelta
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import create_engine, inspect, text
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.api.auth import functions
+from modules.api.auth.epochs import token_epochs
+from modules.api.auth.functions import create_token
+from modules.api.auth.security import anonymize
+from modules.api.users import create_db
+from tests.test_auth import create_test_user
+
+
+# Fixture pour l'application et la base de données de test
+@pytest.fixture
+def client(db_session):
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: db_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
+    return TestClient(app)
+
+
+def login(client, email):
+    response = client.post(
+        "/auth/login", data={"username": email, "password": "testpass123"}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_tokens_carry_user_epoch(client, db_session):
+    email = f"epoch_{uuid.uuid4()}@example.com"
+    user = create_test_user(db_session, email)
+    tokens = login(client, email)
+
+    for token in tokens["access_token"], tokens["refresh_token"]:
+        payload = jwt.get_unverified_claims(token)
+        assert payload["uid"] == user.id
+        assert payload["epoch"] == user.token_epoch != 0
+
+
+def test_logout_all_revokes_every_token(client, db_session):
+    email = f"epoch_{uuid.uuid4()}@example.com"
+    create_test_user(db_session, email)
+    first = login(client, email)
+    second = login(client, email)
+
+    response = client.post("/auth/logout-all", headers=bearer(first["access_token"]))
+    assert response.status_code == 200
+
+    for tokens in first, second:
+        assert (
+            client.get(
+                "/auth/users/me", headers=bearer(tokens["access_token"])
+            ).status_code
+            == 401
+        )
+        refreshed = client.post("/auth/refresh", headers=bearer(tokens["refresh_token"]))
+        assert refreshed.status_code == 401
+
+    fresh = login(client, email)
+    assert (
+        client.get("/auth/users/me", headers=bearer(fresh["access_token"])).status_code
+        == 200
+    )
+
+
+def test_epoch_check_uses_memory_table(client, db_session, monkeypatch):
+    email = f"epoch_{uuid.uuid4()}@example.com"
+    user = create_test_user(db_session, email)
+    access_token = login(client, email)["access_token"]
+    token_epochs.load([(user.id, user.token_epoch)])
+
+    def fail_lookup(email, db):
+        raise AssertionError("La base ne doit pas être interrogée")
+
+    monkeypatch.setattr(functions, "get_user_by_email", fail_lookup)
+    response = client.get("/auth/metrics", headers=bearer(access_token))
+    # Lecteur : refusé par le contrôle de rôle, pas par l'authentification
+    assert response.status_code == 403
+    assert token_epochs.stats()["database_fallbacks"] == 0
+
+
+def test_deleted_user_tokens_are_rejected(client, db_session):
+    email = f"epoch_{uuid.uuid4()}@example.com"
+    user = create_test_user(db_session, email)
+    user_id = user.id
+    access_token = login(client, email)["access_token"]
+
+    admin_token = create_token(
+        data={"sub": anonymize(email), "role": "admin"},
+        expires_delta=timedelta(minutes=5),
+    )
+    deleted = client.delete(f"/auth/users/{user_id}", headers=bearer(admin_token))
+    assert deleted.status_code == 200
+
+    assert token_epochs.get(user_id) is not None
+    response = client.get("/auth/metrics", headers=bearer(access_token))
+    assert response.status_code == 401
+
+
+def test_reused_id_does_not_revive_deleted_user_tokens(client, db_session):
+    email = f"epoch_{uuid.uuid4()}@example.com"
+    user = create_test_user(db_session, email)
+    user_id = user.id
+    access_token = login(client, email)["access_token"]
+
+    admin_token = create_token(
+        data={"sub": anonymize(email), "role": "admin"},
+        expires_delta=timedelta(minutes=5),
+    )
+    deleted = client.delete(f"/auth/users/{user_id}", headers=bearer(admin_token))
+    assert deleted.status_code == 200
+
+    # Base créée sans AUTOINCREMENT : SQLite réattribue le plus grand id libéré
+    db_session.execute(
+        text("UPDATE sqlite_sequence SET seq = :seq WHERE name = 'users'"),
+        {"seq": user_id - 1},
+    )
+    db_session.commit()
+    created = client.post(
+        "/auth/users/",
+        json={
+            "name": "newcomer",
+            "email": f"epoch_{uuid.uuid4()}@example.com",
+            "password": "testpass123",
+        },
+    )
+    assert created.status_code == 200, created.text
+    assert created.json()["id"] == user_id
+
+    response = client.get("/auth/users/me", headers=bearer(access_token))
+    assert response.status_code == 401
+
+
+def test_legacy_tokens_without_epoch_still_accepted(client, db_session):
+    email = f"epoch_{uuid.uuid4()}@example.com"
+    create_test_user(db_session, email)
+    legacy_token = create_token(
+        data={"sub": anonymize(email), "role": "reader", "type": "access"},
+        expires_delta=timedelta(minutes=5),
+    )
+
+    response = client.get("/auth/users/me", headers=bearer(legacy_token))
+    assert response.status_code == 200
+
+
+def test_missing_column_is_added_to_existing_database(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'users.db'}")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR, "
+                "email VARCHAR, password VARCHAR, is_active BOOLEAN, "
+                "role_id INTEGER NOT NULL)"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO users (email, role_id) VALUES ('old@example.com', 1)")
+        )
+    monkeypatch.setattr(create_db, "users_engine", engine)
+
+    create_db.create_missing_columns()
+
+    columns = {column["name"] for column in inspect(engine).get_columns("users")}
+    assert "token_epoch" in columns
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT token_epoch FROM users")).scalar() == 0
+    engine.dispose()
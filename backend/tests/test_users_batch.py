@@ -0,0 +1,86 @@
+import uuid
+import pytest
+from datetime import timedelta
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from modules.api.main import create_app
+from modules.database.dependencies import get_users_db, get_users_read_db
+from modules.api.auth.functions import create_token
+from modules.api.auth.security import anonymize
+from modules.api.users.schemas import MAX_BATCH_SIZE
+from tests.test_auth import create_test_user
+from tests.test_routes import create_roles_if_not_exists
+
+
+# Fixture pour l'application et la base de données de test
+@pytest.fixture
+def client(db_session):
+    app = create_app()
+    app.dependency_overrides[get_users_db] = lambda: db_session
+    app.dependency_overrides[get_users_read_db] = lambda: db_session
+    return TestClient(app)
+
+
+@pytest.fixture
+def select_count(test_engine):
+    """Compte les SELECT émis sur la base de test."""
+    counter = {"selects": 0}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if statement.lstrip().upper().startswith("SELECT"):
+            counter["selects"] += 1
+
+    event.listen(test_engine, "before_cursor_execute", before_cursor_execute)
+    yield counter
+    event.remove(test_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_batch_lookup_keeps_order_and_marks_missing(client, db_session, select_count):
+    create_roles_if_not_exists(db_session)
+    first = create_test_user(db_session, f"batch_{uuid.uuid4()}@example.com")
+    second = create_test_user(db_session, f"batch_{uuid.uuid4()}@example.com")
+    ids = [second.id, 999_999, first.id, second.id]
+    select_count["selects"] = 0
+
+    response = client.post("/users/users/batch", json={"ids": ids})
+
+    assert response.status_code == 200, response.text
+    results = response.json()
+    assert [result["id"] for result in results] == ids
+    assert [result["found"] for result in results] == [True, False, True, True]
+    assert results[1]["user"] is None
+    assert results[0]["user"]["role"] == "reader"
+    # Une seule requête IN jointe aux rôles
+    assert select_count["selects"] == 1
+
+    # Deuxième appel entièrement servi par le cache
+    client.post("/users/users/batch", json={"ids": [ids[0], ids[2]]})
+    assert select_count["selects"] == 1
+
+
+def test_batch_lookup_rejects_oversized_requests(client):
+    response = client.post(
+        "/users/users/batch", json={"ids": list(range(MAX_BATCH_SIZE + 1))}
+    )
+    assert response.status_code == 422
+
+
+def test_role_update_invalidates_cached_user(client, db_session):
+    create_roles_if_not_exists(db_session)
+    email = f"batch_{uuid.uuid4()}@example.com"
+    user = create_test_user(db_session, email)
+    client.post("/users/users/batch", json={"ids": [user.id]})
+
+    admin_token = create_token(
+        data={"sub": anonymize(email), "role": "admin"},
+        expires_delta=timedelta(minutes=5),
+    )
+    response = client.patch(
+        f"/auth/users/{user.id}/role",
+        json={"role": "admin"},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 200
+
+    results = client.post("/users/users/batch", json={"ids": [user.id]}).json()
+    assert results[0]["user"]["role"] == "admin"
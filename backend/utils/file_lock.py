@@ -0,0 +1,40 @@
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# fcntl n'existe pas sous Windows : verrou msvcrt sur le premier octet du fichier
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path: Path | str):
+    """Verrou exclusif entre processus, bloquant jusqu'à son obtention.
+
+    Le verrou est relâché par le système si le processus meurt : un worker
+    tué pendant l'initialisation ne bloque pas les suivants.
+    """
+    with open(path, "a+b") as handle:
+        fd = handle.fileno()
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK abandonne après ~10 s d'essais : on recommence
+                    time.sleep(0.1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
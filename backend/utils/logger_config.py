@@ -5,8 +5,16 @@ from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Les sinks ne sont installés qu'une fois par processus, quel que soit le nombre
+# de modules qui appellent configure_logger() à leur import
+_configured = False
+
 
 def configure_logger():
+    global _configured
+    if _configured:
+        return logger
+
     logger.remove()
 
     # Créer un dossier de logs s'il n'existe pas
@@ -54,4 +62,5 @@ def configure_logger():
         format=log_format,
     )
 
+    _configured = True
     return logger
@@ -0,0 +1,36 @@
+import threading
+from utils.logger_config import configure_logger
+
+# Configuration du logger
+logger = configure_logger()
+
+
+class PeriodicTask:
+    """Exécute `func` toutes les `interval` secondes dans un thread démon."""
+
+    def __init__(self, name: str, interval: float, func):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        logger.info(f"Tâche périodique '{self.name}' démarrée ({self.interval}s)")
+
+    def stop(self, timeout: float = 5.0):
+        """Arrête la boucle et attend la fin de l'itération en cours."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.func()
+            except Exception as e:
+                logger.error(f"Erreur dans la tâche périodique '{self.name}' : {e}")
@@ -0,0 +1,172 @@
+import os
+from dataclasses import dataclass
+from dotenv import load_dotenv
+
+
+def _str(name: str, default: str | None = None) -> str | None:
+    return os.getenv(name) or default
+
+
+def _int(name: str, default: int) -> int:
+    return int(os.getenv(name) or default)
+
+
+def _float(name: str, default: float) -> float:
+    return float(os.getenv(name) or default)
+
+
+def _list(name: str) -> tuple[str, ...]:
+    return tuple(
+        item.strip() for item in (os.getenv(name) or "").split(",") if item.strip()
+    )
+
+
+def _flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.lower() == "true"
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Configuration de l'API, lue une seule fois depuis l'environnement et `.env`.
+
+    Les modules gardent leurs constantes (ex. `throttle.LOGIN_MAX_ATTEMPTS`),
+    initialisées depuis cet objet plutôt que relues chacune dans `os.environ`.
+    """
+
+    run_env: str | None
+    secret_key: str | None
+    frontend_url: str | None
+    # Premier administrateur, créé à l'initialisation de la base
+    admin_email: str | None
+    admin_name: str | None
+    admin_password: str | None
+    # bcrypt : coût fixe ou latence cible pour le calibrer, et admission
+    bcrypt_rounds: int
+    bcrypt_target_ms: float | None
+    bcrypt_max_concurrency: int
+    bcrypt_max_queue: int
+    bcrypt_queue_timeout: float
+    bcrypt_retry_after: int
+    # Limitation des tentatives de connexion
+    login_max_attempts: int
+    login_window_seconds: float
+    login_free_failures: int
+    login_backoff_base: float
+    login_backoff_max: float
+    login_throttle_max_entries: int
+    # Plafond par IP, sans backoff (0 : désactivé) ; proxys dont X-Forwarded-For est cru
+    login_ip_max_attempts: int
+    trusted_proxies: tuple[str, ...]
+    # Tokens
+    rich_access_tokens: bool
+    refresh_grace_seconds: float
+    refresh_grace_cache_size: int
+    # Caches
+    api_key_cache_size: int
+    api_key_cache_ttl: float
+    user_cache_size: int
+    user_cache_ttl: float
+    email_filter_enabled: bool
+    email_filter_capacity: int
+    email_filter_fp_rate: float
+    email_filter_rebuild_seconds: float
+    # Propagation des invalidations entre workers
+    invalidation_bus_enabled: bool
+    invalidation_bus_path: str | None
+    invalidation_bus_poll_seconds: float
+    # Base de données
+    group_commit_enabled: bool
+    group_commit_max_batch: int
+    group_commit_max_delay_ms: float
+    group_commit_timeout: float
+    users_db_pool_size: int
+    users_read_pool_size: int
+    users_shards: int
+    # Journal d'audit
+    audit_enabled: bool
+    audit_queue_size: int
+    audit_batch_size: int
+    audit_flush_seconds: float
+    # Dernières connexions, écrites par lots
+    login_activity_flush_seconds: float
+    # Séries d'activité par minute (tableau de bord admin)
+    activity_series_minutes: int
+    activity_snapshot_seconds: float
+    activity_snapshot_path: str | None
+    # Flux SSE du tableau de bord
+    dashboard_buffer_size: int
+    dashboard_max_subscribers: int
+    dashboard_heartbeat_seconds: float
+    dashboard_counters_seconds: float
+    # Démarrage
+    warmup_enabled: bool
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        load_dotenv()
+        bcrypt_max_concurrency = _int("BCRYPT_MAX_CONCURRENCY", os.cpu_count() or 1)
+        bcrypt_target_ms = _str("BCRYPT_TARGET_MS")
+        return cls(
+            run_env=_str("RUN_ENV"),
+            secret_key=_str("SECRET_KEY"),
+            frontend_url=_str("FRONTEND_URL"),
+            admin_email=_str("ADMIN_EMAIL"),
+            admin_name=_str("ADMIN_NAME"),
+            admin_password=_str("ADMIN_PASSWORD"),
+            bcrypt_rounds=_int("BCRYPT_ROUNDS", 12),
+            bcrypt_target_ms=float(bcrypt_target_ms) if bcrypt_target_ms else None,
+            bcrypt_max_concurrency=bcrypt_max_concurrency,
+            bcrypt_max_queue=_int("BCRYPT_MAX_QUEUE", 4 * bcrypt_max_concurrency),
+            bcrypt_queue_timeout=_float("BCRYPT_QUEUE_TIMEOUT", 2.0),
+            bcrypt_retry_after=_int("BCRYPT_RETRY_AFTER", 1),
+            login_max_attempts=_int("LOGIN_MAX_ATTEMPTS", 10),
+            login_window_seconds=_float("LOGIN_WINDOW_SECONDS", 60),
+            login_free_failures=_int("LOGIN_FREE_FAILURES", 3),
+            login_backoff_base=_float("LOGIN_BACKOFF_BASE", 1),
+            login_backoff_max=_float("LOGIN_BACKOFF_MAX", 300),
+            login_throttle_max_entries=_int("LOGIN_THROTTLE_MAX_ENTRIES", 10_000),
+            login_ip_max_attempts=_int("LOGIN_IP_MAX_ATTEMPTS", 300),
+            trusted_proxies=_list("TRUSTED_PROXIES"),
+            rich_access_tokens=_flag("RICH_ACCESS_TOKENS", False),
+            refresh_grace_seconds=_float("REFRESH_GRACE_SECONDS", 10),
+            refresh_grace_cache_size=_int("REFRESH_GRACE_CACHE_SIZE", 10_000),
+            api_key_cache_size=_int("API_KEY_CACHE_SIZE", 1000),
+            api_key_cache_ttl=_float("API_KEY_CACHE_TTL", 60),
+            user_cache_size=_int("USER_CACHE_SIZE", 10_000),
+            user_cache_ttl=_float("USER_CACHE_TTL", 30),
+            # Filtre activé sauf valeur explicite "false"
+            email_filter_enabled=_str("EMAIL_FILTER_ENABLED", "true").lower() != "false",
+            email_filter_capacity=_int("EMAIL_FILTER_CAPACITY", 100_000),
+            email_filter_fp_rate=_float("EMAIL_FILTER_FP_RATE", 0.01),
+            email_filter_rebuild_seconds=_float("EMAIL_FILTER_REBUILD_SECONDS", 300),
+            invalidation_bus_enabled=_flag("INVALIDATION_BUS_ENABLED", False),
+            invalidation_bus_path=_str("INVALIDATION_BUS_PATH"),
+            invalidation_bus_poll_seconds=_float("INVALIDATION_BUS_POLL_SECONDS", 0.2),
+            group_commit_enabled=_flag("GROUP_COMMIT_ENABLED", False),
+            group_commit_max_batch=_int("GROUP_COMMIT_MAX_BATCH", 64),
+            group_commit_max_delay_ms=_float("GROUP_COMMIT_MAX_DELAY_MS", 5),
+            group_commit_timeout=_float("GROUP_COMMIT_TIMEOUT", 5),
+            users_db_pool_size=_int("USERS_DB_POOL_SIZE", 5),
+            users_read_pool_size=_int("USERS_READ_POOL_SIZE", 10),
+            users_shards=_int("USERS_SHARDS", 1),
+            audit_enabled=_flag("AUDIT_ENABLED", True),
+            audit_queue_size=_int("AUDIT_QUEUE_SIZE", 10_000),
+            audit_batch_size=_int("AUDIT_BATCH_SIZE", 500),
+            audit_flush_seconds=_float("AUDIT_FLUSH_SECONDS", 1.0),
+            login_activity_flush_seconds=_float("LOGIN_ACTIVITY_FLUSH_SECONDS", 5),
+            activity_series_minutes=_int("ACTIVITY_SERIES_MINUTES", 1440),
+            activity_snapshot_seconds=_float("ACTIVITY_SNAPSHOT_SECONDS", 60),
+            activity_snapshot_path=_str("ACTIVITY_SNAPSHOT_PATH"),
+            dashboard_buffer_size=_int("DASHBOARD_BUFFER_SIZE", 256),
+            dashboard_max_subscribers=_int("DASHBOARD_MAX_SUBSCRIBERS", 100),
+            dashboard_heartbeat_seconds=_float("DASHBOARD_HEARTBEAT_SECONDS", 15),
+            dashboard_counters_seconds=_float("DASHBOARD_COUNTERS_SECONDS", 5),
+            warmup_enabled=_flag("WARMUP_ENABLED", True),
+        )
+
+
+# Chargée une fois par processus, au premier import
+settings = Settings.from_env()
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Cache clé → valeur borné (LRU) dont les entrées expirent après `ttl` secondes."""
+
+    def __init__(self, maxsize: int, ttl: float, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._data: OrderedDict = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def _lookup(self, key, now: float):
+        item = self._data.get(key)
+        if item is None:
+            self._misses += 1
+            return None
+        expires_at, value = item
+        if expires_at <= now:
+            del self._data[key]
+            self._misses += 1
+            return None
+        self._data.move_to_end(key)
+        self._hits += 1
+        return item
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._lookup(key, self.clock())
+        return default if item is None else item[1]
+
+    def get_many(self, keys) -> dict:
+        """Retourne les entrées valides parmi `keys` (les clés absentes sont omises)."""
+        now = self.clock()
+        found = {}
+        with self._lock:
+            for key in keys:
+                item = self._lookup(key, now)
+                if item is not None:
+                    found[key] = item[1]
+        return found
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (self.clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def discard_if(self, predicate) -> int:
+        """Retire les entrées dont la valeur satisfait `predicate`."""
+        with self._lock:
+            keys = [key for key, (_, value) in self._data.items() if predicate(value)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
@@ -1,6 +1,20 @@
+import pandas as pd
+import requests
 import streamlit as st
-import datetime
-from utils import get_user_count
+from utils import format_login_date, get_activity, get_user_stats, iter_dashboard_events
+
+# Période affichée -> (minutes, taille des paquets en minutes)
+ACTIVITY_PERIODS = {
+    "Dernière heure": (60, 1),
+    "6 heures": (360, 5),
+    "24 heures": (1440, 15),
+}
+ACTIVITY_LABELS = {
+    "login": "Connexions",
+    "login_failed": "Échecs",
+    "refresh": "Rafraîchissements",
+    "signup": "Inscriptions",
+}
 
 
 def home_page():
@@ -29,17 +43,97 @@ def home_page():
         with col2:
             st.markdown("#### 📊 Statistiques (live)")
 
-            # Nombre d'utilisateurs depuis l'API
-            user_count = get_user_count(st.session_state["token"])
-
             # À compléter plus tard avec un vrai appel backend pour les tokens
             token_count = 18  # ou 0 par défaut en attendant
 
-            st.metric("Utilisateurs inscrits", user_count)
-            st.metric("Tokens actifs", token_count)
-            st.metric(
-                "Dernière connexion",
-                datetime.datetime.now().strftime("%d/%m/%Y à %H:%M"),
+            slots = {
+                "user_count": st.empty(),
+                "tokens": st.empty(),
+                "last_login_at": st.empty(),
+                "last_hour": st.empty(),
+            }
+            slots["tokens"].metric("Tokens actifs", token_count)
+
+            st.caption(
+                "Utilisateurs et activité poussés en direct par l'API, les autres "
+                "stats arrivent !"
             )
 
-            st.caption("Le nombre d'utilisateurs est à jour, les autres stats arrivent !")
+        activity_chart(st.session_state["token"])
+        # En dernier : suit le flux un temps limité, puis relance la page
+        follow_dashboard(st.session_state["token"], slots)
+
+
+def render_dashboard(slots, state):
+    slots["user_count"].metric("Utilisateurs inscrits", state.get("user_count", 0))
+    slots["last_login_at"].metric(
+        "Dernière connexion", format_login_date(state.get("last_login_at"))
+    )
+    if "last_hour" in state:
+        slots["last_hour"].metric("Connexions (1 h)", state["last_hour"]["login"])
+
+
+def follow_dashboard(token, slots):
+    """Met à jour les métriques à chaque événement du flux SSE de l'API.
+
+    La liste des utilisateurs n'est plus relue à chaque rerun : un état initial,
+    puis les changements (inscriptions, suppressions, compteurs d'activité).
+    Le suivi dure DASHBOARD_FOLLOW_SECONDS ; la page est ensuite relancée et
+    repart d'un nouvel état initial, au lieu de garder le script bloqué.
+    """
+    state = {}
+    try:
+        for event_type, data in iter_dashboard_events(token):
+            if event_type == "snapshot":
+                state.update(data)
+            elif event_type == "user_created":
+                state["user_count"] = state.get("user_count", 0) + 1
+            elif event_type == "user_deleted":
+                state["user_count"] = max(0, state.get("user_count", 0) - 1)
+            elif event_type == "counters":
+                state["last_hour"] = data["last_hour"]
+            elif event_type == "overflow":
+                # Trop de retard : on repart d'un état complet
+                st.rerun()
+            render_dashboard(slots, state)
+    except requests.RequestException:
+        pass
+
+    # Fin du suivi : nouveau rerun, nouvel état initial
+    if state:
+        st.rerun()
+
+    # Flux indisponible : une lecture ponctuelle de la liste
+    user_stats = get_user_stats(token)
+    render_dashboard(
+        slots,
+        {
+            "user_count": user_stats["count"],
+            "last_login_at": user_stats["last_login_at"],
+        },
+    )
+
+
+def activity_chart(token):
+    """Graphique de l'activité d'authentification (compteurs en mémoire côté API)."""
+    st.markdown("#### 📈 Activité")
+    period = st.selectbox("Période", list(ACTIVITY_PERIODS), key="activity_period")
+    minutes, bucket = ACTIVITY_PERIODS[period]
+
+    activity = get_activity(token, minutes, bucket)
+    if not activity:
+        st.info("Activité indisponible.")
+        return
+
+    data = (
+        pd.DataFrame(activity["points"]).set_index("time").rename(columns=ACTIVITY_LABELS)
+    )
+    data.index = pd.to_datetime(data.index)
+    st.line_chart(data)
+    st.caption(
+        f"Par paquets de {bucket} minute(s) (UTC) — "
+        + ", ".join(
+            f"{ACTIVITY_LABELS[name]} : {total}"
+            for name, total in activity["totals"].items()
+        )
+    )
@@ -1,5 +1,5 @@
 import streamlit as st
-from utils import get_users
+from utils import format_login_date, get_users
 
 
 def users_page():
@@ -21,3 +21,7 @@ def users_page():
             st.write(f"**Email** : {user.get('email', '-')}")
             st.write(f"**Rôle** : {user.get('role', '-')}")
             st.write(f"**Actif** : {'✅ Oui' if user.get('is_active') else '❌ Non'}")
+            st.write(
+                f"**Dernière connexion** : {format_login_date(user.get('last_login_at'))}"
+            )
+            st.write(f"**Connexions** : {user.get('login_count') or 0}")
@@ -1,30 +1,96 @@
+import datetime
+import json
+import os
+import time
+from http.cookiejar import DefaultCookiePolicy
 import requests
 import streamlit as st
 from dotenv import load_dotenv
-import os
+from requests.adapters import HTTPAdapter
 
 load_dotenv()
 
 BACKEND_URL = os.getenv("BACKEND_URL") or "http://localhost:8000"
+# Délais en secondes : établissement de la connexion, puis lecture de la réponse
+BACKEND_CONNECT_TIMEOUT = float(os.getenv("BACKEND_CONNECT_TIMEOUT") or 3)
+BACKEND_READ_TIMEOUT = float(os.getenv("BACKEND_READ_TIMEOUT") or 30)
+# Connexions keep-alive conservées vers le backend
+BACKEND_POOL_SIZE = int(os.getenv("BACKEND_POOL_SIZE") or 10)
+# Durée de suivi du flux du tableau de bord avant de relancer la page
+DASHBOARD_FOLLOW_SECONDS = float(os.getenv("DASHBOARD_FOLLOW_SECONDS") or 60)
+
+
+class BackendSession(requests.Session):
+    """Client HTTP du backend : URL de base, délais par défaut et pool keep-alive.
+
+    Au-delà de `pool_size` requêtes simultanées, des connexions supplémentaires
+    sont ouvertes puis refermées : seules `pool_size` restent ouvertes entre
+    deux reruns.
+    """
+
+    def __init__(self, base_url: str, timeout: tuple[float, float], pool_size: int):
+        super().__init__()
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        # Partagée entre tous les utilisateurs : aucun cookie n'est conservé
+        self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, f"{self.base_url}{url}", **kwargs)
+
+
+@st.cache_resource
+def get_backend() -> BackendSession:
+    """Client unique du processus, partagé par les sessions et les reruns."""
+    return BackendSession(
+        BACKEND_URL, (BACKEND_CONNECT_TIMEOUT, BACKEND_READ_TIMEOUT), BACKEND_POOL_SIZE
+    )
+
+
+def client_ip():
+    """IP du navigateur de l'utilisateur, ou None si Streamlit ne l'expose pas."""
+    ip = getattr(st.context, "ip_address", None)  # Streamlit >= 1.45
+    if ip:
+        return ip
+    try:
+        from streamlit.runtime import get_instance
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        session_client = get_instance().get_client(get_script_run_ctx().session_id)
+        return session_client.request.remote_ip
+    except Exception:
+        return None
 
 
 def authenticate_user(email, password):
-    response = requests.post(
-        f"{BACKEND_URL}/auth/login", data={"username": email, "password": password}
+    # Toutes les connexions partent du frontend : le backend limite par IP celle
+    # du navigateur (TRUSTED_PROXIES), pas celle du conteneur
+    ip = client_ip()
+    headers = {"X-Forwarded-For": ip} if ip else {}
+    # Profil renvoyé avec les tokens : un seul aller-retour vers le backend
+    response = get_backend().post(
+        "/auth/login",
+        params={"include_profile": "true"},
+        data={"username": email, "password": password},
+        headers=headers,
     )
     if response.status_code == 200:
-        token = response.json()["access_token"]
-        headers = {"Authorization": f"Bearer {token}"}
-        user_response = requests.get(f"{BACKEND_URL}/auth/users/me", headers=headers)
-        if user_response.status_code == 200:
-            user_data = user_response.json()
-            return {"role": user_data["role"], "token": token}
+        data = response.json()
+        return {
+            "role": data["user"]["role"],
+            "name": data["user"]["name"],
+            "token": data["access_token"],
+        }
     return None
 
 
 def create_user(name, email, password):
-    response = requests.post(
-        f"{BACKEND_URL}/auth/users/",
+    response = get_backend().post(
+        "/auth/users/",
         json={"name": name, "email": email, "password": password},
     )
     if response.ok:
@@ -36,27 +102,80 @@ def create_user(name, email, password):
 
 def get_users(token):
     headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(f"{BACKEND_URL}/auth/users/", headers=headers)
+    response = get_backend().get("/auth/users/", headers=headers)
     return response.json() if response.status_code == 200 else []
 
 
 def delete_user(user_id, token):
     headers = {"Authorization": f"Bearer {token}"}
-    return requests.delete(f"{BACKEND_URL}/auth/users/{user_id}", headers=headers)
+    return get_backend().delete(f"/auth/users/{user_id}", headers=headers)
 
 
 def update_user(user_id, name, role, is_active, token):
     headers = {"Authorization": f"Bearer {token}"}
     data = {"name": name, "role": role, "is_active": is_active}
-    return requests.put(f"{BACKEND_URL}/auth/users/{user_id}", json=data, headers=headers)
+    return get_backend().put(f"/auth/users/{user_id}", json=data, headers=headers)
 
 
 def get_user_count(token):
+    return get_user_stats(token)["count"]
+
+
+def get_user_stats(token):
+    """Nombre d'utilisateurs et connexion la plus récente, en un seul appel."""
+    users = get_users(token)
+    last_logins = [user["last_login_at"] for user in users if user.get("last_login_at")]
+    return {"count": len(users), "last_login_at": max(last_logins, default=None)}
+
+
+def format_login_date(value):
+    """Date ISO renvoyée par l'API -> « 19/10/2026 à 14:05 » (UTC)."""
+    if not value:
+        return "Jamais"
+    return datetime.datetime.fromisoformat(value).strftime("%d/%m/%Y à %H:%M")
+
+
+def get_activity(token, minutes=60, bucket=1):
+    """Séries d'activité (connexions, échecs, rafraîchissements, inscriptions)."""
     headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(f"{BACKEND_URL}/auth/users/", headers=headers)
-    if response.status_code == 200:
-        return len(response.json())
-    return 0
+    response = get_backend().get(
+        "/stats/activity",
+        params={"minutes": minutes, "bucket": bucket},
+        headers=headers,
+    )
+    return response.json() if response.status_code == 200 else None
+
+
+def iter_dashboard_events(token, duration=DASHBOARD_FOLLOW_SECONDS):
+    """Événements (type, données) du flux SSE du tableau de bord.
+
+    S'arrête au bout de `duration` secondes (au keepalive suivant au plus tard).
+    Ne produit rien si le flux est indisponible (droits, trop de flux ouverts).
+    """
+    headers = {"Authorization": f"Bearer {token}", "Accept": "text/event-stream"}
+    deadline = time.monotonic() + duration
+    # Connexion dédiée, hors du pool partagé : un onglet ouvert n'en prive pas
+    # les autres requêtes. Délai de lecture > intervalle des keepalives : une
+    # connexion morte se termine
+    with requests.get(
+        f"{BACKEND_URL}/stats/stream",
+        headers=headers,
+        stream=True,
+        timeout=(BACKEND_CONNECT_TIMEOUT, 60),
+    ) as response:
+        if response.status_code != 200:
+            return
+        event_type, data = None, None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                event_type = line.removeprefix("event: ")
+            elif line.startswith("data: "):
+                data = json.loads(line.removeprefix("data: "))
+            elif not line and event_type:
+                yield event_type, data
+                event_type, data = None, None
+            if time.monotonic() >= deadline:
+                return
 
 
 def logout():